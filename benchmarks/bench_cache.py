@@ -0,0 +1,107 @@
+"""Hit rate and latency of the analysis result cache on a synthetic workload.
+
+The synthetic workload draws every slider independently, so on its own it almost never
+repeats an answer vector. To model re-runs and common answer patterns, the stream draws
+`--sessions` sessions from a pool of `--distinct` generated ones (0 = every session new).
+Each session is analyzed and its verdict counterfactuals solved, as the app does, three
+ways: the plain engine, a CachedEngine over an in-process ResultCache, and a process pool
+where each worker either keeps its own ResultCache or attaches to one SharedResultCache.
+
+Run: python benchmarks/bench_cache.py --sessions 100000 --distinct 5000 --workers 4
+"""
+
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import biaslab_cache  # noqa: E402
+from biaslab_cache import CachedEngine, ResultCache, SharedResultCache, verdict_counterfactuals  # noqa: E402
+from biaslab_engine import DEFAULT_ENGINE  # noqa: E402
+from biaslab_golden import batch_sessions  # noqa: E402
+from biaslab_workload import generate_batch  # noqa: E402
+
+CHUNK = 10_000
+
+
+def stream(count, distinct, seed, chunk=0):
+    """`count` sessions drawn from a pool of `distinct` seeded ones; chunks of one stream share the pool."""
+    if not distinct:
+        return list(batch_sessions(generate_batch(np.random.default_rng([seed, chunk]), count)))
+    pool = list(batch_sessions(generate_batch(np.random.default_rng(seed), distinct)))
+    return [pool[index] for index in np.random.default_rng([seed, chunk, 1]).integers(distinct, size=count)]
+
+
+def compute(engine, session):
+    verdict_counterfactuals(engine.analyze(session), engine, session.option_scores)
+
+
+def time_sessions(engine, sessions):
+    start = time.perf_counter()
+    for session in sessions:
+        compute(engine, session)
+    return (time.perf_counter() - start) / len(sessions) * 1e6
+
+
+def _run_chunk(args):
+    """Worker: one chunk of the stream through this process's cache; returns (pid, cumulative stats)."""
+    count, distinct, seed, chunk = args
+    engine = CachedEngine(cache=biaslab_cache.worker_cache())
+    for session in stream(count, distinct, seed, chunk):
+        compute(engine, session)
+    return os.getpid(), engine.cache.stats()
+
+
+def run_pool(workers, chunks, initializer=None, initargs=()):
+    start = time.perf_counter()
+    with ProcessPoolExecutor(workers, initializer=initializer, initargs=initargs) as pool:
+        stats = list(pool.map(_run_chunk, chunks))
+    return time.perf_counter() - start, stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sessions", type=int, default=100_000)
+    parser.add_argument("--distinct", type=int, default=5_000, help="distinct sessions in the stream (0 = all new)")
+    parser.add_argument("--entries", type=int, default=biaslab_cache.DEFAULT_ENTRIES)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--seed", type=int, default=5)
+    args = parser.parse_args()
+
+    sessions = stream(min(args.sessions, CHUNK), args.distinct, args.seed)
+    cached = CachedEngine(cache=ResultCache(args.entries))
+    engine_us = time_sessions(DEFAULT_ENGINE, sessions)
+    cached_us = time_sessions(cached, sessions)
+    print(f"{len(sessions):,} sessions in process, {args.distinct or 'all'} distinct")
+    print(f"  engine                  {engine_us:8.1f} µs/session")
+    print(f"  CachedEngine            {cached_us:8.1f} µs/session   hit rate {cached.cache.stats().hit_rate:.1%}")
+
+    chunks = [(min(CHUNK, args.sessions - start), args.distinct, args.seed, index) for index, start in enumerate(range(0, args.sessions, CHUNK))]
+    print(f"{args.sessions:,} sessions on {args.workers} workers")
+    elapsed, stats = run_pool(args.workers, chunks)
+    # Each worker's stats are cumulative, so keep the latest per process.
+    latest = {}
+    for pid, stat in stats:
+        if pid not in latest or stat.hits + stat.misses > latest[pid].hits + latest[pid].misses:
+            latest[pid] = stat
+    hits = sum(stat.hits for stat in latest.values())
+    lookups = sum(stat.hits + stat.misses for stat in latest.values())
+    print(f"  per-worker caches       {elapsed:8.2f} s   hit rate {hits / max(1, lookups):.1%}")
+
+    shared = SharedResultCache.create(args.entries)
+    try:
+        elapsed, _ = run_pool(args.workers, chunks, biaslab_cache.init_worker, shared.worker_args())
+        stats = shared.stats()
+        print(f"  one shared cache        {elapsed:8.2f} s   hit rate {stats.hit_rate:.1%}   entries {stats.entries:,}   evictions {stats.evictions:,}")
+    finally:
+        shared.close()
+        shared.unlink()
+
+
+if __name__ == "__main__":
+    main()
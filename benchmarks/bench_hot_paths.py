@@ -0,0 +1,162 @@
+"""Throughput of every BiasLab hot path on 1, 1k and 1M synthetic sessions, with a JSON baseline.
+
+Each workload of N sessions cycles over a pool of up to 1,024 distinct synthetic inputs,
+so 1M-session runs measure steady-state throughput without holding 1M inputs in memory.
+Workloads shorter than 0.2 s are looped until they reach it, so the 1-session numbers are
+averages over many calls rather than one timer-noise-sized sample.
+
+Run:     python benchmarks/bench_hot_paths.py --save baseline.json
+Compare: python benchmarks/bench_hot_paths.py --compare baseline.json --threshold 0.15
+         (exits with status 1 when any path is more than 15% slower than the baseline)
+"""
+
+import argparse
+import gc
+import json
+import os
+import platform
+import random
+import sys
+import tempfile
+import time
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from biaslab_engine import (  # noqa: E402
+    DEFAULT_ENGINE,
+    detect_bias_patterns,
+    detect_context,
+    identify_dilemma_profile,
+    infer_options_from_decision,
+)
+from biaslab_store import save_session  # noqa: E402
+from biaslab_text import note_signals  # noqa: E402
+from biaslab_wizard import WizardState  # noqa: E402
+
+from bench_sessions import answer_for, synthetic_decision  # noqa: E402
+
+DEFAULT_SIZES = (1, 1_000, 1_000_000)
+POOL_SIZE = 1024
+
+
+def build_pool(size, seed):
+    """Decision texts, completed Sessions and their AnalysisResults."""
+    rng = random.Random(seed)
+    texts, sessions, results = [], [], []
+    for _ in range(size):
+        decision = synthetic_decision(rng)
+        wizard = WizardState(DEFAULT_ENGINE.plan(decision))
+        question = wizard.current_question()
+        while question is not None:
+            question = wizard.submit(answer_for(question, rng))
+        session = wizard.to_session()
+        texts.append(decision.text)
+        sessions.append(session)
+        results.append(DEFAULT_ENGINE.analyze(session))
+    return texts, sessions, results
+
+
+def hot_paths(pool, log_file):
+    """name -> (inputs, call) pairs; `call(item)` is one unit of work."""
+    texts, sessions, results = pool
+    return {
+        "detect_context": (texts, detect_context),
+        "identify_dilemma_profile": (texts, identify_dilemma_profile),
+        "infer_options_from_decision": (texts, infer_options_from_decision),
+        "compute_analysis": (sessions, DEFAULT_ENGINE.analyze),
+        "detect_bias_patterns": (results, lambda result: detect_bias_patterns(result.answers, result.chosen_rational, result.signal_map, note_signals(result.answers, result.chosen_key))),
+        "generate_narrative": (results, DEFAULT_ENGINE.narrate),
+        "save_session": (results, lambda result: save_session(result, log_file)),
+    }
+
+
+def run_workload(inputs, call, size):
+    count = len(inputs)
+    for index in range(size):
+        call(inputs[index % count])
+
+
+def time_workload(inputs, call, size, repeats):
+    """Best seconds for one workload of `size` calls.
+
+    A 1-session workload takes microseconds, far below timer noise, so like timeit's
+    autorange the workload is looped until one timing takes at least 0.2 s, and that
+    total is divided by the loop count. GC stays enabled, as in the app.
+    """
+    timer = timeit.Timer(lambda: run_workload(inputs, call, size), setup="gc.enable()", globals={"gc": gc})
+    loops, elapsed = timer.autorange()
+    return min([elapsed] + timer.repeat(repeats - 1, loops)) / loops
+
+
+def measure(sizes, seed, only=None):
+    pool = build_pool(min(max(sizes), POOL_SIZE), seed)
+    measurements = {}
+    with tempfile.TemporaryDirectory() as directory:
+        log_file = os.path.join(directory, "bench_sessions.csv")
+        for name, (inputs, call) in hot_paths(pool, log_file).items():
+            if only and name not in only:
+                continue
+            measurements[name] = {}
+            for size in sizes:
+                # Small workloads are cheap to repeat; keep the best of a few timings.
+                elapsed = time_workload(inputs, call, size, 5 if size <= 1_000 else 1)
+                measurements[name][str(size)] = {"seconds": elapsed, "ops_per_sec": size / elapsed if elapsed else float("inf")}
+                print(f"{name:<28} {size:>9,} sessions: {size / elapsed:>12,.0f} ops/s  ({elapsed:.4f} s)")
+            if os.path.exists(log_file):
+                os.remove(log_file)
+    return measurements
+
+
+def compare(measurements, baseline, threshold):
+    """Names of (path, size) workloads whose throughput dropped by more than `threshold`."""
+    regressions = []
+    for name, sizes in measurements.items():
+        for size, current in sizes.items():
+            reference = baseline.get("results", {}).get(name, {}).get(size)
+            if reference is None:
+                continue
+            ratio = current["ops_per_sec"] / reference["ops_per_sec"]
+            status = "REGRESSION" if ratio < 1 - threshold else "ok"
+            print(f"{name:<28} {int(size):>9,} sessions: {ratio:6.2f}x baseline  {status}")
+            if status != "ok":
+                regressions.append(f"{name}@{size}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(DEFAULT_SIZES))
+    parser.add_argument("--only", nargs="+", help="benchmark only these hot paths")
+    parser.add_argument("--seed", type=int, default=31)
+    parser.add_argument("--save", metavar="JSON", help="write the results as a baseline file")
+    parser.add_argument("--compare", metavar="JSON", help="compare against a baseline file")
+    parser.add_argument("--threshold", type=float, default=0.15, help="allowed throughput drop (0.15 = 15%%)")
+    args = parser.parse_args()
+
+    measurements = measure(args.sizes, args.seed, args.only)
+
+    if args.save:
+        report = {
+            "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "machine": platform.platform(),
+            "seed": args.seed,
+            "results": measurements,
+        }
+        with open(args.save, "w", encoding="utf-8") as file:
+            json.dump(report, file, indent=2)
+        print(f"Baseline written to {args.save}")
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as file:
+            baseline = json.load(file)
+        regressions = compare(measurements, baseline, args.threshold)
+        if regressions:
+            print(f"Throughput regressed beyond {args.threshold:.0%}: {', '.join(regressions)}")
+            sys.exit(1)
+        print("No regressions.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""Per-row latency of single-session scoring: the engine, the scalar kernels and score_batch.
+
+Scores the same pool of completed sessions one at a time through AnalysisEngine.analyze
+(the whole result, for reference), biaslab_kernels.score_session (scores and bias mask,
+in the active kernel mode) and a one-row biaslab_vector.score_batch, then reports the
+median and p99 latency per row. With Numba installed, run it twice: once as is, and
+once with BIASLAB_NO_JIT=1 to time the pure-Python fallback. The first call is timed
+separately, since in "numba" mode it includes loading (or compiling) the kernels.
+
+Run: python benchmarks/bench_kernels.py --rows 20000
+     BIASLAB_NO_JIT=1 python benchmarks/bench_kernels.py --rows 20000
+"""
+
+import argparse
+import json
+import os
+import random
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import biaslab_kernels  # noqa: E402
+from biaslab_engine import DEFAULT_ENGINE  # noqa: E402
+from biaslab_vector import answer_row, option_rows, score_batch  # noqa: E402
+from biaslab_wizard import WizardState  # noqa: E402
+
+from bench_sessions import answer_for, synthetic_decision  # noqa: E402
+
+
+def build_sessions(count, seed):
+    rng = random.Random(seed)
+    sessions = []
+    for _ in range(count):
+        wizard = WizardState(DEFAULT_ENGINE.plan(synthetic_decision(rng)))
+        question = wizard.current_question()
+        while question is not None:
+            question = wizard.submit(answer_for(question, rng))
+        sessions.append(wizard.to_session())
+    return sessions
+
+
+def vector_row(session):
+    chosen, other = option_rows(session.option_scores, session.plan.leaning)
+    return score_batch(answer_row(session.answers)[None, :], chosen[None, :], other[None, :])
+
+
+def time_rows(function, sessions, rows):
+    """(first call in µs, [per-row µs]) for `rows` calls cycling over `sessions`."""
+    start = time.perf_counter()
+    function(sessions[0])
+    first = (time.perf_counter() - start) * 1e6
+    timings = []
+    for index in range(rows):
+        session = sessions[index % len(sessions)]
+        start = time.perf_counter()
+        function(session)
+        timings.append((time.perf_counter() - start) * 1e6)
+    return first, timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=20_000)
+    parser.add_argument("--pool", type=int, default=512, help="distinct sessions to cycle over")
+    parser.add_argument("--seed", type=int, default=3)
+    parser.add_argument("--json", help="also write the results here")
+    args = parser.parse_args()
+
+    sessions = build_sessions(args.pool, args.seed)
+    weights = biaslab_kernels.kernel_weights()
+    paths = {
+        "engine.analyze": DEFAULT_ENGINE.analyze,
+        f"kernels.score_session ({biaslab_kernels.MODE})": lambda session: biaslab_kernels.score_session(session, weights),
+        "vector.score_batch (1 row)": vector_row,
+    }
+
+    results = {"mode": biaslab_kernels.MODE, "rows": args.rows, "paths": {}}
+    print(f"kernel mode: {biaslab_kernels.MODE}, {args.rows:,} rows over {len(sessions)} sessions")
+    for name, function in paths.items():
+        first, timings = time_rows(function, sessions, args.rows)
+        timings.sort()
+        median = statistics.median(timings)
+        p99 = timings[int(len(timings) * 0.99) - 1]
+        results["paths"][name] = {"first_us": first, "median_us": median, "p99_us": p99}
+        print(f"{name:<34} first {first:>10.1f} µs   median {median:>8.2f} µs   p99 {p99:>8.2f} µs")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as file:
+            json.dump(results, file, indent=1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""Memory growth per session of a long-running process, as a regression check.
+
+Runs complete sessions back to back through the wizard and the background analysis
+pipeline (saving to a temporary log), samples a MemoryMonitor every `--every` sessions,
+and reports traced and RSS growth per session once the warm-up sessions (caches,
+first-use imports) are done. Exits with status 1 when traced growth per session passes
+`--max-bytes-per-session`.
+
+Run: python benchmarks/bench_memory.py --sessions 2000 --max-bytes-per-session 2048
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+from functools import partial
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from biaslab_engine import DEFAULT_ENGINE  # noqa: E402
+from biaslab_memory import MemoryMonitor  # noqa: E402
+from biaslab_pipeline import AnalysisPipeline  # noqa: E402
+from biaslab_store import save_session  # noqa: E402
+from biaslab_wizard import WizardState  # noqa: E402
+
+from bench_sessions import answer_for, synthetic_decision  # noqa: E402
+
+
+def run_session(pipeline, rng):
+    wizard = WizardState(DEFAULT_ENGINE.plan(synthetic_decision(rng)))
+    question = wizard.current_question()
+    while question is not None:
+        question = wizard.submit(answer_for(question, rng))
+    job = pipeline.submit(wizard.to_session())
+    while True:
+        update = job.updates.get()
+        if update.stage in ("done", "cancelled", "error"):
+            return update
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sessions", type=int, default=2000)
+    parser.add_argument("--warmup", type=int, default=200)
+    parser.add_argument("--every", type=int, default=100, help="sessions between samples")
+    parser.add_argument("--seed", type=int, default=11)
+    parser.add_argument("--max-bytes-per-session", type=float, help="fail above this traced growth per session")
+    parser.add_argument("--dump", help="also write the monitor's JSON report here")
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    with tempfile.TemporaryDirectory() as directory:
+        pipeline = AnalysisPipeline(save=partial(save_session, file_name=os.path.join(directory, "bench_sessions.csv")))
+        for _ in range(args.warmup):
+            run_session(pipeline, rng)
+
+        monitor = MemoryMonitor().start()
+        monitor.sample(sessions=0)
+        for done in range(1, args.sessions + 1):
+            update = run_session(pipeline, rng)
+            if update.stage == "error":
+                raise update.value
+            if done % args.every == 0 or done == args.sessions:
+                sample = monitor.sample(sessions=done)
+                print(f"{done:>7,} sessions: traced {sample.traced_bytes / 1e6:8.2f} MB  rss {(sample.rss_bytes or 0) / 1e6:8.1f} MB")
+        pipeline.shutdown(wait=True)
+
+    growth = monitor.growth()
+    print(json.dumps({"growth_per_session": growth, "top_growth": monitor.samples[-1].top_growth[:5]}, indent=1))
+    if args.dump:
+        monitor.dump(args.dump)
+    if args.max_bytes_per_session is not None and growth.get("traced_bytes", 0) > args.max_bytes_per_session:
+        print(f"REGRESSION: {growth['traced_bytes']:.0f} traced bytes per session > {args.max_bytes_per_session:.0f}")
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""Questions saved by adaptive pruning on a simulated population, and how often the verdict still matches.
+
+Every simulated user has a fixed answer for each slider (a personal tendency plus noise),
+so the full and the adaptive wizard see identical answers for the questions both ask.
+
+Run: python benchmarks/bench_pruning.py --users 300
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from biaslab_engine import DEFAULT_ENGINE  # noqa: E402
+from biaslab_report import classify_risk  # noqa: E402
+from biaslab_wizard import WizardState  # noqa: E402
+
+from bench_sessions import synthetic_decision  # noqa: E402
+
+
+def simulated_user(rng):
+    """Answer function for one user: same question, same answer."""
+    tendency = rng.randint(2, 8)
+    spread = rng.choice((1, 2, 3))
+    cache = {}
+
+    def step():
+        return max(0, min(10, tendency + rng.randint(-spread, spread) + rng.randint(-2, 2)))
+
+    def answer(question):
+        if question["id"] not in cache:
+            if question["type"] == "single_scale":
+                cache[question["id"]] = step()
+            elif question["type"] == "pair_scale":
+                cache[question["id"]] = (step(), step())
+            else:
+                cache[question["id"]] = "Because it matters to me."
+        return cache[question["id"]]
+
+    return answer
+
+
+def run_wizard(plan, answer, adaptive, max_flip_rate):
+    wizard = WizardState(plan, adaptive=adaptive, max_flip_rate=max_flip_rate)
+    asked = 0
+    question = wizard.current_question()
+    while question is not None:
+        question = wizard.submit(answer(question))
+        asked += 1
+    result = DEFAULT_ENGINE.analyze(wizard.to_session())
+    return asked, (classify_risk(result.total_risk), result.practical_preference)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--users", type=int, default=300)
+    parser.add_argument("--seed", type=int, default=5)
+    parser.add_argument("--max-flip-rate", type=float, nargs="+", default=[0.0, 0.02, 0.05])
+    args = parser.parse_args()
+
+    for max_flip_rate in args.max_flip_rate:
+        rng = random.Random(args.seed)
+        full_total = adaptive_total = agree = 0
+        elapsed = 0.0
+        for _ in range(args.users):
+            plan = DEFAULT_ENGINE.plan(synthetic_decision(rng))
+            answer = simulated_user(rng)
+            full_asked, full_verdict = run_wizard(plan, answer, False, max_flip_rate)
+            start = time.perf_counter()
+            adaptive_asked, adaptive_verdict = run_wizard(plan, answer, True, max_flip_rate)
+            elapsed += time.perf_counter() - start
+            full_total += full_asked
+            adaptive_total += adaptive_asked
+            agree += full_verdict == adaptive_verdict
+
+        saved = (full_total - adaptive_total) / args.users
+        print(
+            f"max flip rate {max_flip_rate:.2f}: {full_total / args.users:.1f} -> {adaptive_total / args.users:.1f} questions "
+            f"({saved:.1f} saved, {100 * saved * args.users / full_total:.0f}%), "
+            f"same verdict {100 * agree / args.users:.1f}%, "
+            f"{1000 * elapsed / max(adaptive_total, 1):.2f} ms/answer"
+        )
+
+
+if __name__ == "__main__":
+    main()
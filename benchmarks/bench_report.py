@@ -0,0 +1,227 @@
+"""Check render_report against a frozen copy of the original line-builder narrative and time both.
+
+Run: python benchmarks/bench_report.py --sessions 100000
+"""
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from biaslab_report import BIAS_GUIDANCE, classify_risk, export_reports, render_report  # noqa: E402
+
+
+class LegacyNarrative:
+    """Frozen copy of the pre-template report builders, kept as the comparison baseline."""
+
+    def __init__(self, values):
+        for key, value in values.items():
+            setattr(self, key, value)
+
+    def _reality_check_lines(self):
+        lines = ["2) Reality Check"]
+
+        if self.justification_gap >= 0.10 and self.total_risk <= 0.45:
+            lines.append(
+                "- Reality: your current option is backed more by real reasons than by pressure."
+            )
+        elif self.justification_gap < 0 and self.total_risk >= 0.50:
+            lines.append(
+                "- Reality: your current leaning looks more driven by pressure than by real reasons."
+            )
+        else:
+            lines.append(
+                "- Reality: the decision is mixed; some reasons are solid, some are shaky."
+            )
+
+        lines.append(
+            f"- Snapshot: gap between options = {self.justification_gap:.2f}, bias risk = {self.total_risk:.2f}."
+        )
+        lines.append("")
+        return lines
+
+    def _bias_pattern_lines(self):
+        lines = ["4) Likely Biases"]
+        if not self.detected_biases:
+            lines.append("- No strong bias pattern detected. Still verify real evidence.")
+            lines.append("")
+            return lines
+
+        for bias in self.detected_biases:
+            lines.append(f"- {bias['name']} ({bias['score']:.2f}): {bias['reality']}")
+        lines.append("")
+        return lines
+
+    def _bias_solution_lines(self):
+        lines = ["5) What You Should Do Next"]
+
+        if self.detected_biases:
+            for bias in self.detected_biases[:3]:
+                lines.append(f"- For {bias['name']}: {bias['action']}")
+        else:
+            lines.append("- Keep your plan, but confirm at least one more real fact first.")
+
+        lines.append("- Re-run BiasLab after applying the steps above and compare distortion risk change.")
+        lines.append("")
+        return lines
+
+    def _summary_lines(self):
+        return [
+            "1) Quick Summary",
+            f"- Overall signal: {classify_risk(self.total_risk)}",
+            f"- Bias risk: {self.total_risk:.2f} | Clarity score: {self.integrity:.2f}",
+            f"- Strength of {self.chosen_label}: {self.chosen_rational:.2f}",
+            f"- Strength of {self.other_label}: {self.other_rational:.2f}",
+            f"- Gap between options: {self.justification_gap:.2f}",
+            "",
+        ]
+
+    def _driver_lines(self):
+        lines = ["3) What is pushing your choice"]
+        items = sorted(self.signal_map.items(), key=lambda item: item[1], reverse=True)[:4]
+        for name, value in items:
+            level = "high" if value >= 0.70 else "moderate" if value >= 0.45 else "low"
+            lines.append(f"- {name}: {value:.2f} ({level} impact)")
+        lines.append("")
+        return lines
+
+    def _interpretation_lines(self):
+        lines = ["6) Plain-English Verdict"]
+        if self.practical_preference:
+            lines.append(
+                f"- Your choice of {self.chosen_label} looks reasonable, not just emotional."
+            )
+            lines.append("- It matches your needs, evidence, and fit with your life.")
+        elif self.justification_gap >= 0:
+            lines.append("- Your choice has some good reasons, but there is also strong pressure.")
+        else:
+            lines.append("- The other option looks stronger on real reasons; this is a warning sign.")
+        lines.append("")
+        return lines
+
+    def _action_protocol_lines(self):
+        lines = ["7) Simple Next Steps"]
+        if self.signal_map["Bias Pressure"] > 0.60:
+            lines.append("- Wait 24 hours, then answer the same questions again with a calm mind.")
+        if self.signal_map["Foresight Gap"] > 0.50:
+            lines.append("- Write a best-case and worst-case story for both options.")
+        if self.signal_map["Fairness Risk"] > 0.50:
+            lines.append("- Check if your choice is respectful to everyone involved.")
+        if self.signal_map["Weak Choice Penalty"] > 0.40:
+            lines.append("- Seriously test the other option before committing.")
+        lines.append("- Re-run BiasLab after you learn 1-2 new facts.")
+        lines.append("")
+        return lines
+
+    def _reflection_lines(self):
+        lines = ["8) Your Notes"]
+        if self.answers.get("counter_text"):
+            lines.append(f"- Strongest counter-argument captured: {self.answers['counter_text']}")
+        if self.answers.get("reason_a"):
+            lines.append(f"- Practical reason for {self.option_a}: {self.answers['reason_a']}")
+        if self.answers.get("reason_b"):
+            lines.append(f"- Practical reason for {self.option_b}: {self.answers['reason_b']}")
+        return lines
+
+    def generate_narrative(self):
+        """Assemble final report text from section-specific text builders."""
+        lines = [
+            "BiasLab Practical Decision Report",
+            "=" * 40,
+            f"Decision: {self.decision}",
+            f"Current leaning: {self.chosen_label}",
+            f"Alternative: {self.other_label}",
+            "",
+        ]
+        lines.extend(self._summary_lines())
+        lines.extend(self._reality_check_lines())
+        lines.extend(self._driver_lines())
+        lines.extend(self._bias_pattern_lines())
+        lines.extend(self._bias_solution_lines())
+        lines.extend(self._interpretation_lines())
+        lines.extend(self._action_protocol_lines())
+        lines.extend(self._reflection_lines())
+        return "\n".join(lines)
+
+
+def synthetic_values(rng):
+    """Random but internally consistent report values for one session."""
+    chosen_rational = rng.random()
+    other_rational = rng.random()
+    gap = chosen_rational - other_rational
+    signal_map = {
+        "Bias Pressure": rng.random(),
+        "Foresight Gap": rng.random(),
+        "Fairness Risk": rng.random(),
+        "Weak Choice Penalty": max(0.0, -gap),
+        "Low Evidence Penalty": 1 - chosen_rational,
+    }
+    risk = rng.random()
+    names = rng.sample(sorted(BIAS_GUIDANCE), rng.randint(0, 4))
+    biases = sorted(
+        (
+            {"name": name, "score": 0.6 + rng.random() * 0.4, "reality": BIAS_GUIDANCE[name][0], "action": BIAS_GUIDANCE[name][1]}
+            for name in names
+        ),
+        key=lambda item: item["score"],
+        reverse=True,
+    )
+    answers = {}
+    for key in ("counter_text", "reason_a", "reason_b"):
+        if rng.random() < 0.5:
+            answers[key] = f"note {{braces}} for {key} #{rng.randint(0, 999)}"
+    return {
+        "decision": f"Should I take offer {rng.randint(0, 99999)} or stay?",
+        "chosen_label": "Take offer",
+        "other_label": "Stay",
+        "option_a": "Take offer",
+        "option_b": "Stay",
+        "total_risk": risk,
+        "integrity": 1 - risk,
+        "chosen_rational": chosen_rational,
+        "other_rational": other_rational,
+        "justification_gap": gap,
+        "practical_preference": rng.random() < 0.2,
+        "signal_map": signal_map,
+        "detected_biases": biases,
+        "answers": answers,
+    }
+
+
+def _time(label, func, count):
+    start = time.perf_counter()
+    func()
+    elapsed = time.perf_counter() - start
+    print(f"{label:<28} {elapsed:8.3f}s  {count / elapsed:12,.0f} reports/s")
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sessions", type=int, default=100_000)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    sessions = [synthetic_values(rng) for _ in range(args.sessions)]
+
+    for values in sessions[:2000]:
+        if render_report(values) != LegacyNarrative(values).generate_narrative():
+            raise SystemExit("render_report output differs from the legacy narrative.")
+
+    legacy = _time("legacy line builders", lambda: [LegacyNarrative(v).generate_narrative() for v in sessions], args.sessions)
+    current = _time("render_report", lambda: [render_report(v) for v in sessions], args.sessions)
+    print(f"speedup: {legacy / current:.2f}x")
+
+    with tempfile.TemporaryDirectory() as folder:
+        for extension in ("txt", "md", "html"):
+            path = os.path.join(folder, f"reports.{extension}")
+            _time(f"stream export (.{extension})", lambda: export_reports(iter(sessions), path), args.sessions)
+
+
+if __name__ == "__main__":
+    main()
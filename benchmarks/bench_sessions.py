@@ -0,0 +1,104 @@
+"""Measure memory per active session and threaded throughput of the kiosk SessionManager.
+
+Run: python benchmarks/bench_sessions.py --sessions 5000 --threads 8
+"""
+
+import argparse
+import os
+import random
+import sys
+import threading
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from biaslab_engine import CONTEXT_KEYWORDS, Decision  # noqa: E402
+from biaslab_wizard import SessionManager  # noqa: E402
+
+
+def synthetic_decision(rng):
+    context = rng.choice(sorted(CONTEXT_KEYWORDS))
+    words = rng.sample(CONTEXT_KEYWORDS[context], 2)
+    return Decision(f"Should I {words[0]} now or {words[1]} later #{rng.randint(0, 10**6)}", leaning=rng.choice("AB"))
+
+
+def answer_for(question, rng):
+    if question["type"] == "single_scale":
+        return rng.randint(0, 10)
+    if question["type"] == "pair_scale":
+        return rng.randint(0, 10), rng.randint(0, 10)
+    return "Because the numbers say so."
+
+
+def measure_memory(count, answers_each, seed):
+    rng = random.Random(seed)
+    decisions = [synthetic_decision(rng) for _ in range(count)]
+    manager = SessionManager(max_sessions=count)
+
+    tracemalloc.start()
+    baseline = tracemalloc.take_snapshot()
+    for decision in decisions:
+        session_id = manager.start(decision)
+        for _ in range(answers_each):
+            question = manager.current_question(session_id)
+            if question is None:
+                break
+            manager.submit(session_id, answer_for(question, rng))
+    snapshot = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+
+    used = sum(stat.size_diff for stat in snapshot.compare_to(baseline, "filename"))
+    print(f"{count:,} active sessions, {answers_each} answers each: {used / count:,.0f} bytes/session")
+
+
+def measure_throughput(count, threads, seed):
+    manager = SessionManager(max_sessions=count * threads)
+
+    def worker(worker_seed):
+        rng = random.Random(worker_seed)
+        for _ in range(count):
+            session_id = manager.start(synthetic_decision(rng))
+            question = manager.current_question(session_id)
+            while question is not None:
+                question = manager.submit(session_id, answer_for(question, rng))
+            manager.finish(session_id)
+
+    pool = [threading.Thread(target=worker, args=(seed + index,)) for index in range(threads)]
+    start = time.perf_counter()
+    for thread in pool:
+        thread.start()
+    for thread in pool:
+        thread.join()
+    elapsed = time.perf_counter() - start
+    total = count * threads
+    print(f"{threads} threads x {count:,} full wizards: {total / elapsed:,.0f} sessions/s")
+
+
+def check_eviction():
+    now = [0.0]
+    manager = SessionManager(max_sessions=3, ttl_seconds=60, clock=lambda: now[0])
+    ids = [manager.start(Decision("Buy a phone or a laptop?")) for _ in range(4)]
+    assert ids[0] not in manager and len(manager) == 3
+    now[0] = 30.0
+    manager.current_question(ids[1])
+    now[0] = 75.0
+    assert manager.evict_expired() == 1 and ids[1] in manager
+    print("eviction:", manager.stats())
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sessions", type=int, default=5000)
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--seed", type=int, default=11)
+    args = parser.parse_args()
+
+    check_eviction()
+    for answers_each in (0, 5, 12):
+        measure_memory(args.sessions, answers_each, args.seed)
+    measure_throughput(max(args.sessions // args.threads, 1), args.threads, args.seed)
+
+
+if __name__ == "__main__":
+    main()
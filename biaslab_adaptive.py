@@ -0,0 +1,111 @@
+"""Adaptive question pruning: skip questions whose answer can no longer change the verdict.
+
+After each answer, every remaining slider question is scored against a fixed set of
+scenarios for the questions still to come. A question's flip rate is the share of
+(scenario, possible answer) pairs where answering it would change the classify_risk
+label or the practical-justification verdict compared with skipping it (skipped
+answers score as 0.5, like any missing answer). Questions at or below the allowed flip
+rate are skipped.
+"""
+
+import numpy as np
+
+from biaslab_engine import OPTION_CRITERIA_KEYS, SCALE_ANSWER_KEYS
+from biaslab_vector import CRITERION_COLUMNS, SCALE_COLUMNS, score_batch
+
+DEFAULT_MAX_FLIP_RATE = 0.02
+SKIPPED_VALUE = 0.5
+STEP_VALUES = np.arange(11) / 10.0
+SCENARIO_COUNT = 128
+
+# Fixed seed: replaying the same answers (for example from the journal) skips the same questions.
+_SCENARIOS = np.random.default_rng(20240601).integers(0, 11, size=(SCENARIO_COUNT, len(SCALE_ANSWER_KEYS) + 2 * len(OPTION_CRITERIA_KEYS))) / 10.0
+_CRITERIA_COUNT = len(OPTION_CRITERIA_KEYS)
+_SCALE_COUNT = len(SCALE_ANSWER_KEYS)
+_SCORED_TYPES = ("single_scale", "pair_scale")
+
+
+def _step_values(steps):
+    return np.array([np.nan if step == 255 else step / 10.0 for step in steps])
+
+
+def _known_rows(wizard):
+    """(answers, chosen, other) rows of what the wizard already knows, NaN elsewhere."""
+    answers = _step_values(wizard.scale_steps)
+    option_a = _step_values(wizard.option_steps[:_CRITERIA_COUNT])
+    option_b = _step_values(wizard.option_steps[_CRITERIA_COUNT:])
+    if wizard.plan.leaning == "A":
+        return answers, option_a, option_b
+    return answers, option_b, option_a
+
+
+def _open_questions(wizard):
+    """Scored questions not answered yet (current one included), in both phases."""
+    if wizard.phase == "cognitive":
+        upcoming = list(wizard.cognitive_questions[wizard.index :]) + list(wizard.plan.option_questions)
+    else:
+        upcoming = list(wizard.plan.option_questions[wizard.index :])
+    return [question for question in upcoming if question["type"] in _SCORED_TYPES]
+
+
+def _columns(question, chosen_key):
+    """Batch columns a question writes: [("answers", i)] or the chosen/other criterion pair."""
+    if question["type"] == "single_scale":
+        return [("answers", SCALE_COLUMNS[question["key"]])]
+    column = CRITERION_COLUMNS[question["key"]]
+    a_side, b_side = ("chosen", "other") if chosen_key == "A" else ("other", "chosen")
+    return [(a_side, column), (b_side, column)]
+
+
+def _scenario_batch(wizard, candidate):
+    """Known answers broadcast over scenarios, with other open questions drawn from the scenarios."""
+    answers, chosen, other = _known_rows(wizard)
+    batch = {
+        "answers": np.tile(answers, (SCENARIO_COUNT, 1)),
+        "chosen": np.tile(chosen, (SCENARIO_COUNT, 1)),
+        "other": np.tile(other, (SCENARIO_COUNT, 1)),
+    }
+    offsets = {"answers": 0, "chosen": _SCALE_COUNT, "other": _SCALE_COUNT + _CRITERIA_COUNT}
+    for question in _open_questions(wizard):
+        if question is candidate:
+            continue
+        for part, column in _columns(question, wizard.plan.leaning):
+            batch[part][:, column] = _SCENARIOS[:, offsets[part] + column]
+    return batch
+
+
+def flip_rate(wizard, question):
+    """Share of (scenario, answer) pairs where answering `question` changes the outcome."""
+    if question["type"] not in _SCORED_TYPES:
+        return 1.0
+
+    batch = _scenario_batch(wizard, question)
+    columns = _columns(question, wizard.plan.leaning)
+    if len(columns) == 1:
+        sweeps = [(value,) for value in STEP_VALUES]
+    else:
+        sweeps = [(value_a, value_b) for value_a in STEP_VALUES for value_b in STEP_VALUES]
+
+    # Row block 0 is "skipped"; block k + 1 is the k-th possible answer.
+    blocks = len(sweeps) + 1
+    stacked = {part: np.tile(array, (blocks, 1)) for part, array in batch.items()}
+    for (part, column) in columns:
+        stacked[part][:SCENARIO_COUNT, column] = SKIPPED_VALUE
+    for block, values in enumerate(sweeps, start=1):
+        rows = slice(block * SCENARIO_COUNT, (block + 1) * SCENARIO_COUNT)
+        for (part, column), value in zip(columns, values):
+            stacked[part][rows, column] = value
+
+    scores = score_batch(stacked["answers"], stacked["chosen"], stacked["other"])
+    outcome = scores["risk_class"] * 2 + scores["practical_preference"]
+    outcome = outcome.reshape(blocks, SCENARIO_COUNT)
+    return float(np.mean(outcome[1:] != outcome[0]))
+
+
+def remaining_flip_rates(wizard):
+    """Flip rate of every scored question still open, keyed by question ID."""
+    return {question["id"]: flip_rate(wizard, question) for question in _open_questions(wizard)}
+
+
+def should_skip(wizard, question, max_flip_rate=DEFAULT_MAX_FLIP_RATE):
+    return question["type"] in _SCORED_TYPES and flip_rate(wizard, question) <= max_flip_rate
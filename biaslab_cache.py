@@ -0,0 +1,508 @@
+"""Content-addressed memo of analysis results, in one process or shared between worker processes.
+
+Slider answers are whole steps (0-10), so the same answer vectors come back across users
+and re-runs. A result's scores and detected biases depend only on the slider answers,
+both options' criterion scores, what the notes add to the text rules, and the engine's
+weights and rule thresholds. result_key hashes exactly those, with missing answers as the
+0.5 they score as, and CachedEngine.analyze looks the scores up before running the engine.
+The labels, answers and option scores of a returned AnalysisResult always come from the
+session being analyzed, so a hit is identical to a fresh analysis. The verdict
+counterfactuals, the costliest stage of an analysis, are memoized the same way (see
+counterfactual_key); the narrative is not, since it quotes the decision and option labels.
+
+ResultCache is a bounded LRU for one process. SharedResultCache keeps the same entries in
+a multiprocessing.shared_memory table (set-associative, LRU within each set) behind one
+lock, so process-pool workers share one cache: create it in the parent and start the
+pool with `initializer=init_worker, initargs=cache.worker_args()`.
+
+Weights and thresholds are part of every key; bump CACHE_VERSION when a formula changes.
+"""
+
+import hashlib
+import math
+import multiprocessing
+import struct
+import threading
+from collections import OrderedDict, namedtuple
+from multiprocessing import shared_memory
+
+from biaslab_engine import (
+    BIAS_GUIDANCE,
+    BIAS_RULES,
+    DEFAULT_ENGINE,
+    OPTION_CRITERIA_KEYS,
+    SCALE_ANSWER_KEYS,
+    AnalysisResult,
+    answer,
+)
+from biaslab_counterfactual import AnswerChange, Counterfactual
+from biaslab_counterfactual import verdict_counterfactuals as _verdict_counterfactuals
+from biaslab_engine import detect_bias_patterns as _detect_bias_patterns
+from biaslab_text import note_signals
+from biaslab_vector import RISK_LABELS
+
+CACHE_VERSION = 1
+DEFAULT_ENTRIES = 65_536
+DEFAULT_WAYS = 8
+
+# hit_rate is hits / (hits + misses), 0 before the first lookup.
+CacheStats = namedtuple("CacheStats", ["hits", "misses", "evictions", "entries", "capacity", "hit_rate"])
+
+
+def _stats(hits, misses, evictions, entries, capacity):
+    lookups = hits + misses
+    return CacheStats(hits, misses, evictions, entries, capacity, hits / lookups if lookups else 0.0)
+
+
+# ==========================================================
+# SECTION 1: KEYS AND RECORDS
+# ==========================================================
+
+_TEXT_RULES = [rule["text_score"] for rule in BIAS_RULES if "text_score" in rule]
+_RULE_INDEX = {rule["name"]: index for index, rule in enumerate(BIAS_RULES)}
+_MAX_BIASES = 4
+
+# Key payloads: slider answers, then chosen and other criterion scores (or chosen_rational
+# and the Low Evidence Penalty), then the text-rule scores of the notes. Counterfactuals
+# only move answered sliders and asked criteria and name options by key, so their key
+# keeps unasked ones as NaN and adds the leaning instead of the notes.
+_ANALYSIS_KEY = struct.Struct(f"<{len(SCALE_ANSWER_KEYS)}d{2 * len(OPTION_CRITERIA_KEYS)}d{len(_TEXT_RULES)}d")
+_BIAS_KEY = struct.Struct(f"<{len(SCALE_ANSWER_KEYS)}d2d{len(_TEXT_RULES)}d")
+_COUNTERFACTUAL_KEY = struct.Struct(f"<c{len(SCALE_ANSWER_KEYS)}d{2 * len(OPTION_CRITERIA_KEYS)}d")
+
+# Records: the five signal values, distortion risk, rational scores and gap, practical
+# preference, then up to four detected biases as (BIAS_RULES index, score).
+_ANALYSIS_RECORD = struct.Struct(f"<8d?B{_MAX_BIASES}B{_MAX_BIASES}d")
+_BIAS_RECORD = struct.Struct(f"<B{_MAX_BIASES}B{_MAX_BIASES}d")
+
+# Counterfactual records: a count, then per counterfactual its goal (a _GOALS index),
+# change count, steps, risk and practical preference, followed by its changes as
+# (source: 0 = answer, 1 = A, 2 = B; key index; from step; to step).
+_GOALS = (*RISK_LABELS, "Practical preference", "Not a practical preference")
+_SOURCES = ("answer", "A", "B")
+_COUNT = struct.Struct("<B")
+_COUNTERFACTUAL_HEADER = struct.Struct("<BBHd?")
+_CHANGE = struct.Struct("<4B")
+_MAX_COUNTERFACTUALS = len(RISK_LABELS)  # every better risk label, plus the practical flip
+_MAX_CHANGES = len(SCALE_ANSWER_KEYS) + 2 * len(OPTION_CRITERIA_KEYS)
+
+VALUE_SIZE = max(_ANALYSIS_RECORD.size, _COUNT.size + _MAX_COUNTERFACTUALS * (_COUNTERFACTUAL_HEADER.size + _MAX_CHANGES * _CHANGE.size))
+
+
+def _rules_config():
+    return [CACHE_VERSION, [(rule["name"], rule["threshold"]) for rule in BIAS_RULES]]
+
+
+def config_version(engine=DEFAULT_ENGINE):
+    """16-byte digest of CACHE_VERSION, the engine's weights (in summation order) and the rule thresholds."""
+    config = _rules_config() + [list(engine.rational_weights.items()), list(engine.distortion_weights.items())]
+    return hashlib.blake2b(repr(config).encode("utf-8"), digest_size=16).digest()
+
+
+_RULES_VERSION = hashlib.blake2b(repr(_rules_config()).encode("utf-8"), digest_size=16).digest()
+
+
+def _digest(payload, version, kind):
+    return hashlib.blake2b(payload, digest_size=16, key=version, person=kind).digest()
+
+
+def _text_floors(notes):
+    return [text_score(notes) or 0.0 for text_score in _TEXT_RULES]
+
+
+def result_key(session, version):
+    """16-byte key of everything a Session's scores depend on; `version` is config_version(engine)."""
+    chosen_key = session.plan.leaning
+    other_key = "B" if chosen_key == "A" else "A"
+    chosen = session.option_scores.get(chosen_key, {})
+    other = session.option_scores.get(other_key, {})
+    payload = _ANALYSIS_KEY.pack(
+        *[answer(session.answers, key) for key in SCALE_ANSWER_KEYS],
+        *[chosen.get(key, 0.5) for key in OPTION_CRITERIA_KEYS],
+        *[other.get(key, 0.5) for key in OPTION_CRITERIA_KEYS],
+        *_text_floors(note_signals(session.answers, chosen_key)),
+    )
+    return _digest(payload, version, b"analysis")
+
+
+def _pack_biases(biases):
+    indices = [_RULE_INDEX[bias["name"]] for bias in biases]
+    scores = [bias["score"] for bias in biases]
+    padding = _MAX_BIASES - len(biases)
+    return [len(biases), *indices, *[0] * padding, *scores, *[0.0] * padding]
+
+
+def _unpack_biases(count, indices, scores):
+    biases = []
+    for index, score in zip(indices[:count], scores[:count]):
+        name = BIAS_RULES[index]["name"]
+        reality, action = BIAS_GUIDANCE[name]
+        biases.append({"name": name, "score": score, "reality": reality, "action": action})
+    return biases
+
+
+def _pack_result(result):
+    signals = result.signal_map
+    return _ANALYSIS_RECORD.pack(
+        signals["Bias Pressure"],
+        signals["Foresight Gap"],
+        signals["Fairness Risk"],
+        signals["Weak Choice Penalty"],
+        result.total_risk,
+        result.chosen_rational,
+        result.other_rational,
+        result.justification_gap,
+        result.practical_preference,
+        *_pack_biases(result.detected_biases),
+    )
+
+
+def _rebuild_result(session, record):
+    """The AnalysisResult engine.analyze(session) returns, from a cached record."""
+    fields = _ANALYSIS_RECORD.unpack(record)
+    bias_pressure, foresight_gap, fairness_risk, weak_choice_penalty, distortion_risk, chosen_rational, other_rational, justification_gap = fields[:8]
+    practical_preference, count = fields[8:10]
+    indices = fields[10 : 10 + _MAX_BIASES]
+    scores = fields[10 + _MAX_BIASES :]
+
+    plan = session.plan
+    chosen_key = plan.leaning
+    other_key = "B" if chosen_key == "A" else "A"
+    chosen_scores = dict.fromkeys(OPTION_CRITERIA_KEYS, 0.5)
+    chosen_scores.update(session.option_scores.get(chosen_key, {}))
+    other_scores = dict.fromkeys(OPTION_CRITERIA_KEYS, 0.5)
+    other_scores.update(session.option_scores.get(other_key, {}))
+    return AnalysisResult(
+        decision=plan.decision,
+        option_a=plan.option_a,
+        option_b=plan.option_b,
+        context=plan.context,
+        scale=plan.scale,
+        chosen_key=chosen_key,
+        other_key=other_key,
+        chosen_label=plan.option_a if chosen_key == "A" else plan.option_b,
+        other_label=plan.option_b if chosen_key == "A" else plan.option_a,
+        chosen_scores=chosen_scores,
+        other_scores=other_scores,
+        total_risk=distortion_risk,
+        integrity=1 - distortion_risk,
+        chosen_rational=chosen_rational,
+        other_rational=other_rational,
+        justification_gap=justification_gap,
+        practical_preference=practical_preference,
+        signal_map={
+            "Bias Pressure": bias_pressure,
+            "Foresight Gap": foresight_gap,
+            "Fairness Risk": fairness_risk,
+            "Weak Choice Penalty": weak_choice_penalty,
+            "Low Evidence Penalty": (1 - chosen_rational),
+        },
+        detected_biases=_unpack_biases(count, indices, scores),
+        answers=dict(session.answers),
+        option_scores={key: dict(scores) for key, scores in session.option_scores.items()},
+    )
+
+
+def counterfactual_key(result, version, option_scores=None):
+    """16-byte key of everything verdict_counterfactuals(result, option_scores=option_scores) depends on.
+
+    Unasked sliders and criteria (absent from the answers / `option_scores`) hash as NaN,
+    since the solver never moves them; None uses the result's own option_scores.
+    """
+    if option_scores is None:
+        option_scores = result.option_scores
+    chosen = option_scores.get(result.chosen_key, {})
+    other = option_scores.get(result.other_key, {})
+    answers = [result.answers.get(key) for key in SCALE_ANSWER_KEYS]
+    payload = _COUNTERFACTUAL_KEY.pack(
+        result.chosen_key.encode("ascii"),
+        *[value if isinstance(value, (int, float)) else math.nan for value in answers],
+        *[chosen.get(key, math.nan) for key in OPTION_CRITERIA_KEYS],
+        *[other.get(key, math.nan) for key in OPTION_CRITERIA_KEYS],
+    )
+    return _digest(payload, version, b"counterfactuals")
+
+
+def _pack_counterfactuals(counterfactuals):
+    parts = [_COUNT.pack(len(counterfactuals))]
+    for counterfactual in counterfactuals:
+        parts.append(_COUNTERFACTUAL_HEADER.pack(_GOALS.index(counterfactual.goal), len(counterfactual.changes), counterfactual.steps, counterfactual.risk, counterfactual.practical_preference))
+        for change in counterfactual.changes:
+            keys = SCALE_ANSWER_KEYS if change.source == "answer" else OPTION_CRITERIA_KEYS
+            parts.append(_CHANGE.pack(_SOURCES.index(change.source), keys.index(change.key), change.from_step, change.to_step))
+    return b"".join(parts)
+
+
+def _unpack_counterfactuals(record):
+    (count,) = _COUNT.unpack_from(record)
+    offset = _COUNT.size
+    counterfactuals = []
+    for _ in range(count):
+        goal, change_count, steps, risk, practical_preference = _COUNTERFACTUAL_HEADER.unpack_from(record, offset)
+        offset += _COUNTERFACTUAL_HEADER.size
+        changes = []
+        for _ in range(change_count):
+            source, key, from_step, to_step = _CHANGE.unpack_from(record, offset)
+            offset += _CHANGE.size
+            keys = SCALE_ANSWER_KEYS if source == 0 else OPTION_CRITERIA_KEYS
+            changes.append(AnswerChange(_SOURCES[source], keys[key], from_step, to_step))
+        counterfactuals.append(Counterfactual(_GOALS[goal], changes, steps, risk, practical_preference))
+    return counterfactuals
+
+
+# ==========================================================
+# SECTION 2: IN-PROCESS LRU
+# ==========================================================
+
+
+class ResultCache:
+    """Thread-safe LRU of packed records by 16-byte key, bounded at `max_entries`."""
+
+    def __init__(self, max_entries=DEFAULT_ENTRIES):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key):
+        """The record stored under `key` (now the most recently used), or None."""
+        with self._lock:
+            record = self._entries.get(key)
+            if record is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return record
+
+    def put(self, key, record):
+        with self._lock:
+            self._entries[key] = record
+            self._entries.move_to_end(key)
+            if len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = self.evictions = 0
+
+    def stats(self):
+        with self._lock:
+            return _stats(self.hits, self.misses, self.evictions, len(self._entries), self.max_entries)
+
+
+# ==========================================================
+# SECTION 3: SHARED-MEMORY TABLE FOR PROCESS POOLS
+# ==========================================================
+
+SHARED_MAGIC = b"BLRC0001"
+# Header: magic, sets, ways, then the counters at the _CLOCK.._ENTRIES offsets.
+_HEADER = struct.Struct("<8s7Q")
+_U64 = struct.Struct("<Q")
+_CLOCK, _HITS, _MISSES, _EVICTIONS, _ENTRIES = (24, 32, 40, 48, 56)
+# Slot: key, last use on the shared clock (0 = empty), record length, then the record.
+_SLOT_HEAD = struct.Struct("<16sQH")
+_SLOT_SIZE = _SLOT_HEAD.size + VALUE_SIZE
+
+
+class SharedResultCache:
+    """ResultCache interface over a shared-memory table: `ways` slots per set, LRU within a set.
+
+    Every process that attaches sees the same entries and counters; one multiprocessing
+    lock serializes access. Only the creating process should unlink() it.
+    """
+
+    def __init__(self, memory, lock, owner=False):
+        self._memory = memory
+        self._buffer = memory.buf
+        self._lock = lock
+        self.owner = owner
+        magic, self.sets, self.ways = _HEADER.unpack_from(self._buffer)[:3]
+        if magic != SHARED_MAGIC:
+            raise ValueError(f"Shared memory {memory.name!r} is not a BiasLab result cache.")
+        self.max_entries = self.sets * self.ways
+
+    @classmethod
+    def create(cls, max_entries=DEFAULT_ENTRIES, ways=DEFAULT_WAYS, lock=None):
+        """A new zeroed table with room for at least `max_entries` records."""
+        sets = max(1, -(-max_entries // ways))
+        memory = shared_memory.SharedMemory(create=True, size=_HEADER.size + sets * ways * _SLOT_SIZE)
+        memory.buf[: memory.size] = bytes(memory.size)
+        _HEADER.pack_into(memory.buf, 0, SHARED_MAGIC, sets, ways, 0, 0, 0, 0, 0)
+        return cls(memory, lock or multiprocessing.Lock(), owner=True)
+
+    @classmethod
+    def attach(cls, name, lock):
+        """The table another process created, by its shared-memory name and lock."""
+        return cls(shared_memory.SharedMemory(name=name), lock)
+
+    def worker_args(self):
+        """initargs for init_worker."""
+        return (self._memory.name, self._lock)
+
+    def __len__(self):
+        return _U64.unpack_from(self._buffer, _ENTRIES)[0]
+
+    def _bump(self, offset, by=1):
+        value = _U64.unpack_from(self._buffer, offset)[0] + by
+        _U64.pack_into(self._buffer, offset, value)
+        return value
+
+    def _slots(self, key):
+        first = _HEADER.size + int.from_bytes(key[:8], "little") % self.sets * self.ways * _SLOT_SIZE
+        return range(first, first + self.ways * _SLOT_SIZE, _SLOT_SIZE)
+
+    def get(self, key):
+        with self._lock:
+            for offset in self._slots(key):
+                slot_key, used, length = _SLOT_HEAD.unpack_from(self._buffer, offset)
+                if used and slot_key == key:
+                    _U64.pack_into(self._buffer, offset + 16, self._bump(_CLOCK))
+                    self._bump(_HITS)
+                    start = offset + _SLOT_HEAD.size
+                    return bytes(self._buffer[start : start + length])
+            self._bump(_MISSES)
+            return None
+
+    def put(self, key, record):
+        if len(record) > VALUE_SIZE:
+            raise ValueError(f"Cached records are at most {VALUE_SIZE} bytes, got {len(record)}.")
+        with self._lock:
+            target = target_used = None
+            for offset in self._slots(key):
+                slot_key, used, _ = _SLOT_HEAD.unpack_from(self._buffer, offset)
+                if used and slot_key == key:
+                    target, target_used = offset, None
+                    break
+                if target is None or used < target_used:
+                    target, target_used = offset, used
+            if target_used == 0:
+                self._bump(_ENTRIES)
+            elif target_used is not None:
+                self._bump(_EVICTIONS)
+            _SLOT_HEAD.pack_into(self._buffer, target, key, self._bump(_CLOCK), len(record))
+            start = target + _SLOT_HEAD.size
+            self._buffer[start : start + len(record)] = record
+
+    def clear(self):
+        with self._lock:
+            self._buffer[_HEADER.size :] = bytes(len(self._buffer) - _HEADER.size)
+            _HEADER.pack_into(self._buffer, 0, SHARED_MAGIC, self.sets, self.ways, 0, 0, 0, 0, 0)
+
+    def stats(self):
+        with self._lock:
+            hits, misses, evictions, entries = _HEADER.unpack_from(self._buffer)[4:]
+            return _stats(hits, misses, evictions, entries, self.max_entries)
+
+    def close(self):
+        """Detach this process; the creator's unlink() frees the memory."""
+        self._buffer.release()
+        self._memory.close()
+
+    def unlink(self):
+        self._memory.unlink()
+
+
+_worker_cache = None
+
+
+def init_worker(name, lock):
+    """Process-pool initializer: attach the worker to a SharedResultCache (see worker_args)."""
+    global _worker_cache
+    _worker_cache = SharedResultCache.attach(name, lock)
+
+
+def worker_cache():
+    """The cache init_worker attached this process to, else a process-local ResultCache."""
+    global _worker_cache
+    if _worker_cache is None:
+        _worker_cache = ResultCache()
+    return _worker_cache
+
+
+# ==========================================================
+# SECTION 4: MEMOIZED ANALYSIS AND BIAS DETECTION
+# ==========================================================
+
+
+class CachedEngine:
+    """An AnalysisEngine whose analyze() and counterfactuals are memoized in `cache`; everything else is the wrapped engine's."""
+
+    def __init__(self, engine=DEFAULT_ENGINE, cache=None):
+        self.engine = engine
+        self.cache = ResultCache() if cache is None else cache
+        self.version = config_version(engine)
+
+    def __getattr__(self, name):
+        return getattr(self.engine, name)
+
+    def analyze(self, session):
+        key = result_key(session, self.version)
+        record = self.cache.get(key)
+        if record is not None:
+            return _rebuild_result(session, record)
+        result = self.engine.analyze(session)
+        self.cache.put(key, _pack_result(result))
+        return result
+
+    def verdict_counterfactuals(self, result, option_scores=None):
+        key = counterfactual_key(result, self.version, option_scores)
+        record = self.cache.get(key)
+        if record is not None:
+            return _unpack_counterfactuals(record)
+        counterfactuals = _verdict_counterfactuals(result, self.engine, option_scores)
+        self.cache.put(key, _pack_counterfactuals(counterfactuals))
+        return counterfactuals
+
+
+def verdict_counterfactuals(result, engine=DEFAULT_ENGINE, option_scores=None):
+    """biaslab_counterfactual.verdict_counterfactuals, memoized when `engine` is a CachedEngine."""
+    if isinstance(engine, CachedEngine):
+        return engine.verdict_counterfactuals(result, option_scores)
+    return _verdict_counterfactuals(result, engine, option_scores)
+
+
+_bias_cache = ResultCache()
+
+
+def detect_bias_patterns(answers, chosen_rational, signal_map, notes=None, cache=None):
+    """biaslab_engine.detect_bias_patterns, memoized in `cache` (default: a module-wide ResultCache)."""
+    cache = _bias_cache if cache is None else cache
+    payload = _BIAS_KEY.pack(
+        *[answer(answers, key) for key in SCALE_ANSWER_KEYS],
+        chosen_rational,
+        signal_map.get("Low Evidence Penalty", 0),
+        *(_text_floors(notes) if notes is not None else [0.0] * len(_TEXT_RULES)),
+    )
+    key = _digest(payload, _RULES_VERSION, b"biases")
+    record = cache.get(key)
+    if record is not None:
+        fields = _BIAS_RECORD.unpack(record)
+        return _unpack_biases(fields[0], fields[1 : 1 + _MAX_BIASES], fields[1 + _MAX_BIASES :])
+    biases = _detect_bias_patterns(answers, chosen_rational, signal_map, notes)
+    cache.put(key, _BIAS_RECORD.pack(*_pack_biases(biases)))
+    return biases
+
+
+def bias_cache_stats():
+    return _bias_cache.stats()
+
+
+_golden_engine = None
+
+
+def golden_candidate(batch):
+    """biaslab_golden candidate: CachedEngine over this worker's cache (`--candidate biaslab_cache:golden_candidate`)."""
+    from biaslab_golden import batch_sessions, result_outputs
+
+    global _golden_engine
+    if _golden_engine is None:
+        _golden_engine = CachedEngine(cache=worker_cache())
+    return result_outputs([_golden_engine.analyze(session) for session in batch_sessions(batch)])
@@ -0,0 +1,248 @@
+"""Cohort analytics over the session history: which risks and biases dominate which decisions.
+
+Sessions are grouped by (context, scale, classify_risk label). Each log part (rotated
+segment or active file) is aggregated in a worker process into mergeable partials:
+counts, sums, bias counts and t-digests for quantiles. The partials are then merged, so
+the work splits across as many processes as there are segments.
+
+Run: python biaslab_cohorts.py --since 2026-10-01 --context career
+"""
+
+import argparse
+import json
+import math
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from biaslab_engine import identify_dilemma_profile
+from biaslab_report import classify_risk
+from biaslab_store import BIAS_SEPARATOR, SESSION_LOG, log_sources, read_source
+
+DIGEST_COMPRESSION = 100
+DIGEST_BUFFER = 2048
+
+
+# ==========================================================
+# SECTION 1: MERGEABLE PARTIAL AGGREGATES
+# ==========================================================
+
+
+class TDigest:
+    """Merging t-digest: approximate quantiles in bounded memory, mergeable across workers."""
+
+    def __init__(self, compression=DIGEST_COMPRESSION):
+        self.compression = compression
+        self.means = np.empty(0)
+        self.weights = np.empty(0)
+        self.minimum = math.inf
+        self.maximum = -math.inf
+        self._buffer = []
+
+    def __len__(self):
+        self._flush()
+        return int(self.weights.sum())
+
+    def add(self, value):
+        self._buffer.append(value)
+        if len(self._buffer) >= DIGEST_BUFFER:
+            self._flush()
+
+    def merge(self, other):
+        other._flush()
+        self._flush()
+        self.minimum = min(self.minimum, other.minimum)
+        self.maximum = max(self.maximum, other.maximum)
+        self._compress(np.concatenate([self.means, other.means]), np.concatenate([self.weights, other.weights]))
+        return self
+
+    def _flush(self):
+        if not self._buffer:
+            return
+        values = np.asarray(self._buffer, dtype=float)
+        self._buffer = []
+        self.minimum = min(self.minimum, values.min())
+        self.maximum = max(self.maximum, values.max())
+        self._compress(np.concatenate([self.means, values]), np.concatenate([self.weights, np.ones(len(values))]))
+
+    def _compress(self, means, weights):
+        order = np.argsort(means, kind="stable")
+        means, weights = means[order], weights[order]
+        total = weights.sum()
+        scale = self.compression / (2 * math.pi)
+
+        merged_means, merged_weights = [], []
+        current_mean, current_weight = means[0], weights[0]
+        done = 0.0
+        k_left = scale * math.asin(-1.0)
+        for mean, weight in zip(means[1:], weights[1:]):
+            q_right = min((done + current_weight + weight) / total, 1.0)
+            if scale * math.asin(2 * q_right - 1) - k_left <= 1.0:
+                current_mean += (mean - current_mean) * weight / (current_weight + weight)
+                current_weight += weight
+            else:
+                merged_means.append(current_mean)
+                merged_weights.append(current_weight)
+                done += current_weight
+                k_left = scale * math.asin(min(2 * done / total - 1, 1.0))
+                current_mean, current_weight = mean, weight
+        merged_means.append(current_mean)
+        merged_weights.append(current_weight)
+        self.means = np.array(merged_means)
+        self.weights = np.array(merged_weights)
+
+    def quantile(self, q):
+        self._flush()
+        if not len(self.weights):
+            return math.nan
+        centres = np.cumsum(self.weights) - self.weights / 2
+        positions = np.concatenate([[0.0], centres, [self.weights.sum()]])
+        values = np.concatenate([[self.minimum], self.means, [self.maximum]])
+        return float(np.interp(q * self.weights.sum(), positions, values))
+
+
+class CohortStats:
+    """Partial aggregate for one cohort; `merge` combines partials from different workers."""
+
+    __slots__ = ("count", "risk_sum", "gap_sum", "risk_digest", "gap_digest", "bias_counts", "rows_with_biases")
+
+    def __init__(self):
+        self.count = 0
+        self.risk_sum = 0.0
+        self.gap_sum = 0.0
+        self.risk_digest = TDigest()
+        self.gap_digest = TDigest()
+        self.bias_counts = {}
+        # Sessions logged before biases were recorded carry no bias information.
+        self.rows_with_biases = 0
+
+    def add(self, risk, gap, biases):
+        self.count += 1
+        self.risk_sum += risk
+        self.gap_sum += gap
+        self.risk_digest.add(risk)
+        self.gap_digest.add(gap)
+        if biases is not None:
+            self.rows_with_biases += 1
+            for name in biases:
+                self.bias_counts[name] = self.bias_counts.get(name, 0) + 1
+
+    def merge(self, other):
+        self.count += other.count
+        self.risk_sum += other.risk_sum
+        self.gap_sum += other.gap_sum
+        self.risk_digest.merge(other.risk_digest)
+        self.gap_digest.merge(other.gap_digest)
+        self.rows_with_biases += other.rows_with_biases
+        for name, count in other.bias_counts.items():
+            self.bias_counts[name] = self.bias_counts.get(name, 0) + count
+        return self
+
+    def summary(self, top_biases=3):
+        ranked = sorted(self.bias_counts.items(), key=lambda item: (-item[1], item[0]))[:top_biases]
+        return {
+            "sessions": self.count,
+            "distortion_risk": {
+                "mean": self.risk_sum / self.count,
+                "p10": self.risk_digest.quantile(0.10),
+                "p50": self.risk_digest.quantile(0.50),
+                "p90": self.risk_digest.quantile(0.90),
+            },
+            "justification_gap": {
+                "mean": self.gap_sum / self.count,
+                "p10": self.gap_digest.quantile(0.10),
+                "p50": self.gap_digest.quantile(0.50),
+                "p90": self.gap_digest.quantile(0.90),
+            },
+            "bias_frequency": {name: count / self.rows_with_biases for name, count in ranked} if self.rows_with_biases else {},
+        }
+
+
+# ==========================================================
+# SECTION 2: MAP (ONE LOG PART PER WORKER) AND REDUCE
+# ==========================================================
+
+
+def aggregate_source(source, start=None, end=None, context=None, scale=None):
+    """{(context, scale, risk label): CohortStats} for one log part."""
+    cohorts = {}
+    profiles = {}
+    for row in read_source(source, start, end):
+        row_context, row_scale = row.get("context"), row.get("scale")
+        if not row_context:
+            # Rows from before the context column: profile the text (re-runs hit the cache).
+            profile = profiles.get(row["decision"])
+            if profile is None:
+                profile = profiles[row["decision"]] = identify_dilemma_profile(row["decision"])
+            row_context, row_scale = profile["domain"], profile["scale"]
+        if (context and row_context != context) or (scale and row_scale != scale):
+            continue
+
+        risk = float(row["distortion_risk"])
+        key = (row_context, row_scale, classify_risk(risk))
+        stats = cohorts.get(key)
+        if stats is None:
+            stats = cohorts[key] = CohortStats()
+        biases = row.get("detected_biases")
+        stats.add(risk, float(row["justification_gap"]), None if biases is None else [name for name in biases.split(BIAS_SEPARATOR) if name])
+    return cohorts
+
+
+def merge_cohorts(partials):
+    merged = {}
+    for partial in partials:
+        for key, stats in partial.items():
+            if key in merged:
+                merged[key].merge(stats)
+            else:
+                merged[key] = stats
+    return merged
+
+
+def cohort_report(file_name=SESSION_LOG, start=None, end=None, context=None, scale=None, workers=None):
+    """Aggregate the whole logical log; returns {(context, scale, risk label): CohortStats}."""
+    sources = log_sources(file_name, start, end)
+    workers = workers or os.cpu_count() or 1
+    if workers == 1 or len(sources) <= 1:
+        return merge_cohorts(aggregate_source(source, start, end, context, scale) for source in sources)
+
+    count = len(sources)
+    with ProcessPoolExecutor(max_workers=min(workers, count)) as pool:
+        partials = pool.map(aggregate_source, sources, [start] * count, [end] * count, [context] * count, [scale] * count)
+        return merge_cohorts(partials)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--log", default=SESSION_LOG)
+    parser.add_argument("--since", help="ISO date or timestamp (inclusive)")
+    parser.add_argument("--until", help="ISO date or timestamp (inclusive)")
+    parser.add_argument("--context")
+    parser.add_argument("--scale", choices=["small", "standard", "major"])
+    parser.add_argument("--workers", type=int)
+    parser.add_argument("--json", action="store_true", help="print the report as JSON")
+    args = parser.parse_args()
+
+    # A bare end date covers that whole day.
+    until = args.until + "T23:59:59" if args.until and len(args.until) == 10 else args.until
+    cohorts = cohort_report(args.log, args.since, until, args.context, args.scale, args.workers)
+    ordered = sorted(cohorts.items(), key=lambda item: (-item[1].count, item[0]))
+
+    if args.json:
+        print(json.dumps([dict(zip(("context", "scale", "risk"), key), **stats.summary()) for key, stats in ordered], indent=2))
+        return
+
+    for (context, scale, risk), stats in ordered:
+        summary = stats.summary()
+        risk_stats, gap_stats = summary["distortion_risk"], summary["justification_gap"]
+        biases = ", ".join(f"{name} {share:.0%}" for name, share in summary["bias_frequency"].items()) or "-"
+        print(
+            f"{context:<12} {scale:<8} {risk:<30} n={stats.count:<8,} "
+            f"risk p50={risk_stats['p50']:.2f} p90={risk_stats['p90']:.2f}  "
+            f"gap mean={gap_stats['mean']:+.2f}  top biases: {biases}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,310 @@
+"""Counterfactual verdicts: the fewest slider steps that would change a report's verdict.
+
+Distortion risk is linear in every slider answer and in the chosen option's criteria,
+plus one hinge, the weak-choice penalty max(0, -gap), which only pays for gap-closing
+steps while the chosen option still trails. Each step therefore has a fixed risk gain
+(plus the hinge share while it lasts), and taking the largest marginal gain step by step
+finds the smallest set of changes that crosses a classify_risk threshold. The
+practical-justification check is a conjunction of thresholds, so its flip is the cheapest
+failing (or passing) condition. Only answered sliders and scored criteria are changed;
+an unasked criterion keeps the 0.5 it scores as, so a goal that would need it to move
+has no counterfactual. The result is then re-scored with the engine's own formulas, so
+float rounding at a threshold cannot lie.
+"""
+
+from collections import namedtuple
+
+from biaslab_engine import (
+    BIAS_PRESSURE_KEYS,
+    DEFAULT_ENGINE,
+    SCALE_ANSWER_KEYS,
+    calculate_bias_pressure,
+    calculate_distortion_risk,
+    calculate_fairness_risk,
+    calculate_foresight_gap,
+    calculate_rational_quality,
+    is_practically_justified,
+)
+from biaslab_report import classify_risk
+from biaslab_vector import RISK_LABELS
+
+# Upper bounds (exclusive) of the classify_risk labels, best label first.
+RISK_THRESHOLDS = (0.30, 0.60)
+MAX_STEP = 10
+
+# Minimum chosen-option steps (and counter_strength step) for is_practically_justified.
+PRACTICAL_MIN_STEPS = {"compatibility": 7, "need_fit": 7, "evidence": 6}
+PRACTICAL_COUNTER_STEP = 5
+PRACTICAL_MIN_GAP = 0.05
+
+SLIDER_NAMES = {
+    "emotion": "how emotional you feel",
+    "urgency": "the rush to decide",
+    "social_pressure": "pressure from others",
+    "novelty_pull": "the pull of novelty",
+    "counter_strength": "the case for the other option",
+    "alt_exploration": "how far you explored alternatives",
+    "fairness": "fairness to the people affected",
+    "harm_risk": "risk of harm to others",
+    "identity_attachment": "identity attachment",
+    "sunk_cost": "sunk-cost pull",
+    "loss_aversion": "fear of loss",
+    "failure_preview": "how well you pictured failure",
+    "regret_preview": "how well you pictured regret",
+}
+
+CRITERION_NAMES = {
+    "need_fit": "need fit",
+    "long_term": "long-term value",
+    "tradeoff": "worth the trade-off",
+    "evidence": "evidence",
+    "compatibility": "fit with your life",
+}
+
+# One change: `source` is "answer" for a slider, or the option key ("A"/"B") for a criterion.
+AnswerChange = namedtuple("AnswerChange", ["source", "key", "from_step", "to_step"])
+Counterfactual = namedtuple("Counterfactual", ["goal", "changes", "steps", "risk", "practical_preference"])
+
+
+def _step(value):
+    return int(round(value * MAX_STEP))
+
+
+def _slider_gains(weights):
+    """{answer key: (direction that lowers risk, risk lowered per step)}."""
+    pressure = weights["bias_pressure"] / (len(BIAS_PRESSURE_KEYS) + 1) / MAX_STEP
+    foresight = weights["foresight_gap"] / 3 / MAX_STEP
+    gains = {key: (-1, pressure) for key in BIAS_PRESSURE_KEYS}
+    gains["counter_strength"] = (1, pressure)
+    for key in ("failure_preview", "regret_preview", "alt_exploration"):
+        gains[key] = (1, foresight)
+    gains["fairness"] = (1, weights["fairness_risk"] * 0.60 / MAX_STEP)
+    gains["harm_risk"] = (-1, weights["fairness_risk"] * 0.40 / MAX_STEP)
+    return gains
+
+
+class _State:
+    """Step values of one result that the solver moves, plus exact re-scoring.
+
+    `option_scores` is the session's {option key: {criterion: score}}; criteria missing
+    from it were never asked and stay fixed. None uses the result's own option_scores.
+    """
+
+    def __init__(self, result, engine, option_scores=None):
+        self.result = result
+        self.engine = engine
+        self.answers = {key: _step(result.answers[key]) for key in SCALE_ANSWER_KEYS if isinstance(result.answers.get(key), (int, float))}
+        if option_scores is None:
+            option_scores = result.option_scores
+        self.chosen = {key: _step(value) for key, value in option_scores.get(result.chosen_key, {}).items() if key in result.chosen_scores}
+        self.other = {key: _step(value) for key, value in option_scores.get(result.other_key, {}).items() if key in result.other_scores}
+
+    def part(self, source):
+        if source == "answer":
+            return self.answers
+        return self.chosen if source == self.result.chosen_key else self.other
+
+    def _scores(self, steps):
+        return {key: step / MAX_STEP for key, step in steps.items()}
+
+    def _criteria(self, fixed, steps):
+        """Full criterion scores: the fixed (unasked) ones, overlaid with the current steps."""
+        scores = dict(fixed)
+        scores.update(self._scores(steps))
+        return scores
+
+    def fixed_step(self, key):
+        """Step of a chosen-option criterion, whether it can move or not."""
+        return self.chosen[key] if key in self.chosen else _step(self.result.chosen_scores[key])
+
+    def gap(self):
+        weights = self.engine.rational_weights
+        chosen = self._criteria(self.result.chosen_scores, self.chosen)
+        other = self._criteria(self.result.other_scores, self.other)
+        return calculate_rational_quality(chosen, weights) - calculate_rational_quality(other, weights)
+
+    def score(self):
+        """(distortion risk, practical preference) of the current steps, via the engine formulas."""
+        answers = dict(self.result.answers)
+        answers.update(self._scores(self.answers))
+        chosen = self._criteria(self.result.chosen_scores, self.chosen)
+        chosen_rational = calculate_rational_quality(chosen, self.engine.rational_weights)
+        gap = chosen_rational - calculate_rational_quality(self._criteria(self.result.other_scores, self.other), self.engine.rational_weights)
+        risk = calculate_distortion_risk(
+            calculate_bias_pressure(answers),
+            calculate_foresight_gap(answers),
+            calculate_fairness_risk(answers),
+            max(0.0, -gap),
+            chosen_rational,
+            self.engine.distortion_weights,
+        )
+        return risk, is_practically_justified(chosen, gap, answers)
+
+    def counterfactual(self, goal):
+        changes = []
+        for source, original in (("answer", self.result.answers), (self.result.chosen_key, self.result.chosen_scores), (self.result.other_key, self.result.other_scores)):
+            for key, step in self.part(source).items():
+                before = _step(original[key])
+                if step != before:
+                    changes.append(AnswerChange(source, key, before, step))
+        risk, practical = self.score()
+        return Counterfactual(goal, changes, sum(abs(change.to_step - change.from_step) for change in changes), risk, practical)
+
+
+# ==========================================================
+# SECTION 1: RISK LABEL (GREEDY OVER LINEAR STEP GAINS)
+# ==========================================================
+
+
+def _risk_moves(state):
+    """[source, key, direction, fixed gain per step, gap closed per step] for every movable slider."""
+    distortion = state.engine.distortion_weights
+    moves = []
+    for key, (direction, gain) in _slider_gains(distortion).items():
+        if key in state.answers:
+            moves.append(["answer", key, direction, gain, 0.0])
+    for key, weight in state.engine.rational_weights.items():
+        # Raising the chosen option lowers the low-evidence penalty and closes the gap;
+        # lowering the other option only closes the gap.
+        if key in state.chosen:
+            moves.append([state.result.chosen_key, key, 1, distortion["low_evidence_penalty"] * weight / MAX_STEP, weight / MAX_STEP])
+        if key in state.other:
+            moves.append([state.result.other_key, key, -1, 0.0, weight / MAX_STEP])
+    return moves
+
+
+def risk_counterfactual(result, label, engine=DEFAULT_ENGINE, option_scores=None):
+    """Fewest slider steps that bring the result's risk down into `label`, or None if no answers can."""
+    threshold = RISK_THRESHOLDS[RISK_LABELS.index(label)] if label in RISK_LABELS[:2] else None
+    if threshold is None or result.total_risk < threshold:
+        return None
+
+    state = _State(result, engine, option_scores)
+    moves = _risk_moves(state)
+    hinge = engine.distortion_weights["weak_choice_penalty"]
+    risk, _ = state.score()
+    deficit = max(0.0, -state.gap())
+    estimate = risk
+    while risk >= threshold:
+        best, best_gain = None, 0.0
+        for move in moves:
+            source, key, direction, gain, closes = move
+            step = state.part(source)[key]
+            if (direction > 0 and step >= MAX_STEP) or (direction < 0 and step <= 0):
+                continue
+            gain += hinge * min(deficit, closes)
+            if gain > best_gain + 1e-12:
+                best, best_gain = move, gain
+        if best is None:
+            return None
+        source, key, direction, _, closes = best
+        state.part(source)[key] += direction
+        deficit = max(0.0, deficit - closes)
+        estimate -= best_gain
+        # Re-score exactly only once the running estimate says the threshold is crossed.
+        if estimate < threshold:
+            risk, _ = state.score()
+            estimate = risk
+    return state.counterfactual(label)
+
+
+# ==========================================================
+# SECTION 2: PRACTICAL-PREFERENCE VERDICT (CHEAPEST CONDITION)
+# ==========================================================
+
+
+def _gap_moves(state, direction):
+    """(source, key, step direction, gap change per step) that move the gap in `direction`, largest first."""
+    moves = []
+    for key, weight in state.engine.rational_weights.items():
+        if key in state.chosen:
+            moves.append((state.result.chosen_key, key, direction, weight / MAX_STEP))
+        if key in state.other:
+            moves.append((state.result.other_key, key, -direction, weight / MAX_STEP))
+    moves.sort(key=lambda move: -move[3])
+    return moves
+
+
+def _move_gap(state, direction, done):
+    """Step the gap in `direction` (largest weights first) until done(gap); False when out of room."""
+    moves = _gap_moves(state, direction)
+    while not done(state.gap()):
+        for source, key, step_direction, _ in moves:
+            step = state.part(source)[key]
+            if 0 <= step + step_direction <= MAX_STEP:
+                state.part(source)[key] = step + step_direction
+                break
+        else:
+            return False
+    return True
+
+
+def _justify(result, engine, option_scores=None):
+    """Raise every failing condition of is_practically_justified to its threshold; None when an unasked criterion fails one."""
+    state = _State(result, engine, option_scores)
+    # An unanswered counter_strength scores 0.5, which already passes.
+    if state.answers.get("counter_strength", PRACTICAL_COUNTER_STEP) < PRACTICAL_COUNTER_STEP:
+        state.answers["counter_strength"] = PRACTICAL_COUNTER_STEP
+    for key, minimum in PRACTICAL_MIN_STEPS.items():
+        if key in state.chosen:
+            state.chosen[key] = max(state.chosen[key], minimum)
+        elif state.fixed_step(key) < minimum:
+            return None
+    if not _move_gap(state, 1, lambda gap: gap >= PRACTICAL_MIN_GAP):
+        return None
+    return state
+
+
+def _unjustify(result, engine, option_scores=None):
+    """Cheapest single condition of is_practically_justified to break, or None when none can move."""
+    candidates = []
+    for key, minimum in PRACTICAL_MIN_STEPS.items():
+        state = _State(result, engine, option_scores)
+        if key in state.chosen:
+            state.chosen[key] = min(state.chosen[key], minimum - 1)
+            candidates.append(state)
+    if "counter_strength" in result.answers:
+        state = _State(result, engine, option_scores)
+        state.answers["counter_strength"] = min(state.answers["counter_strength"], PRACTICAL_COUNTER_STEP - 1)
+        candidates.append(state)
+    state = _State(result, engine, option_scores)
+    if _move_gap(state, -1, lambda gap: gap < PRACTICAL_MIN_GAP):
+        candidates.append(state)
+    if not candidates:
+        return None
+    return min(candidates, key=lambda candidate: candidate.counterfactual("").steps)
+
+
+def practical_counterfactual(result, engine=DEFAULT_ENGINE, option_scores=None):
+    """Fewest slider steps that flip the practical-preference verdict, or None."""
+    if result.practical_preference:
+        state, goal = _unjustify(result, engine, option_scores), "Not a practical preference"
+    else:
+        state, goal = _justify(result, engine, option_scores), "Practical preference"
+    if state is None:
+        return None
+    # A gap sitting exactly on 0.05 can round either way; nudge until the engine agrees.
+    if state.score()[1] == result.practical_preference:
+        if not _move_gap(state, -1 if result.practical_preference else 1, lambda gap: state.score()[1] != result.practical_preference):
+            return None
+    return state.counterfactual(goal)
+
+
+def verdict_counterfactuals(result, engine=DEFAULT_ENGINE, option_scores=None):
+    """Counterfactuals for every better risk label and the practical-preference flip.
+
+    Criteria the plan never asked (absent from `option_scores`, by default the result's) are not moved.
+    """
+    current = RISK_LABELS.index(classify_risk(result.total_risk))
+    found = [risk_counterfactual(result, label, engine, option_scores) for label in reversed(RISK_LABELS[:current])]
+    found.append(practical_counterfactual(result, engine, option_scores))
+    return [counterfactual for counterfactual in found if counterfactual is not None]
+
+
+def describe_change(change, result):
+    """One plain-language line for an AnswerChange."""
+    verb = "Raise" if change.to_step > change.from_step else "Lower"
+    if change.source == "answer":
+        return f"{verb} {SLIDER_NAMES[change.key]} from {change.from_step} to {change.to_step}"
+    label = result.option_a if change.source == "A" else result.option_b
+    return f"{verb} {label}'s {CRITERION_NAMES[change.key]} from {change.from_step} to {change.to_step}"
@@ -0,0 +1,1091 @@
+"""Pure BiasLab analysis core: question planning, scoring and report text with no Tk state."""
+
+import re
+from collections import namedtuple
+
+from biaslab_keywords import KeywordIndex
+from biaslab_report import BIAS_GUIDANCE, render_report
+from biaslab_text import note_signals, vagueness
+
+
+# ==========================================================
+# SECTION 1: SHARED CONFIGURATION (KEYS, WEIGHTS, LABELS)
+# ==========================================================
+
+CONTEXT_KEYWORDS = {
+    "purchase": [
+        "buy",
+        "price",
+        "cost",
+        "deal",
+        "discount",
+        "sale",
+        "order",
+        "purchase",
+        "shop",
+        "shopping",
+        "product",
+        "item",
+        "phone",
+        "laptop",
+        "tablet",
+        "headphone",
+        "earbuds",
+        "camera",
+        "car",
+        "bike",
+        "scooter",
+        "house",
+        "apartment",
+        "rent",
+    ],
+    "relationship": [
+        "date",
+        "dating",
+        "relationship",
+        "partner",
+        "boyfriend",
+        "girlfriend",
+        "crush",
+        "love",
+        "like",
+        "approach",
+        "confess",
+        "ask out",
+        "proposal",
+        "marry",
+        "marriage",
+        "breakup",
+        "divorce",
+        "commit",
+        "commitment",
+        "situationship",
+    ],
+    "career": [
+        "job",
+        "career",
+        "work",
+        "internship",
+        "promotion",
+        "resign",
+        "quit",
+        "switch",
+        "role",
+        "company",
+        "startup",
+        "business",
+        "degree",
+        "masters",
+        "mba",
+    ],
+    "finance": [
+        "money",
+        "budget",
+        "save",
+        "saving",
+        "invest",
+        "investment",
+        "stock",
+        "crypto",
+        "fund",
+        "loan",
+        "emi",
+        "rent",
+        "debt",
+        "credit",
+        "interest",
+    ],
+    "academic": [
+        "exam",
+        "study",
+        "college",
+        "school",
+        "course",
+        "major",
+        "minor",
+        "university",
+        "gpa",
+        "assignment",
+        "project",
+        "thesis",
+        "research",
+    ],
+    "health": [
+        "health",
+        "diet",
+        "sleep",
+        "workout",
+        "exercise",
+        "gym",
+        "doctor",
+        "therapy",
+        "mental",
+        "stress",
+        "anxiety",
+        "medicine",
+        "treatment",
+    ],
+    "social": [
+        "friend",
+        "friends",
+        "party",
+        "group",
+        "hangout",
+        "meet",
+        "text",
+        "call",
+        "message",
+        "event",
+        "invite",
+        "invite",
+        "social",
+    ],
+}
+
+MAJOR_DECISION_KEYWORDS = [
+    "marry",
+    "marriage",
+    "breakup",
+    "divorce",
+    "career",
+    "job",
+    "degree",
+    "business",
+    "house",
+    "loan",
+    "move",
+    "relocate",
+    "commit",
+    "commitment",
+    "investment",
+    "proposal",
+    "mortgage",
+    "visa",
+    "abroad",
+    "relocation",
+    "surgery",
+    "diagnosis",
+    "treatment",
+    "insurance",
+]
+
+SMALL_DECISION_KEYWORDS = [
+    "ice cream",
+    "snack",
+    "food",
+    "drink",
+    "movie",
+    "shirt",
+    "weekend",
+    "today",
+    "tonight",
+    "coffee",
+    "tea",
+    "dessert",
+    "game",
+    "music",
+    "playlist",
+    "meme",
+    "post",
+    "reply",
+    "text back",
+    "call back",
+    "outfit",
+    "order food",
+]
+
+OPTION_CRITERIA_KEYS = ["need_fit", "long_term", "tradeoff", "evidence", "compatibility"]
+
+# Canonical order of every slider and free-text answer a question plan can produce.
+SCALE_ANSWER_KEYS = [
+    "emotion",
+    "urgency",
+    "social_pressure",
+    "novelty_pull",
+    "counter_strength",
+    "alt_exploration",
+    "fairness",
+    "harm_risk",
+    "identity_attachment",
+    "sunk_cost",
+    "loss_aversion",
+    "failure_preview",
+    "regret_preview",
+]
+
+TEXT_ANSWER_KEYS = [
+    "emotion_source_note",
+    "social_source_note",
+    "urgency_reason_note",
+    "counter_text",
+    "reason_a",
+    "reason_b",
+]
+
+RATIONAL_WEIGHTS = {
+    "evidence": 0.35,
+    "need_fit": 0.20,
+    "long_term": 0.20,
+    "compatibility": 0.15,
+    "tradeoff": 0.10,
+}
+
+DISTORTION_WEIGHTS = {
+    "bias_pressure": 0.40,
+    "foresight_gap": 0.20,
+    "fairness_risk": 0.15,
+    "weak_choice_penalty": 0.15,
+    "low_evidence_penalty": 0.10,
+}
+
+BIAS_PRESSURE_KEYS = [
+    "emotion",
+    "urgency",
+    "social_pressure",
+    "sunk_cost",
+    "identity_attachment",
+    "loss_aversion",
+    "novelty_pull",
+]
+
+
+def normalize(value):
+    return max(0.0, min(1.0, value / 10.0))
+
+
+def clamp01(value):
+    return max(0.0, min(1.0, value))
+
+
+# ==========================================================
+# SECTION 2: ENGINE DATA TYPES (IMMUTABLE, SAFE TO SHARE)
+# ==========================================================
+
+Decision = namedtuple("Decision", ["text", "option_a", "option_b", "leaning"], defaults=("", "", "A"))
+
+QuestionPlan = namedtuple(
+    "QuestionPlan",
+    [
+        "decision",
+        "option_a",
+        "option_b",
+        "leaning",
+        "profile",
+        "context",
+        "scale",
+        "cognitive_questions",
+        "option_questions",
+    ],
+)
+
+Session = namedtuple("Session", ["plan", "answers", "option_scores"])
+
+AnalysisResult = namedtuple(
+    "AnalysisResult",
+    [
+        "decision",
+        "option_a",
+        "option_b",
+        "context",
+        "scale",
+        "chosen_key",
+        "other_key",
+        "chosen_label",
+        "other_label",
+        "chosen_scores",
+        "other_scores",
+        "total_risk",
+        "integrity",
+        "chosen_rational",
+        "other_rational",
+        "justification_gap",
+        "practical_preference",
+        "signal_map",
+        "detected_biases",
+        "answers",
+        "option_scores",  # the session's {option key: {criterion: score}}; unasked criteria are absent
+    ],
+)
+
+
+# ==========================================================
+# SECTION 3: INPUT + CONTEXT PREP
+# ==========================================================
+
+
+DECISION_KEYWORD_GROUPS = dict(CONTEXT_KEYWORDS, major_scale=MAJOR_DECISION_KEYWORDS, small_scale=SMALL_DECISION_KEYWORDS)
+DECISION_KEYWORD_INDEX = KeywordIndex(DECISION_KEYWORD_GROUPS)
+_SCALE_GROUPS = ("major_scale", "small_scale")
+# Shorter keywords hide inside unrelated words ("date" in "update", "car" in "career"),
+# so only multi-word keywords and keywords this long take part in the substring fallback.
+MIN_COMPOUND_KEYWORD = 5
+_COMPOUND_KEYWORDS = {
+    group: tuple(word for word in words if " " in word or len(word) >= MIN_COMPOUND_KEYWORD) for group, words in DECISION_KEYWORD_GROUPS.items()
+}
+
+
+def keyword_scores(decision_text):
+    """Stemmed keyword score per context plus the major/small scale markers, in one pass.
+
+    Categories with no token hit fall back to substring matching of their multi-word and
+    5+ letter keywords, so compounds like "iPhone" (phone) still count. Compounds of a
+    shorter keyword ("carpool") are missed, and a long keyword can still hide in an
+    unrelated word ("phone" in "saxophone").
+    """
+    scores = DECISION_KEYWORD_INDEX.scores(decision_text)
+    contexts_missed = not any(scores[context] for context in CONTEXT_KEYWORDS)
+    scales_missed = not any(scores[group] for group in _SCALE_GROUPS)
+    if contexts_missed or scales_missed:
+        decision_lower = decision_text.lower()
+        for group, words in _COMPOUND_KEYWORDS.items():
+            if (contexts_missed and group in CONTEXT_KEYWORDS) or (scales_missed and group in _SCALE_GROUPS):
+                scores[group] = sum(1 for word in words if word in decision_lower)
+    return scores
+
+
+def detect_context(decision_text):
+    """Map free-text decision into one of the supported contexts."""
+    scores = keyword_scores(decision_text)
+    for context_name in CONTEXT_KEYWORDS:
+        if scores[context_name]:
+            return context_name
+    return "generic"
+
+
+def detect_decision_scale(decision_text, context, scores=None):
+    """Detect whether the decision is small, standard, or major using simple keyword rules."""
+    if context in ["relationship", "career", "finance", "health"]:
+        return "major"
+
+    scores = scores or keyword_scores(decision_text)
+    if scores["major_scale"]:
+        return "major"
+
+    if scores["small_scale"]:
+        return "small"
+
+    return "standard"
+
+
+def infer_options_from_decision(decision_text):
+    """Infer options when user writes dilemma as 'X or Y'."""
+    decision_clean = re.sub(r"\s+", " ", decision_text.strip())
+    split_match = re.search(r"\b(.+?)\s+or\s+(.+)$", decision_clean, flags=re.IGNORECASE)
+    if not split_match:
+        return None, None
+
+    left = split_match.group(1)
+    right = split_match.group(2)
+
+    left = re.sub(r"^(should i|do i|is it better to|would it be better to)\s+", "", left, flags=re.IGNORECASE).strip(" ?.,")
+    right = right.strip(" ?.,")
+
+    if not left or not right:
+        return None, None
+
+    return left.capitalize(), right.capitalize()
+
+
+def identify_dilemma_profile(decision_text):
+    """Identify most likely dilemma domain and generate an explainable profile."""
+    keyword_hits = keyword_scores(decision_text)
+    scores = {domain: keyword_hits[domain] for domain in CONTEXT_KEYWORDS}
+
+    best_domain = max(scores, key=scores.get) if scores else "generic"
+    best_score = scores.get(best_domain, 0)
+    sorted_scores = sorted(scores.values(), reverse=True)
+    second_best = sorted_scores[1] if len(sorted_scores) > 1 else 0
+
+    if best_score == 0:
+        best_domain = "generic"
+        confidence = "low"
+    elif best_score - second_best >= 2:
+        confidence = "high"
+    else:
+        confidence = "medium"
+
+    scale = detect_decision_scale(decision_text, best_domain, keyword_hits)
+    return {
+        "domain": best_domain,
+        "confidence": confidence,
+        "scale": scale,
+        "summary": f"{best_domain.title()} / {scale.title()}-impact",
+    }
+
+
+def counter_prompt(option_a, option_b, leaning):
+    """Clear, concrete wording for opposite-case question."""
+    chosen = option_a if leaning == "A" else option_b
+    other = option_b if leaning == "A" else option_a
+    prompt = f"How strong is the best case for '{other}' instead of '{chosen}'?"
+    hint = (
+        "0 = almost no case for the other option, 10 = very strong case for the other option"
+    )
+    return prompt, hint
+
+
+# ==========================================================
+# SECTION 4: QUESTION PLANNING
+# ==========================================================
+
+
+def criterion_prompt(key):
+    prompt_map = {
+        "need_fit": "How helpful is this option for what you actually want right now?",
+        "long_term": "How good is this option after 6-12 months?",
+        "tradeoff": "Is this option worth what you must give up (money/time/effort)?",
+        "evidence": "How much real proof supports this option (facts, patterns, data)?",
+        "compatibility": "How easily does this option fit your current life/system?",
+    }
+    return prompt_map.get(key, key)
+
+
+def customize_question_wording(questions, context, option_a, option_b, leaning):
+    """Make prompts concrete for detected dilemma domain and selected options."""
+    prompt_overrides = {}
+    hint_overrides = {}
+
+    opposite_prompt, opposite_hint = counter_prompt(option_a, option_b, leaning)
+    prompt_overrides["counter_strength"] = opposite_prompt
+    hint_overrides["counter_strength"] = opposite_hint
+
+    if context == "relationship":
+        prompt_overrides.update(
+            {
+                "emotion": "How emotionally affected are you when you think about this person/situation?",
+                "social_pressure": "How much are friends/family/social opinions shaping this choice?",
+                "fairness": "How respectful is your current choice for both people involved?",
+                "alt_exploration": "Have you seriously considered both paths (approach vs not approach / continue vs stop)?",
+            }
+        )
+
+    if context == "career":
+        prompt_overrides.update(
+            {
+                "social_pressure": "How much are status/parents/society pushing this choice?",
+                "identity_attachment": "How much is this tied to your image of success?",
+                "evidence": "How strong are real facts (market, mentors, outcomes) supporting this?",
+            }
+        )
+
+    if context == "purchase":
+        prompt_overrides.update(
+            {
+                "tradeoff": "How good is value-for-money in this option?",
+                "compatibility": "How well does this fit your existing setup/ecosystem?",
+            }
+        )
+
+    if context == "health":
+        prompt_overrides.update(
+            {
+                "emotion": "How much fear/anxiety is driving this health choice?",
+                "evidence": "How strongly is this backed by trusted health advice/data?",
+                "harm_risk": "If this choice is wrong, how much could it hurt your health?",
+            }
+        )
+
+    if context == "academic":
+        prompt_overrides.update(
+            {
+                "urgency": "How rushed do you feel because of deadlines/exams?",
+                "alt_exploration": "How much did you compare alternatives (course/plan/path) properly?",
+            }
+        )
+
+    for question in questions:
+        key = question.get("key")
+        if key in prompt_overrides:
+            question["prompt"] = prompt_overrides[key]
+        if key in hint_overrides:
+            question["hint"] = hint_overrides[key]
+
+    return questions
+
+
+def base_cognitive_questions(context, scale, option_a, option_b, leaning):
+    """Base question set selected by context + decision scale (common categories only)."""
+    if scale == "small":
+        questions = [
+            {
+                "id": "emotion",
+                "type": "single_scale",
+                "key": "emotion",
+                "prompt": "How emotionally loaded are you about this decision right now?",
+                "hint": "0 = calm, 10 = very emotional",
+                "default": 3,
+            },
+            {
+                "id": "urgency",
+                "type": "single_scale",
+                "key": "urgency",
+                "prompt": "How rushed do you feel to decide now?",
+                "hint": "0 = no rush, 10 = extreme rush",
+                "default": 3,
+            },
+            {
+                "id": "social_pressure",
+                "type": "single_scale",
+                "key": "social_pressure",
+                "prompt": "How much are others pushing you toward one option?",
+                "hint": "0 = no pressure from others, 10 = very strong pressure",
+                "default": 2,
+            },
+            {
+                "id": "counter_strength",
+                "type": "single_scale",
+                "key": "counter_strength",
+                "prompt": "How strong is the best case for the other option?",
+                "hint": "0 = almost no case, 10 = very strong case",
+                "default": 5,
+            },
+            {
+                "id": "alt_exploration",
+                "type": "single_scale",
+                "key": "alt_exploration",
+                "prompt": "Did you genuinely check at least one other option?",
+                "hint": "0 = not at all, 10 = yes carefully",
+                "default": 5,
+            },
+            {
+                "id": "fairness",
+                "type": "single_scale",
+                "key": "fairness",
+                "prompt": "How respectful and fair is this choice to everyone involved?",
+                "hint": "0 = unfair/disrespectful, 10 = very fair/respectful",
+                "default": 8,
+            },
+        ]
+        if context == "purchase":
+            questions.insert(
+                3,
+                {
+                    "id": "novelty_pull",
+                    "type": "single_scale",
+                    "key": "novelty_pull",
+                    "prompt": "Are you choosing mostly because it feels new/exciting?",
+                    "hint": "0 = no, 10 = mostly yes",
+                    "default": 4,
+                },
+            )
+        return customize_question_wording(questions, context, option_a, option_b, leaning)
+
+    base_questions = [
+        {
+            "id": "emotion",
+            "type": "single_scale",
+            "key": "emotion",
+            "prompt": "How emotionally charged do you feel about this decision?",
+            "hint": "0 = calm, 10 = highly emotional",
+            "default": 5,
+        },
+        {
+            "id": "urgency",
+            "type": "single_scale",
+            "key": "urgency",
+            "prompt": "How much pressure do you feel to decide fast?",
+            "hint": "0 = no pressure, 10 = very rushed",
+            "default": 5,
+        },
+        {
+            "id": "social_pressure",
+            "type": "single_scale",
+            "key": "social_pressure",
+            "prompt": "How much are family/friends/society pushing your choice?",
+            "hint": "0 = no influence, 10 = very strong influence",
+            "default": 4,
+        },
+        {
+            "id": "counter_strength",
+            "type": "single_scale",
+            "key": "counter_strength",
+            "prompt": "How strong is the best case for the opposite option?",
+            "hint": "0 = very weak, 10 = very strong",
+            "default": 5,
+        },
+        {
+            "id": "alt_exploration",
+            "type": "single_scale",
+            "key": "alt_exploration",
+            "prompt": "How seriously did you compare other options?",
+            "hint": "0 = barely compared, 10 = compared thoroughly",
+            "default": 5,
+        },
+        {
+            "id": "fairness",
+            "type": "single_scale",
+            "key": "fairness",
+            "prompt": "How respectful and fair is your current choice to all affected people?",
+            "hint": "0 = unfair/disrespectful, 10 = very fair/respectful",
+            "default": 7,
+        },
+        {
+            "id": "harm_risk",
+            "type": "single_scale",
+            "key": "harm_risk",
+            "prompt": "If this choice turns out wrong, how serious could the damage be?",
+            "hint": "0 = almost no harm, 10 = severe harm",
+            "default": 5,
+        },
+    ]
+
+    if scale == "major":
+        major_additions = [
+            {
+                "id": "identity_attachment",
+                "type": "single_scale",
+                "key": "identity_attachment",
+                "prompt": "How much is your self-image attached to one option?",
+                "hint": "0 = not attached, 10 = strongly attached",
+                "default": 5,
+            },
+            {
+                "id": "sunk_cost",
+                "type": "single_scale",
+                "key": "sunk_cost",
+                "prompt": "How much are past time/money efforts trapping you in this choice?",
+                "hint": "0 = no effect, 10 = very strong effect",
+                "default": 5,
+            },
+            {
+                "id": "loss_aversion",
+                "type": "single_scale",
+                "key": "loss_aversion",
+                "prompt": "How much fear of losing something is driving this choice?",
+                "hint": "0 = not at all, 10 = very much",
+                "default": 5,
+            },
+            {
+                "id": "failure_preview",
+                "type": "single_scale",
+                "key": "failure_preview",
+                "prompt": "How clearly can you imagine this choice going badly?",
+                "hint": "0 = cannot imagine, 10 = very clearly",
+                "default": 5,
+            },
+            {
+                "id": "regret_preview",
+                "type": "single_scale",
+                "key": "regret_preview",
+                "prompt": "How clearly can you imagine regretting this later?",
+                "hint": "0 = unclear, 10 = very clear",
+                "default": 5,
+            },
+        ]
+        base_questions[3:3] = major_additions
+
+    return customize_question_wording(base_questions, context, option_a, option_b, leaning)
+
+
+def build_option_questions(context, scale, option_a, option_b):
+    """Adaptive option-comparison questions. One criterion per step, two sliders inside."""
+    if scale == "small":
+        keys = ["need_fit", "tradeoff", "evidence"]
+        if context == "purchase":
+            keys.append("compatibility")
+    elif scale == "major":
+        keys = ["need_fit", "evidence", "long_term", "compatibility", "tradeoff"]
+    else:
+        keys = ["need_fit", "evidence", "tradeoff", "compatibility"]
+
+    if context == "relationship" and "long_term" not in keys:
+        keys.insert(2, "long_term")
+
+    questions = []
+    for key in keys:
+        questions.append(
+            {
+                "id": f"pair_{key}",
+                "type": "pair_scale",
+                "key": key,
+                "prompt": criterion_prompt(key),
+                "hint": f"Rate {option_a} and {option_b} separately on this criterion.",
+                "default": 5,
+            }
+        )
+
+    questions.append(
+        {
+            "id": "reason_a",
+            "type": "text",
+            "key": "reason_a",
+            "prompt": f"In one sentence: best practical reason to choose {option_a}",
+            "hint": "Use practical reasons, not vibes.",
+            "required": False,
+        }
+    )
+    questions.append(
+        {
+            "id": "reason_b",
+            "type": "text",
+            "key": "reason_b",
+            "prompt": f"In one sentence: best practical reason to choose {option_b}",
+            "hint": "Use practical reasons, not vibes.",
+            "required": False,
+        }
+    )
+    return questions
+
+
+def followup_questions(question, normalized_value):
+    """Targeted follow-up prompts triggered by one answer (the caller skips ones already asked)."""
+    followups = []
+    key = question.get("key")
+
+    if key == "emotion" and normalized_value >= 0.70:
+        followups.append(
+            {
+                "id": "emotion_source_note",
+                "type": "text",
+                "key": "emotion_source_note",
+                "prompt": "What exactly is creating this strong emotion?",
+                "hint": "Naming it helps reduce hidden bias.",
+                "required": True,
+            }
+        )
+
+    if key == "social_pressure" and normalized_value >= 0.60:
+        followups.append(
+            {
+                "id": "social_source_note",
+                "type": "text",
+                "key": "social_source_note",
+                "prompt": "Who is influencing your decision the most right now?",
+                "hint": "Be specific.",
+                "required": True,
+            }
+        )
+
+    if key == "urgency" and normalized_value >= 0.65:
+        followups.append(
+            {
+                "id": "urgency_reason_note",
+                "type": "text",
+                "key": "urgency_reason_note",
+                "prompt": "Is this urgency truly real, or are you creating it yourself?",
+                "hint": "Write one sentence.",
+                "required": True,
+            }
+        )
+
+    if key == "counter_strength" and normalized_value <= 0.45:
+        followups.append(
+            {
+                "id": "counter_text",
+                "type": "text",
+                "key": "counter_text",
+                "prompt": "Write one strong reason your current preferred option might be wrong.",
+                "hint": "This is required for bias resistance.",
+                "required": True,
+            }
+        )
+
+    if key == "fairness" and normalized_value <= 0.45:
+        followups.append(
+            {
+                "id": "harm_risk",
+                "type": "single_scale",
+                "key": "harm_risk",
+                "prompt": "If your choice is unfair, how much harm could it cause others?",
+                "hint": "0 = almost none, 10 = severe harm",
+                "default": 6,
+            }
+        )
+    return followups
+
+
+_SHARED_COGNITIVE_QUESTIONS = {}
+
+
+def planned_cognitive_questions(context, scale, option_a, option_b, leaning):
+    """Same questions as base_cognitive_questions, sharing the option-independent dicts.
+
+    Only the counter-strength prompt mentions the options, so every other question dict is
+    built once per (context, scale) and reused by all plans. Question dicts are read-only.
+    """
+    shared = _SHARED_COGNITIVE_QUESTIONS.get((context, scale))
+    if shared is None:
+        shared = tuple(base_cognitive_questions(context, scale, "Option A", "Option B", "A"))
+        _SHARED_COGNITIVE_QUESTIONS[(context, scale)] = shared
+
+    prompt, hint = counter_prompt(option_a, option_b, leaning)
+    return tuple(
+        dict(question, prompt=prompt, hint=hint) if question["key"] == "counter_strength" else question
+        for question in shared
+    )
+
+
+# ==========================================================
+# SECTION 5: MATH + SCORING (PURE FUNCTIONS OVER ANSWERS)
+# ==========================================================
+
+
+def average(values):
+    return sum(values) / len(values) if values else 0.0
+
+
+def answer(answers, key, default=0.5):
+    """Safe accessor for slider answers when a personalized question set omits some keys."""
+    return answers.get(key, default)
+
+
+def calculate_rational_quality(scores, weights=RATIONAL_WEIGHTS):
+    """Weighted rational score for one option."""
+    return sum(scores[key] * weight for key, weight in weights.items())
+
+
+def calculate_bias_pressure(answers):
+    """Average pressure from affective/cognitive distortion signals."""
+    values = [answer(answers, key) for key in BIAS_PRESSURE_KEYS]
+    values.append(1 - answer(answers, "counter_strength"))
+    return average(values)
+
+
+def calculate_foresight_gap(answers):
+    """How weakly future consequences were explored."""
+    return average(
+        [
+            1 - answer(answers, "failure_preview"),
+            1 - answer(answers, "regret_preview"),
+            1 - answer(answers, "alt_exploration"),
+        ]
+    )
+
+
+def calculate_fairness_risk(answers):
+    """Blend fairness deficit and harm risk."""
+    return clamp01((1 - answer(answers, "fairness")) * 0.60 + answer(answers, "harm_risk") * 0.40)
+
+
+def calculate_distortion_risk(
+    bias_pressure,
+    foresight_gap,
+    fairness_risk,
+    weak_choice_penalty,
+    chosen_rational,
+    weights=DISTORTION_WEIGHTS,
+):
+    """Final distortion risk composed from all core penalties."""
+    return clamp01(
+        bias_pressure * weights["bias_pressure"]
+        + foresight_gap * weights["foresight_gap"]
+        + fairness_risk * weights["fairness_risk"]
+        + weak_choice_penalty * weights["weak_choice_penalty"]
+        + (1 - chosen_rational) * weights["low_evidence_penalty"]
+    )
+
+
+def is_practically_justified(chosen_scores, justification_gap, answers):
+    """Safeguard that prevents falsely labeling practical preferences as bias."""
+    return (
+        chosen_scores.get("compatibility", 0.5) >= 0.70
+        and chosen_scores.get("need_fit", 0.5) >= 0.65
+        and chosen_scores.get("evidence", 0.5) >= 0.55
+        and justification_gap >= 0.05
+        and answer(answers, "counter_strength") >= 0.45
+    )
+
+
+# ==========================================================
+# SECTION 6: BIAS PATTERN RULES
+# ==========================================================
+
+# Each rule scores (answers, chosen_rational, signal_map); reality/action text is in BIAS_GUIDANCE.
+BIAS_RULES = [
+    {
+        "name": "Emotional Reasoning",
+        "score": lambda answers, chosen_rational, signal_map: answer(answers, "emotion"),
+        "text_score": lambda notes: notes["chosen_reason"] and notes["chosen_reason"].emotional,
+        "threshold": 0.70,
+    },
+    {
+        "name": "Social Pressure Bias",
+        "score": lambda answers, chosen_rational, signal_map: answer(answers, "social_pressure"),
+        "threshold": 0.65,
+    },
+    {
+        "name": "Sunk Cost Fallacy",
+        "score": lambda answers, chosen_rational, signal_map: answer(answers, "sunk_cost"),
+        "threshold": 0.60,
+    },
+    {
+        "name": "Identity Attachment Bias",
+        "score": lambda answers, chosen_rational, signal_map: answer(answers, "identity_attachment"),
+        "threshold": 0.65,
+    },
+    {
+        "name": "Loss Aversion Bias",
+        "score": lambda answers, chosen_rational, signal_map: answer(answers, "loss_aversion"),
+        "threshold": 0.65,
+    },
+    {
+        "name": "Novelty Attraction Bias",
+        "score": lambda answers, chosen_rational, signal_map: answer(answers, "novelty_pull"),
+        "threshold": 0.65,
+    },
+    {
+        "name": "Confirmation / Tunnel Vision",
+        "score": lambda answers, chosen_rational, signal_map: max(
+            1 - answer(answers, "counter_strength"), 1 - answer(answers, "alt_exploration")
+        ),
+        "text_score": lambda notes: vagueness(notes["counter"], emotional=False),
+        "threshold": 0.55,
+    },
+    {
+        "name": "Outcome Blindness (Optimism Bias)",
+        "score": lambda answers, chosen_rational, signal_map: (
+            (1 - answer(answers, "failure_preview")) + (1 - answer(answers, "regret_preview"))
+        )
+        / 2,
+        "threshold": 0.60,
+    },
+    {
+        "name": "Fairness Blind Spot",
+        "score": lambda answers, chosen_rational, signal_map: max(
+            1 - answer(answers, "fairness"), answer(answers, "harm_risk")
+        ),
+        "threshold": 0.60,
+    },
+    {
+        "name": "Weak-Evidence Decision Bias",
+        "score": lambda answers, chosen_rational, signal_map: max(
+            1 - chosen_rational, signal_map.get("Low Evidence Penalty", 0)
+        ),
+        "text_score": lambda notes: vagueness(notes["chosen_reason"]),
+        "threshold": 0.60,
+    },
+]
+
+
+def detect_bias_patterns(answers, chosen_rational, signal_map, notes=None):
+    """Detect likely cognitive-bias patterns from scored signals and answers.
+
+    `notes` is note_signals() of the session's free text; rules with a "text_score" then
+    also fire on what the notes say (a vague reason, a hedged counter-argument).
+    """
+    hits = []
+    for rule in BIAS_RULES:
+        score = rule["score"](answers, chosen_rational, signal_map)
+        if notes is not None and "text_score" in rule:
+            score = max(score, rule["text_score"](notes) or 0)
+        if score >= rule["threshold"]:
+            reality, action = BIAS_GUIDANCE[rule["name"]]
+            hits.append(
+                {
+                    "name": rule["name"],
+                    "score": score,
+                    "reality": reality,
+                    "action": action,
+                }
+            )
+
+    hits.sort(key=lambda item: item["score"], reverse=True)
+    return hits[:4]
+
+
+# ==========================================================
+# SECTION 7: ANALYSIS ENGINE (PLAN -> ANALYZE -> NARRATE)
+# ==========================================================
+
+
+class AnalysisEngine:
+    """Stateless BiasLab core. Holds only read-only weights, so one instance can serve many threads.
+
+    `profiler` replaces identify_dilemma_profile, for example with
+    biaslab_classifier.TfidfClassifier().profile.
+    """
+
+    def __init__(self, rational_weights=None, distortion_weights=None, profiler=None):
+        self.rational_weights = dict(rational_weights or RATIONAL_WEIGHTS)
+        self.distortion_weights = dict(distortion_weights or DISTORTION_WEIGHTS)
+        self.profiler = profiler or identify_dilemma_profile
+
+    def plan(self, decision):
+        """Resolve options and dilemma profile for a Decision and build its question plan."""
+        text = decision.text.strip() or "Undescribed decision"
+        inferred_a, inferred_b = infer_options_from_decision(text)
+        option_a = decision.option_a.strip() or inferred_a or "Option A"
+        option_b = decision.option_b.strip() or inferred_b or "Option B"
+
+        profile = self.profiler(text)
+        context = profile["domain"]
+        scale = profile["scale"]
+        return QuestionPlan(
+            decision=text,
+            option_a=option_a,
+            option_b=option_b,
+            leaning=decision.leaning,
+            profile=profile,
+            context=context,
+            scale=scale,
+            cognitive_questions=planned_cognitive_questions(context, scale, option_a, option_b, decision.leaning),
+            option_questions=tuple(build_option_questions(context, scale, option_a, option_b)),
+        )
+
+    def analyze(self, session):
+        """Score one completed Session; inputs are read, never modified."""
+        plan = session.plan
+        answers = dict(session.answers)
+        chosen_key = plan.leaning
+        other_key = "B" if chosen_key == "A" else "A"
+
+        chosen_scores = dict.fromkeys(OPTION_CRITERIA_KEYS, 0.5)
+        chosen_scores.update(session.option_scores.get(chosen_key, {}))
+        other_scores = dict.fromkeys(OPTION_CRITERIA_KEYS, 0.5)
+        other_scores.update(session.option_scores.get(other_key, {}))
+
+        chosen_rational = calculate_rational_quality(chosen_scores, self.rational_weights)
+        other_rational = calculate_rational_quality(other_scores, self.rational_weights)
+        bias_pressure = calculate_bias_pressure(answers)
+        foresight_gap = calculate_foresight_gap(answers)
+        fairness_risk = calculate_fairness_risk(answers)
+
+        justification_gap = chosen_rational - other_rational
+        weak_choice_penalty = max(0.0, -justification_gap)
+        distortion_risk = calculate_distortion_risk(
+            bias_pressure,
+            foresight_gap,
+            fairness_risk,
+            weak_choice_penalty,
+            chosen_rational,
+            self.distortion_weights,
+        )
+
+        signal_map = {
+            "Bias Pressure": bias_pressure,
+            "Foresight Gap": foresight_gap,
+            "Fairness Risk": fairness_risk,
+            "Weak Choice Penalty": weak_choice_penalty,
+            "Low Evidence Penalty": (1 - chosen_rational),
+        }
+
+        return AnalysisResult(
+            decision=plan.decision,
+            option_a=plan.option_a,
+            option_b=plan.option_b,
+            context=plan.context,
+            scale=plan.scale,
+            chosen_key=chosen_key,
+            other_key=other_key,
+            chosen_label=plan.option_a if chosen_key == "A" else plan.option_b,
+            other_label=plan.option_b if chosen_key == "A" else plan.option_a,
+            chosen_scores=chosen_scores,
+            other_scores=other_scores,
+            total_risk=distortion_risk,
+            integrity=1 - distortion_risk,
+            chosen_rational=chosen_rational,
+            other_rational=other_rational,
+            justification_gap=justification_gap,
+            practical_preference=is_practically_justified(chosen_scores, justification_gap, answers),
+            signal_map=signal_map,
+            detected_biases=detect_bias_patterns(answers, chosen_rational, signal_map, note_signals(answers, chosen_key)),
+            answers=answers,
+            option_scores={key: dict(scores) for key, scores in session.option_scores.items()},
+        )
+
+    def narrate(self, result, fmt="text"):
+        """Plain-language report for an AnalysisResult."""
+        return render_report(result._asdict(), fmt)
+
+
+DEFAULT_ENGINE = AnalysisEngine()
@@ -0,0 +1,285 @@
+"""Golden corpus of reference results, and a differential checker for fast scoring paths.
+
+The corpus is a seeded synthetic workload (biaslab_workload) scored by the scalar
+AnalysisEngine, stored as one .npy file per field: the uint8 answer steps the wizard
+would record, and the engine's outputs as float64 (risk parts, rational scores, gap,
+distortion risk), the risk class, the practical-preference verdict and the detected
+biases as a bitmask in BIAS_RULES order. Chunks are generated and scored in worker
+processes straight into the memory-mapped files.
+
+A candidate is any function that takes a WorkloadBatch slice and returns a dict of
+output arrays; the checker streams the corpus through it in parallel and reports, per
+returned field, the mismatch count and the max absolute error, plus the first mismatches.
+
+Run: python biaslab_golden.py build --sessions 2000000 --out golden
+     python biaslab_golden.py check golden --candidate vector
+     python biaslab_golden.py check golden --candidate my_module:score
+"""
+
+import argparse
+import importlib
+import json
+import os
+import time
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from biaslab_engine import DEFAULT_ENGINE, OPTION_CRITERIA_KEYS, SCALE_ANSWER_KEYS, Decision, Session
+from biaslab_records import BIAS_NAMES
+from biaslab_report import classify_risk
+from biaslab_vector import RISK_LABELS, score_batch
+from biaslab_workload import CONTEXTS, FOLLOWUP_STEPS, SCALES, UNANSWERED, WorkloadBatch, decision_stems, generate_batch, iter_records
+
+CHUNK_SIZE = 65_536
+MANIFEST = "manifest.json"
+FIRST_MISMATCHES = 10
+
+# Reference outputs, with the dtype they are stored in.
+OUTPUT_FIELDS = {
+    "bias_pressure": np.float64,
+    "foresight_gap": np.float64,
+    "fairness_risk": np.float64,
+    "weak_choice_penalty": np.float64,
+    "chosen_rational": np.float64,
+    "other_rational": np.float64,
+    "justification_gap": np.float64,
+    "distortion_risk": np.float64,
+    "risk_class": np.int8,
+    "practical_preference": np.bool_,
+    "biases": np.uint16,
+}
+_SIGNAL_FIELDS = {
+    "bias_pressure": "Bias Pressure",
+    "foresight_gap": "Foresight Gap",
+    "fairness_risk": "Fairness Risk",
+    "weak_choice_penalty": "Weak Choice Penalty",
+}
+_BIAS_BITS = {name: 1 << index for index, name in enumerate(BIAS_NAMES)}
+_CRITERIA_COUNT = len(OPTION_CRITERIA_KEYS)
+
+Mismatch = namedtuple("Mismatch", ["index", "field", "expected", "actual"])
+# fields: {field: (mismatch count, max absolute error)}
+DiffReport = namedtuple("DiffReport", ["sessions", "fields", "first_mismatches"])
+
+
+# ==========================================================
+# SECTION 1: CANDIDATE INPUTS AND BUILT-IN CANDIDATES
+# ==========================================================
+
+
+def batch_arrays(batch):
+    """(answers, chosen, other) float arrays as the engine sees them; NaN = not asked."""
+    answers = np.where(batch.scale_steps == UNANSWERED, np.nan, batch.scale_steps / 10.0)
+    options = np.where(batch.option_steps == UNANSWERED, np.nan, batch.option_steps / 10.0)
+    lean_a = (batch.leaning == 0)[:, None]
+    option_a, option_b = options[:, :_CRITERIA_COUNT], options[:, _CRITERIA_COUNT:]
+    return answers, np.where(lean_a, option_a, option_b), np.where(lean_a, option_b, option_a)
+
+
+def batch_sessions(batch, engine=DEFAULT_ENGINE, plans=None):
+    """Sessions of a batch, exactly as workload.record_session builds them; `plans` caches plans by decision."""
+    plans = {} if plans is None else plans
+    for record in iter_records(batch):
+        key = (record["decision"], record["leaning"])
+        if key not in plans:
+            plans[key] = engine.plan(Decision(record["decision"], leaning=record["leaning"]))
+        answers = {key: step / 10.0 for key, step in record["answers"].items()}
+        answers.update(record["notes"])
+        option_scores = {option: {key: step / 10.0 for key, step in steps.items()} for option, steps in record["option_steps"].items()}
+        yield Session(plan=plans[key], answers=answers, option_scores=option_scores)
+
+
+def result_outputs(results):
+    """OUTPUT_FIELDS arrays of a list of AnalysisResults."""
+    outputs = {field: np.empty(len(results), dtype=dtype) for field, dtype in OUTPUT_FIELDS.items()}
+    for index, result in enumerate(results):
+        for field, key in _SIGNAL_FIELDS.items():
+            outputs[field][index] = result.signal_map[key]
+        outputs["chosen_rational"][index] = result.chosen_rational
+        outputs["other_rational"][index] = result.other_rational
+        outputs["justification_gap"][index] = result.justification_gap
+        outputs["distortion_risk"][index] = result.total_risk
+        outputs["risk_class"][index] = RISK_LABELS.index(classify_risk(result.total_risk))
+        outputs["practical_preference"][index] = result.practical_preference
+        outputs["biases"][index] = sum(_BIAS_BITS[bias["name"]] for bias in result.detected_biases)
+    return outputs
+
+
+def engine_candidate(batch):
+    """The scalar engine itself (the reference); every field."""
+    return result_outputs([DEFAULT_ENGINE.analyze(session) for session in batch_sessions(batch)])
+
+
+def vector_candidate(batch):
+    """biaslab_vector.score_batch; every field except the bias mask."""
+    return score_batch(*batch_arrays(batch))
+
+
+CANDIDATES = {"engine": engine_candidate, "vector": vector_candidate}
+
+
+def load_candidate(name):
+    """A CANDIDATES name, or "module:function" for any other implementation."""
+    if name in CANDIDATES:
+        return CANDIDATES[name]
+    module, _, function = name.partition(":")
+    return getattr(importlib.import_module(module), function)
+
+
+# ==========================================================
+# SECTION 2: BUILDING THE CORPUS
+# ==========================================================
+
+
+def open_corpus(directory, mode="r"):
+    """{field: .npy memmap} of every input and output field of a corpus."""
+    return {field: np.load(os.path.join(directory, f"{field}.npy"), mmap_mode=mode) for field in WorkloadBatch._fields + tuple(OUTPUT_FIELDS)}
+
+
+def _create_corpus(directory, count, template):
+    """Empty .npy files for `count` sessions, input dtypes and shapes taken from a one-session template batch."""
+    fields = {field: (value.dtype, value.shape[1:]) for field, value in template._asdict().items()}
+    fields.update({field: (np.dtype(dtype), ()) for field, dtype in OUTPUT_FIELDS.items()})
+    for field, (dtype, shape) in fields.items():
+        np.lib.format.open_memmap(os.path.join(directory, f"{field}.npy"), mode="w+", dtype=dtype, shape=(count,) + shape).flush()
+
+
+def _build_chunk(directory, seed, chunk, start, stop):
+    """Generate chunk `chunk` (its own seeded stream) and write its inputs and reference outputs."""
+    batch = generate_batch(np.random.default_rng([seed, chunk]), stop - start)
+    outputs = engine_candidate(batch)
+    arrays = open_corpus(directory, "r+")
+    for field, value in batch._asdict().items():
+        arrays[field][start:stop] = value
+    for field, value in outputs.items():
+        arrays[field][start:stop] = value
+    for array in arrays.values():
+        array.flush()
+    return stop - start
+
+
+def build_corpus(directory, count, seed=0, workers=None, chunk_size=CHUNK_SIZE):
+    """Write a `count`-session golden corpus into `directory`; returns its manifest."""
+    os.makedirs(directory, exist_ok=True)
+    _create_corpus(directory, count, generate_batch(np.random.default_rng([seed, 0]), 1))
+    starts = range(0, count, chunk_size)
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(_build_chunk, directory, seed, chunk, start, min(start + chunk_size, count)) for chunk, start in enumerate(starts)]
+        written = sum(future.result() for future in futures)
+    manifest = {"sessions": written, "seed": seed, "chunk_size": chunk_size, "coverage": coverage(directory)}
+    with open(os.path.join(directory, MANIFEST), "w", encoding="utf-8") as file:
+        json.dump(manifest, file, indent=1)
+    return manifest
+
+
+def coverage(directory):
+    """Sessions per context/scale branch and per follow-up trigger; branches that never occur are listed as missing."""
+    arrays = open_corpus(directory)
+    cells = np.zeros((len(CONTEXTS), len(SCALES)), dtype=np.int64)
+    fired = {(trigger, followup): 0 for trigger, followups in FOLLOWUP_STEPS.items() for followup in followups}
+    columns = {key: index for index, key in enumerate(SCALE_ANSWER_KEYS)}
+    for start in range(0, len(arrays["context"]), CHUNK_SIZE):
+        context = np.asarray(arrays["context"][start : start + CHUNK_SIZE], dtype=np.int64)
+        scale = np.asarray(arrays["scale"][start : start + CHUNK_SIZE], dtype=np.int64)
+        np.add.at(cells, (context, scale), 1)
+        steps = np.asarray(arrays["scale_steps"][start : start + CHUNK_SIZE])
+        for trigger, followup in fired:
+            answered = steps[:, columns[trigger]]
+            answered = answered[answered != UNANSWERED]
+            fired[(trigger, followup)] += int(FOLLOWUP_STEPS[trigger][followup][answered].sum())
+    branches = {f"{context}/{scale}": int(cells[i, j]) for i, context in enumerate(CONTEXTS) for j, scale in enumerate(SCALES)}
+    return {
+        "branches": branches,
+        "missing_branches": [name for name, count in branches.items() if not count and decision_stems(*name.split("/"))],
+        "ungenerable_branches": [name for name in branches if not decision_stems(*name.split("/"))],
+        "followups": {f"{trigger}->{followup}": count for (trigger, followup), count in fired.items()},
+    }
+
+
+# ==========================================================
+# SECTION 3: DIFFERENTIAL CHECKING
+# ==========================================================
+
+
+def _check_chunk(directory, candidate_name, start, stop, tolerance, limit):
+    arrays = open_corpus(directory)
+    batch = WorkloadBatch(**{field: np.asarray(arrays[field][start:stop]) for field in WorkloadBatch._fields})
+    actual = load_candidate(candidate_name)(batch)
+    fields = {}
+    mismatches = []
+    for field, values in actual.items():
+        if field not in OUTPUT_FIELDS:
+            continue
+        expected = np.asarray(arrays[field][start:stop])
+        values = np.asarray(values)
+        if OUTPUT_FIELDS[field] is np.float64:
+            error = np.abs(values - expected)
+            error = np.where(np.isnan(error), np.where(np.isnan(values) & np.isnan(expected), 0.0, np.inf), error)
+            wrong = error > tolerance
+        else:
+            error = (values != expected).astype(float)
+            wrong = error > 0
+        fields[field] = (int(wrong.sum()), float(error.max()) if len(error) else 0.0)
+        for index in np.flatnonzero(wrong)[:limit].tolist():
+            mismatches.append(Mismatch(start + index, field, expected[index].item(), values[index].item()))
+    return stop - start, fields, mismatches
+
+
+def check_corpus(directory, candidate="vector", workers=None, tolerance=0.0, limit=FIRST_MISMATCHES, chunk_size=CHUNK_SIZE):
+    """Stream the corpus through `candidate` (name or "module:function") in parallel; returns a DiffReport."""
+    count = len(open_corpus(directory)["context"])
+    sessions = 0
+    fields = {}
+    mismatches = []
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(_check_chunk, directory, candidate, start, min(start + chunk_size, count), tolerance, limit) for start in range(0, count, chunk_size)]
+        for future in futures:
+            checked, chunk_fields, chunk_mismatches = future.result()
+            sessions += checked
+            for field, (wrong, error) in chunk_fields.items():
+                total, worst = fields.get(field, (0, 0.0))
+                fields[field] = (total + wrong, max(worst, error))
+            mismatches.extend(chunk_mismatches)
+    mismatches.sort(key=lambda mismatch: mismatch.index)
+    return DiffReport(sessions, fields, mismatches[:limit])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    commands = parser.add_subparsers(dest="command", required=True)
+    build = commands.add_parser("build", help="generate and score a golden corpus")
+    build.add_argument("--sessions", type=int, default=2_000_000)
+    build.add_argument("--seed", type=int, default=0)
+    build.add_argument("--out", required=True)
+    build.add_argument("--workers", type=int)
+    check = commands.add_parser("check", help="diff a candidate against a golden corpus")
+    check.add_argument("corpus")
+    check.add_argument("--candidate", default="vector", help=f"{' or '.join(CANDIDATES)}, or module:function")
+    check.add_argument("--tolerance", type=float, default=0.0)
+    check.add_argument("--workers", type=int)
+    check.add_argument("--first", type=int, default=FIRST_MISMATCHES, help="how many first mismatches to list")
+    commands.add_parser("coverage", help="print a corpus's branch coverage").add_argument("corpus")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    if args.command == "build":
+        manifest = build_corpus(args.out, args.sessions, args.seed, args.workers)
+        print(f"{manifest['sessions']:,} sessions -> {args.out} in {time.perf_counter() - start:.1f} s")
+        print(f"Missing branches: {', '.join(manifest['coverage']['missing_branches']) or 'none'}")
+    elif args.command == "coverage":
+        print(json.dumps(coverage(args.corpus), indent=1))
+    else:
+        report = check_corpus(args.corpus, args.candidate, args.workers, args.tolerance, args.first)
+        print(f"{report.sessions:,} sessions checked against {args.candidate!r} in {time.perf_counter() - start:.1f} s")
+        for field, (wrong, error) in report.fields.items():
+            print(f"{field:<22} mismatches={wrong:<10,} max abs error={error:.3g}")
+        for mismatch in report.first_mismatches:
+            print(f"  session {mismatch.index}: {mismatch.field} expected {mismatch.expected!r}, got {mismatch.actual!r}")
+        if report.first_mismatches:
+            raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+"""Group decisions: several participants answer the same plan, scored together in one pass.
+
+Each participant's answers become one row of an M x K slider array (SCALE_ANSWER_KEYS
+order, NaN = not asked) plus M x 5 criterion rows for each option, and score_batch scores
+all of them at once. On top of the per-participant scores the group result reports the
+aggregate distortion risk, per-question disagreement (variance and the largest gap
+between any two participants, which is max - min) and whose pressure signals dominate.
+Everything is a column reduction, so hundreds of participants cost about as much as one.
+"""
+
+from collections import namedtuple
+
+import numpy as np
+
+from biaslab_engine import BIAS_PRESSURE_KEYS, DEFAULT_ENGINE, OPTION_CRITERIA_KEYS, SCALE_ANSWER_KEYS
+from biaslab_report import classify_risk
+from biaslab_vector import SCALE_COLUMNS, answer_row, option_rows, score_batch
+
+# Disagreement on one question: population variance and the largest gap between two participants.
+Disagreement = namedtuple("Disagreement", ["variance", "max_gap", "answered"])
+
+GroupResult = namedtuple(
+    "GroupResult",
+    [
+        "plan",
+        "names",
+        "scores",  # score_batch arrays, one entry per participant
+        "mean_risk",
+        "max_risk",
+        "risk_label",  # classify_risk of mean_risk
+        "practical_share",  # share of participants whose preference is practically justified
+        "disagreement",  # {slider key or "A:criterion"/"B:criterion": Disagreement}
+        "pressure_share",  # (M,) each participant's share of the group's total bias pressure
+        "dominant_pressure",  # {pressure key: (name, value)} of the participant who feels it most
+    ],
+)
+
+
+def stack_sessions(sessions):
+    """(answers M x K, option_a M x 5, option_b M x 5) arrays from per-participant Sessions."""
+    answers = np.array([answer_row(session.answers) for session in sessions]).reshape(len(sessions), len(SCALE_ANSWER_KEYS))
+    option_a = np.array([option_rows(session.option_scores, "A")[0] for session in sessions]).reshape(len(sessions), len(OPTION_CRITERIA_KEYS))
+    option_b = np.array([option_rows(session.option_scores, "B")[0] for session in sessions]).reshape(len(sessions), len(OPTION_CRITERIA_KEYS))
+    return answers, option_a, option_b
+
+
+def _disagreement(columns):
+    """Disagreement per column of an M x N array, ignoring NaN (unanswered) cells."""
+    answered = (~np.isnan(columns)).sum(axis=0)
+    filled = np.where(np.isnan(columns), 0.0, columns)
+    count = np.maximum(answered, 1)
+    mean = filled.sum(axis=0) / count
+    variance = np.where(np.isnan(columns), 0.0, (columns - mean) ** 2).sum(axis=0) / count
+    high = np.where(np.isnan(columns), -np.inf, columns).max(axis=0, initial=-np.inf)
+    low = np.where(np.isnan(columns), np.inf, columns).min(axis=0, initial=np.inf)
+    max_gap = np.where(answered > 1, high - low, 0.0)
+    return variance, max_gap, answered
+
+
+def analyze_arrays(plan, answers, option_a, option_b, names=None, engine=DEFAULT_ENGINE):
+    """GroupResult for stacked participant arrays (see stack_sessions)."""
+    count = len(answers)
+    if count == 0:
+        raise ValueError("A group decision needs at least one participant.")
+    names = list(names) if names is not None else [f"Participant {index + 1}" for index in range(count)]
+    chosen, other = (option_a, option_b) if plan.leaning == "A" else (option_b, option_a)
+    scores = score_batch(answers, chosen, other, engine.rational_weights, engine.distortion_weights)
+
+    keys = list(SCALE_ANSWER_KEYS) + [f"A:{key}" for key in OPTION_CRITERIA_KEYS] + [f"B:{key}" for key in OPTION_CRITERIA_KEYS]
+    variance, max_gap, answered = _disagreement(np.hstack([answers, option_a, option_b]))
+    disagreement = {key: Disagreement(float(v), float(g), int(n)) for key, v, g, n in zip(keys, variance, max_gap, answered) if n}
+
+    pressure = scores["bias_pressure"]
+    total_pressure = pressure.sum()
+    pressure_share = pressure / total_pressure if total_pressure > 0 else np.full(count, 1 / count)
+
+    dominant_pressure = {}
+    for key in BIAS_PRESSURE_KEYS:
+        column = answers[:, SCALE_COLUMNS[key]]
+        if not np.isnan(column).all():
+            index = int(np.nanargmax(column))
+            dominant_pressure[key] = (names[index], float(column[index]))
+
+    mean_risk = float(scores["distortion_risk"].mean())
+    return GroupResult(
+        plan=plan,
+        names=names,
+        scores=scores,
+        mean_risk=mean_risk,
+        max_risk=float(scores["distortion_risk"].max()),
+        risk_label=classify_risk(mean_risk),
+        practical_share=float(scores["practical_preference"].mean()),
+        disagreement=disagreement,
+        pressure_share=pressure_share,
+        dominant_pressure=dominant_pressure,
+    )
+
+
+def analyze_group(sessions, names=None, engine=DEFAULT_ENGINE):
+    """GroupResult for per-participant Sessions of one shared plan."""
+    if not sessions:
+        raise ValueError("A group decision needs at least one participant.")
+    if len({(session.plan.decision, session.plan.leaning) for session in sessions}) > 1:
+        raise ValueError("Every participant in a group decision must answer the same plan.")
+    return analyze_arrays(sessions[0].plan, *stack_sessions(sessions), names=names, engine=engine)
+
+
+def most_divided(group, limit=3):
+    """The `limit` questions the group disagrees on most, as (key, Disagreement), largest gap first."""
+    return sorted(group.disagreement.items(), key=lambda item: (item[1].max_gap, item[1].variance), reverse=True)[:limit]
@@ -0,0 +1,229 @@
+"""Append-only binary journal of the wizard in progress, so an assessment survives a restart."""
+
+import os
+import queue
+import struct
+import threading
+
+from biaslab_engine import DEFAULT_ENGINE, Decision
+from biaslab_wizard import WizardState
+
+JOURNAL_FILE = "biaslab_wizard.journal"
+
+JOURNAL_MAGIC = b"BLJ2"
+
+# Every record is <kind:u8><payload length:u32> followed by the payload.
+RECORD_HEADER = struct.Struct("<BI")
+RECORD_START = 1
+RECORD_ANSWER = 2
+
+# Start payload flags byte (after the leaning byte).
+START_ADAPTIVE = 0x01
+
+# Answer payload starts with <step number:u16><answer type:u8>.
+ANSWER_HEADER = struct.Struct("<HB")
+ANSWER_SCALE = 1
+ANSWER_PAIR = 2
+ANSWER_TEXT = 3
+
+_LENGTH = struct.Struct("<I")
+
+
+# ==========================================================
+# SECTION 1: RECORD ENCODING
+# ==========================================================
+
+
+def _pack_text(text):
+    data = text.encode("utf-8")
+    return _LENGTH.pack(len(data)) + data
+
+
+def _unpack_text(payload, offset):
+    (length,) = _LENGTH.unpack_from(payload, offset)
+    start = offset + _LENGTH.size
+    return payload[start : start + length].decode("utf-8"), start + length
+
+
+def _record(kind, payload):
+    return RECORD_HEADER.pack(kind, len(payload)) + payload
+
+
+def encode_start(decision, adaptive=False):
+    flags = START_ADAPTIVE if adaptive else 0
+    payload = decision.leaning.encode("ascii")[:1] + bytes((flags,)) + _pack_text(decision.text) + _pack_text(decision.option_a) + _pack_text(decision.option_b)
+    return _record(RECORD_START, payload)
+
+
+def encode_answer(step, value):
+    """Binary answer record: a slider step, an (A, B) step pair, or a text answer."""
+    if isinstance(value, str):
+        payload = ANSWER_HEADER.pack(step, ANSWER_TEXT) + _pack_text(value)
+    elif isinstance(value, tuple):
+        payload = ANSWER_HEADER.pack(step, ANSWER_PAIR) + bytes((int(value[0]), int(value[1])))
+    else:
+        payload = ANSWER_HEADER.pack(step, ANSWER_SCALE) + bytes((int(value),))
+    return _record(RECORD_ANSWER, payload)
+
+
+def _decode_start(payload):
+    leaning = payload[:1].decode("ascii")
+    adaptive = bool(payload[1] & START_ADAPTIVE)
+    text, offset = _unpack_text(payload, 2)
+    option_a, offset = _unpack_text(payload, offset)
+    option_b, _ = _unpack_text(payload, offset)
+    return Decision(text, option_a, option_b, leaning), adaptive
+
+
+def _decode_answer(payload):
+    step, answer_type = ANSWER_HEADER.unpack_from(payload)
+    body = ANSWER_HEADER.size
+    if answer_type == ANSWER_SCALE:
+        return step, payload[body]
+    if answer_type == ANSWER_PAIR:
+        return step, (payload[body], payload[body + 1])
+    return step, _unpack_text(payload, body)[0]
+
+
+def read_journal(file_name=JOURNAL_FILE):
+    """Return (Decision, [answers], adaptive) for an unfinished assessment, or None.
+
+    A torn record at the tail (crash mid-write) ends the replay at the last complete answer.
+    """
+    if not os.path.exists(file_name):
+        return None
+    with open(file_name, "rb") as file:
+        data = file.read()
+    if not data.startswith(JOURNAL_MAGIC):
+        return None
+
+    decision = None
+    adaptive = False
+    answers = []
+    offset = len(JOURNAL_MAGIC)
+    while offset + RECORD_HEADER.size <= len(data):
+        kind, length = RECORD_HEADER.unpack_from(data, offset)
+        start = offset + RECORD_HEADER.size
+        if start + length > len(data):
+            break
+        payload = data[start : start + length]
+        offset = start + length
+
+        if kind == RECORD_START:
+            decision, adaptive = _decode_start(payload)
+            answers = []
+        elif kind == RECORD_ANSWER and decision is not None:
+            step, value = _decode_answer(payload)
+            if step != len(answers):
+                break
+            answers.append(value)
+
+    if decision is None:
+        return None
+    return decision, answers, adaptive
+
+
+def replay_answers(plan, answers, adaptive=False):
+    """Rebuild a WizardState by submitting journaled answers in order, follow-ups included.
+
+    Returns (wizard, applied) where `applied` are the answers that were accepted; replay
+    stops at the first answer that no longer fits the plan. Adaptive pruning is
+    deterministic, so an adaptive wizard skips the same questions again.
+    """
+    wizard = WizardState(plan, adaptive=adaptive)
+    applied = []
+    for value in answers:
+        if wizard.current_question() is None:
+            break
+        try:
+            wizard.submit(value)
+        except (ValueError, TypeError, KeyError):
+            break
+        applied.append(value)
+    return wizard, applied
+
+
+# ==========================================================
+# SECTION 2: BACKGROUND JOURNAL WRITER
+# ==========================================================
+
+
+class WizardJournal:
+    """Writes journal records on a background thread so the Tk event loop never waits on disk.
+
+    Callers only encode a few bytes and enqueue them; the writer thread appends and
+    flushes each record in order.
+    """
+
+    def __init__(self, file_name=JOURNAL_FILE):
+        self.file_name = file_name
+        self._queue = queue.Queue()
+        self._step = 0
+        self._thread = threading.Thread(target=self._run, name="biaslab-journal", daemon=True)
+        self._thread.start()
+
+    def start(self, decision, adaptive=False):
+        """Begin a new assessment, replacing any previous journal."""
+        self._step = 0
+        self._queue.put(("reset", JOURNAL_MAGIC + encode_start(decision, adaptive)))
+
+    def restore(self, engine=DEFAULT_ENGINE):
+        """Replay an unfinished assessment from disk; returns its WizardState or None.
+
+        The journal is rewritten with just the replayed records, so a torn tail never
+        lingers in front of new answers.
+        """
+        journal = read_journal(self.file_name)
+        if journal is None:
+            return None
+        decision, answers, adaptive = journal
+        wizard, applied = replay_answers(engine.plan(decision), answers, adaptive)
+        self.start(decision, adaptive)
+        for value in applied:
+            self.record_answer(value)
+        return wizard
+
+    def record_answer(self, value):
+        self._queue.put(("append", encode_answer(self._step, value)))
+        self._step += 1
+
+    def finish(self):
+        """The assessment completed; nothing is left to resume."""
+        self._queue.put(("clear", None))
+
+    def flush(self):
+        """Block until every queued record has reached the file."""
+        self._queue.join()
+
+    def close(self):
+        self._queue.put(("stop", None))
+        self._thread.join()
+
+    def _run(self):
+        file = None
+        while True:
+            action, data = self._queue.get()
+            try:
+                if action in ("reset", "clear", "stop") and file is not None:
+                    file.close()
+                    file = None
+
+                if action == "reset":
+                    file = open(self.file_name, "wb")
+                    file.write(data)
+                    file.flush()
+                elif action == "append":
+                    if file is None:
+                        file = open(self.file_name, "ab")
+                    file.write(data)
+                    file.flush()
+                elif action == "clear":
+                    if os.path.exists(self.file_name):
+                        os.remove(self.file_name)
+                elif action == "stop":
+                    return
+            except OSError:
+                # A lost journal only costs resumability; never take the app down for it.
+                file = None
+            finally:
+                self._queue.task_done()
@@ -0,0 +1,319 @@
+"""Scalar scoring kernels for one session at a time, compiled with Numba when it is installed.
+
+The interactive path scores a single session, and streaming consumers score rows one
+at a time; at that size score_batch spends most of its time in NumPy call overhead
+and the engine in dict lookups. These kernels compute the same distortion-risk parts,
+the practical-preference safeguard and the bias-rule mask (bit i = BIAS_NAMES[i]) from
+flat rows in SCALE_ANSWER_KEYS / OPTION_CRITERIA_KEYS order, with NaN = not asked.
+Additions run in the engine's order, so results match it exactly.
+
+The mode is chosen at import: "numba" when Numba is importable and BIASLAB_NO_JIT is
+unset, else "python", where the same functions run uncompiled on lists. Compiled
+kernels are cached on disk (`cache=True`, in __pycache__), so only the first start
+after an install or an edit pays for compilation; warm_up() pays it up front.
+"""
+
+import math
+import os
+
+import numpy as np
+
+from biaslab_engine import BIAS_PRESSURE_KEYS, BIAS_RULES, DEFAULT_ENGINE, OPTION_CRITERIA_KEYS, SCALE_ANSWER_KEYS
+from biaslab_records import BIAS_NAMES
+from biaslab_text import note_signals
+from biaslab_vector import score_batch
+
+try:
+    import numba
+except ImportError:  # Numba is optional; without it the kernels run as plain Python.
+    numba = None
+
+NO_JIT_ENV = "BIASLAB_NO_JIT"
+MODE = "numba" if numba is not None and not os.environ.get(NO_JIT_ENV) else "python"
+
+
+def _kernel(function):
+    """Compile `function` with an on-disk cache in "numba" mode; return it unchanged otherwise."""
+    if MODE == "numba":
+        return numba.njit(cache=True)(function)
+    return function
+
+
+# ==========================================================
+# SECTION 1: ROW LAYOUT
+# ==========================================================
+
+_SCALE = {key: index for index, key in enumerate(SCALE_ANSWER_KEYS)}
+_CRITERION = {key: index for index, key in enumerate(OPTION_CRITERIA_KEYS)}
+
+_PRESSURE_COLUMNS = tuple(_SCALE[key] for key in BIAS_PRESSURE_KEYS)
+_PRESSURE_COUNT = len(BIAS_PRESSURE_KEYS) + 1
+_EMOTION = _SCALE["emotion"]
+_SOCIAL = _SCALE["social_pressure"]
+_SUNK_COST = _SCALE["sunk_cost"]
+_IDENTITY = _SCALE["identity_attachment"]
+_LOSS = _SCALE["loss_aversion"]
+_NOVELTY = _SCALE["novelty_pull"]
+_COUNTER = _SCALE["counter_strength"]
+_ALTERNATIVES = _SCALE["alt_exploration"]
+_FAILURE = _SCALE["failure_preview"]
+_REGRET = _SCALE["regret_preview"]
+_FAIRNESS = _SCALE["fairness"]
+_HARM = _SCALE["harm_risk"]
+_COMPATIBILITY = _CRITERION["compatibility"]
+_NEED_FIT = _CRITERION["need_fit"]
+_EVIDENCE = _CRITERION["evidence"]
+
+# Rule order of rule_mask; thresholds, text scores and mask bits are looked up by name,
+# so reordering BIAS_RULES cannot silently misattribute a bias.
+KERNEL_RULES = (
+    "Emotional Reasoning",
+    "Social Pressure Bias",
+    "Sunk Cost Fallacy",
+    "Identity Attachment Bias",
+    "Loss Aversion Bias",
+    "Novelty Attraction Bias",
+    "Confirmation / Tunnel Vision",
+    "Outcome Blindness (Optimism Bias)",
+    "Fairness Blind Spot",
+    "Weak-Evidence Decision Bias",
+)
+_RULES = {rule["name"]: rule for rule in BIAS_RULES}
+_THRESHOLDS = tuple(_RULES[name]["threshold"] for name in KERNEL_RULES)
+_RULE_BITS = tuple(1 << BIAS_NAMES.index(name) for name in KERNEL_RULES)
+_TEXT_RULES = tuple((index, _RULES[name]["text_score"]) for index, name in enumerate(KERNEL_RULES) if "text_score" in _RULES[name])
+_MAX_BIASES = 4
+
+# score_row returns these, in this order.
+ROW_FIELDS = (
+    "bias_pressure",
+    "foresight_gap",
+    "fairness_risk",
+    "weak_choice_penalty",
+    "chosen_rational",
+    "other_rational",
+    "justification_gap",
+    "distortion_risk",
+    "risk_class",
+    "practical_preference",
+)
+_DISTORTION_KEYS = ("bias_pressure", "foresight_gap", "fairness_risk", "weak_choice_penalty", "low_evidence_penalty")
+
+
+def kernel_weights(engine=DEFAULT_ENGINE):
+    """(rational columns, rational weights, distortion weights) of an engine, in the active mode's container types."""
+    columns = [_CRITERION[key] for key in engine.rational_weights]
+    rational = [float(weight) for weight in engine.rational_weights.values()]
+    distortion = [float(engine.distortion_weights[key]) for key in _DISTORTION_KEYS]
+    if MODE == "numba":
+        return np.array(columns, dtype=np.int64), np.array(rational), np.array(distortion)
+    return tuple(columns), tuple(rational), tuple(distortion)
+
+
+def row_inputs(session):
+    """(answers, chosen, other) rows of a Session, as float64 arrays in "numba" mode and lists otherwise."""
+    chosen_key = session.plan.leaning
+    other_key = "B" if chosen_key == "A" else "A"
+    answers = [value if isinstance(value, (int, float)) else math.nan for value in map(session.answers.get, SCALE_ANSWER_KEYS)]
+    chosen_scores = session.option_scores.get(chosen_key, {})
+    other_scores = session.option_scores.get(other_key, {})
+    chosen = [chosen_scores.get(key, math.nan) for key in OPTION_CRITERIA_KEYS]
+    other = [other_scores.get(key, math.nan) for key in OPTION_CRITERIA_KEYS]
+    if MODE == "numba":
+        return np.array(answers, dtype=np.float64), np.array(chosen, dtype=np.float64), np.array(other, dtype=np.float64)
+    return answers, chosen, other
+
+
+def text_floors(notes):
+    """Per KERNEL_RULES rule, the score its note text alone reaches (0 without a text rule or note)."""
+    floors = [0.0] * len(KERNEL_RULES)
+    for index, text_score in _TEXT_RULES:
+        floors[index] = text_score(notes) or 0.0
+    return np.array(floors) if MODE == "numba" else floors
+
+
+# ==========================================================
+# SECTION 2: KERNELS
+# ==========================================================
+
+
+@_kernel
+def _value(row, index):
+    value = row[index]
+    return 0.5 if value != value else value
+
+
+@_kernel
+def _clamp01(value):
+    return max(0.0, min(1.0, value))
+
+
+@_kernel
+def score_row(answers, chosen, other, rational_columns, rational_weights, distortion_weights):
+    """One session's scores as a tuple in ROW_FIELDS order."""
+    pressure_total = 0.0
+    for column in _PRESSURE_COLUMNS:
+        pressure_total += _value(answers, column)
+    pressure_total += 1 - _value(answers, _COUNTER)
+    bias_pressure = pressure_total / _PRESSURE_COUNT
+    foresight_gap = ((1 - _value(answers, _FAILURE)) + (1 - _value(answers, _REGRET)) + (1 - _value(answers, _ALTERNATIVES))) / 3
+    fairness_risk = _clamp01((1 - _value(answers, _FAIRNESS)) * 0.60 + _value(answers, _HARM) * 0.40)
+
+    chosen_rational = 0.0
+    other_rational = 0.0
+    for index in range(len(rational_columns)):
+        chosen_rational += _value(chosen, rational_columns[index]) * rational_weights[index]
+        other_rational += _value(other, rational_columns[index]) * rational_weights[index]
+
+    justification_gap = chosen_rational - other_rational
+    weak_choice_penalty = max(0.0, -justification_gap)
+    distortion_risk = _clamp01(
+        bias_pressure * distortion_weights[0]
+        + foresight_gap * distortion_weights[1]
+        + fairness_risk * distortion_weights[2]
+        + weak_choice_penalty * distortion_weights[3]
+        + (1 - chosen_rational) * distortion_weights[4]
+    )
+    risk_class = (1 if distortion_risk >= 0.30 else 0) + (1 if distortion_risk >= 0.60 else 0)
+    practical_preference = (
+        _value(chosen, _COMPATIBILITY) >= 0.70
+        and _value(chosen, _NEED_FIT) >= 0.65
+        and _value(chosen, _EVIDENCE) >= 0.55
+        and justification_gap >= 0.05
+        and _value(answers, _COUNTER) >= 0.45
+    )
+    return (
+        bias_pressure,
+        foresight_gap,
+        fairness_risk,
+        weak_choice_penalty,
+        chosen_rational,
+        other_rational,
+        justification_gap,
+        distortion_risk,
+        risk_class,
+        practical_preference,
+    )
+
+
+@_kernel
+def rule_mask(answers, chosen_rational, floors):
+    """Bitmask of the biases detect_bias_patterns reports (bit i = BIAS_NAMES[i]); `floors` is text_floors()."""
+    scores = [
+        _value(answers, _EMOTION),
+        _value(answers, _SOCIAL),
+        _value(answers, _SUNK_COST),
+        _value(answers, _IDENTITY),
+        _value(answers, _LOSS),
+        _value(answers, _NOVELTY),
+        max(1 - _value(answers, _COUNTER), 1 - _value(answers, _ALTERNATIVES)),
+        ((1 - _value(answers, _FAILURE)) + (1 - _value(answers, _REGRET))) / 2,
+        max(1 - _value(answers, _FAIRNESS), _value(answers, _HARM)),
+        1 - chosen_rational,
+    ]
+    hit = [False] * len(scores)
+    for index in range(len(scores)):
+        score = max(scores[index], floors[index])
+        scores[index] = score
+        hit[index] = score >= _THRESHOLDS[index]
+
+    # The engine keeps the top hits of a stable sort by score: pick the highest, first wins ties.
+    mask = 0
+    for _ in range(_MAX_BIASES):
+        best = -1
+        for index in range(len(scores)):
+            if hit[index] and (best < 0 or scores[index] > scores[best]):
+                best = index
+        if best < 0:
+            break
+        hit[best] = False
+        mask |= _RULE_BITS[best]
+    return mask
+
+
+@_kernel
+def _score_rows(answers, chosen, other, floors, rational_columns, rational_weights, distortion_weights, floats, risk_classes, practical, biases):
+    for row in range(answers.shape[0]):
+        # score_row returns a mixed float/int/bool tuple, which nopython mode cannot index with a variable.
+        (
+            floats[0, row],
+            floats[1, row],
+            floats[2, row],
+            floats[3, row],
+            floats[4, row],
+            floats[5, row],
+            floats[6, row],
+            floats[7, row],
+            risk_classes[row],
+            practical[row],
+        ) = score_row(answers[row], chosen[row], other[row], rational_columns, rational_weights, distortion_weights)
+        biases[row] = rule_mask(answers[row], floats[4, row], floors[row])
+
+
+# ==========================================================
+# SECTION 3: SESSIONS AND BATCHES
+# ==========================================================
+
+
+def score_session(session, weights=None):
+    """{ROW_FIELDS field: value, "biases": mask} for one Session, scored with `weights` (default: kernel_weights())."""
+    weights = kernel_weights() if weights is None else weights
+    answers, chosen, other = row_inputs(session)
+    scores = score_row(answers, chosen, other, *weights)
+    outputs = dict(zip(ROW_FIELDS, scores))
+    outputs["biases"] = rule_mask(answers, scores[4], text_floors(note_signals(session.answers, session.plan.leaning)))
+    return outputs
+
+
+def score_rows(answers, chosen, other, floors=None, weights=None):
+    """score_batch fields plus "biases" for (N, K) / (N, 5) arrays; `floors` is (N, 10) text floors, default none.
+
+    In "numba" mode one compiled loop scores every row; in "python" mode the batch goes
+    to score_batch, which is faster than a Python loop, and only the rule masks loop.
+    """
+    weights = kernel_weights() if weights is None else weights
+    count = len(answers)
+    floors = np.zeros((count, len(KERNEL_RULES))) if floors is None else np.asarray(floors, dtype=np.float64)
+    if MODE == "numba":
+        floats = np.empty((8, count))
+        risk_classes = np.empty(count, dtype=np.int8)
+        practical = np.empty(count, dtype=np.bool_)
+        biases = np.empty(count, dtype=np.uint16)
+        _score_rows(answers, chosen, other, floors, *weights, floats, risk_classes, practical, biases)
+        outputs = dict(zip(ROW_FIELDS[:8], floats))
+        outputs.update(risk_class=risk_classes, practical_preference=practical, biases=biases)
+        return outputs
+    columns, rational, distortion = weights
+    outputs = score_batch(
+        answers,
+        chosen,
+        other,
+        {OPTION_CRITERIA_KEYS[column]: weight for column, weight in zip(columns, rational)},
+        dict(zip(_DISTORTION_KEYS, distortion)),
+    )
+    answer_rows = answers.tolist()
+    outputs["biases"] = np.array(
+        [rule_mask(row, chosen_rational, floor) for row, chosen_rational, floor in zip(answer_rows, outputs["chosen_rational"].tolist(), floors.tolist())],
+        dtype=np.uint16,
+    )
+    return outputs
+
+
+def golden_candidate(batch):
+    """biaslab_golden candidate: every field, bias mask included (`check golden --candidate biaslab_kernels:golden_candidate`)."""
+    from biaslab_golden import batch_arrays, batch_sessions
+
+    floors = [text_floors(note_signals(session.answers, session.plan.leaning)) for session in batch_sessions(batch)]
+    return score_rows(*batch_arrays(batch), floors=np.array(floors).reshape(-1, len(KERNEL_RULES)))
+
+
+def warm_up():
+    """Compile (or load from the cache) every kernel now rather than on the first session; a no-op in "python" mode."""
+    if MODE != "numba":
+        return
+    weights = kernel_weights()
+    answers = np.full((1, len(SCALE_ANSWER_KEYS)), np.nan)
+    criteria = np.full((1, len(OPTION_CRITERIA_KEYS)), np.nan)
+    score_row(answers[0], criteria[0], criteria[0], *weights)
+    rule_mask(answers[0], 0.5, np.zeros(len(KERNEL_RULES)))
+    score_rows(answers, criteria, criteria, weights=weights)
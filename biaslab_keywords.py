@@ -0,0 +1,150 @@
+"""Tokenized, stemmed keyword matching for context and scale detection.
+
+Keywords are stemmed once into a hash index (stem -> {group: weight}), so classifying a
+decision is one tokenize-and-lookup pass. Tokens with no exact hit can fall back to an
+edit-distance-1 match served from a SymSpell-style deletion index, which keeps fuzzy
+lookup at a handful of dict probes per token.
+"""
+
+import re
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+
+# Past tenses and plurals no suffix rule can reach.
+IRREGULAR_STEMS = {
+    "bought": "buy",
+    "sold": "sell",
+    "paid": "pay",
+    "spent": "spend",
+    "chose": "choos",
+    "chosen": "choos",
+    "took": "tak",
+    "taken": "tak",
+    "went": "go",
+    "gone": "go",
+    "left": "leav",
+    "met": "meet",
+    "lent": "lend",
+    "borrowed": "borrow",
+    "children": "child",
+    "people": "person",
+}
+
+FUZZY_WEIGHT = 0.5
+MIN_FUZZY_LENGTH = 5
+TOKEN_CACHE_SIZE = 50_000
+
+_SUFFIXES = (("ies", "i"), ("ied", "i"), ("ing", ""), ("ed", ""), ("es", ""), ("s", ""))
+_VOWELS = set("aeiouy")
+
+
+def tokenize(text):
+    return TOKEN_PATTERN.findall(text.lower())
+
+
+def stem(word):
+    """Light suffix-stripping stemmer: investing/invests/invested -> invest, study/studies -> studi."""
+    if word in IRREGULAR_STEMS:
+        return IRREGULAR_STEMS[word]
+    for suffix, replacement in _SUFFIXES:
+        if word.endswith(suffix) and not word.endswith("ss") and len(word) - len(suffix) >= 3:
+            base = word[: -len(suffix)] + replacement
+            if replacement or _VOWELS & set(base):
+                word = base
+                break
+    # shopping -> shopp -> shop; relocate/relocating -> relocat
+    if len(word) > 3 and word[-1] == word[-2] and word[-1] not in "ls" and word[-1] not in _VOWELS:
+        word = word[:-1]
+    if len(word) > 3 and word.endswith("e"):
+        word = word[:-1]
+    elif len(word) > 3 and word.endswith("y") and word[-2] not in _VOWELS:
+        word = word[:-1] + "i"
+    return word
+
+
+def _deletes(word):
+    return {word[:index] + word[index + 1 :] for index in range(len(word))}
+
+
+def within_one_edit(first, second):
+    """True for one insertion, deletion, substitution or adjacent transposition."""
+    if first == second:
+        return True
+    if abs(len(first) - len(second)) > 1:
+        return False
+    if len(first) == len(second):
+        diffs = [index for index in range(len(first)) if first[index] != second[index]]
+        if len(diffs) == 1:
+            return True
+        return len(diffs) == 2 and diffs[1] == diffs[0] + 1 and first[diffs[0]] == second[diffs[1]] and first[diffs[1]] == second[diffs[0]]
+    shorter, longer = (first, second) if len(first) < len(second) else (second, first)
+    return any(longer[:index] + longer[index + 1 :] == shorter for index in range(len(longer)))
+
+
+class KeywordIndex:
+    """Precomputed stem index over named keyword groups (contexts, scale markers, ...).
+
+    Multi-word keywords ("ask out") are indexed as stemmed bigrams. Each distinct stem
+    found adds 1 to every group listing it (shop and shopping count once); typo matches
+    add FUZZY_WEIGHT.
+    """
+
+    def __init__(self, groups, typo_tolerance=True):
+        self.groups = list(groups)
+        self.typo_tolerance = typo_tolerance
+        self.index = {}
+        self.deletions = {}
+        for group, keywords in groups.items():
+            for keyword in keywords:
+                key = " ".join(stem(token) for token in tokenize(keyword))
+                if key:
+                    self.index.setdefault(key, {})[group] = 1
+
+        self._bigrams = any(" " in key for key in self.index)
+        self._token_cache = {}
+        for key in self.index:
+            if " " not in key and len(key) >= MIN_FUZZY_LENGTH - 1:
+                for variant in _deletes(key) | {key}:
+                    self.deletions.setdefault(variant, set()).add(key)
+
+    def _fuzzy_keys(self, token):
+        candidates = set()
+        for variant in _deletes(token) | {token}:
+            candidates.update(self.deletions.get(variant, ()))
+        return [key for key in candidates if within_one_edit(token, key)]
+
+    def _lookup(self, token):
+        """(stem, ((index key, weight), ...)) for one raw token, memoized per index."""
+        cached = self._token_cache.get(token)
+        if cached is None:
+            token_stem = stem(token)
+            if token_stem in self.index:
+                hits = ((token_stem, 1.0),)
+            elif self.typo_tolerance and len(token_stem) >= MIN_FUZZY_LENGTH:
+                hits = tuple((key, FUZZY_WEIGHT) for key in self._fuzzy_keys(token_stem))
+            else:
+                hits = ()
+            cached = (token_stem, hits)
+            if len(self._token_cache) >= TOKEN_CACHE_SIZE:
+                self._token_cache.clear()
+            self._token_cache[token] = cached
+        return cached
+
+    def scores(self, text):
+        """{group: score} over the distinct keyword stems found in `text` (one pass)."""
+        found = {}
+        previous = None
+        for token in TOKEN_PATTERN.findall(text.lower()):
+            token_stem, hits = self._lookup(token)
+            if previous is not None and self._bigrams and (previous + " " + token_stem) in self.index:
+                found[previous + " " + token_stem] = 1.0
+            for key, weight in hits:
+                if found.get(key, 0.0) < weight:
+                    found[key] = weight
+            previous = token_stem
+
+        scores = dict.fromkeys(self.groups, 0)
+        for key, weight in found.items():
+            for group in self.index[key]:
+                scores[group] += weight
+        return scores
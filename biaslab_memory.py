@@ -0,0 +1,139 @@
+"""Memory instrumentation for long-running (kiosk) processes.
+
+A MemoryMonitor takes periodic samples of resident set size, tracemalloc totals and the
+source lines whose allocations grew most since the previous snapshot, together with
+whatever live-object counts the caller passes in (Tk widgets, matplotlib figures,
+completed sessions). Samples are kept in a bounded list and dumped as JSON, with growth
+per completed session, so leaks show up as a slope rather than a guess.
+
+The GUI turns it on when BIASLAB_MEMORY_PROFILE is set (to the sampling interval in
+seconds); Ctrl+Shift+M then samples and writes biaslab_memory.json.
+"""
+
+import json
+import os
+import time
+import tracemalloc
+from collections import namedtuple
+
+MEMORY_DUMP = "biaslab_memory.json"
+PROFILE_ENV = "BIASLAB_MEMORY_PROFILE"
+DEFAULT_INTERVAL_S = 60.0
+TOP_LINES = 15
+MAX_SAMPLES = 2_000
+
+# top_growth: [(file:line, size change in bytes, allocation count change)] since the previous sample.
+MemorySample = namedtuple("MemorySample", ["timestamp", "rss_bytes", "traced_bytes", "peak_traced_bytes", "counts", "top_growth"])
+
+_IGNORED_FRAMES = (
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, __file__),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+    tracemalloc.Filter(False, "<unknown>"),
+)
+
+
+def rss_bytes():
+    """Current resident set size, or None where it cannot be read."""
+    try:
+        with open("/proc/self/statm", encoding="ascii") as file:
+            return int(file.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        pass
+    try:
+        import resource
+    except ImportError:  # Windows has neither /proc nor resource.
+        return None
+    # Peak rather than current RSS; kilobytes on Linux, bytes on macOS.
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if os.uname().sysname == "Darwin" else peak * 1024
+
+
+def profile_interval():
+    """Sampling interval from BIASLAB_MEMORY_PROFILE, or None when profiling is off."""
+    value = os.environ.get(PROFILE_ENV, "").strip()
+    if not value or value == "0":
+        return None
+    try:
+        return float(value)
+    except ValueError:
+        return DEFAULT_INTERVAL_S
+
+
+class MemoryMonitor:
+    """Periodic memory samples diffed by source line; `counts` are caller-supplied live-object counts."""
+
+    def __init__(self, interval_s=DEFAULT_INTERVAL_S, top=TOP_LINES, frames=1, max_samples=MAX_SAMPLES):
+        self.interval_s = interval_s
+        self.top = top
+        self.frames = frames
+        self.max_samples = max_samples
+        self.samples = []
+        self._snapshot = None
+
+    def start(self):
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(self.frames)
+        self._snapshot = self._take_snapshot()
+        return self
+
+    def stop(self):
+        self._snapshot = None
+        tracemalloc.stop()
+
+    def _take_snapshot(self):
+        return tracemalloc.take_snapshot().filter_traces(_IGNORED_FRAMES)
+
+    def sample(self, **counts):
+        """Record one MemorySample, e.g. sample(widgets=120, figures=1, sessions=40)."""
+        top_growth = []
+        traced = peak = 0
+        if tracemalloc.is_tracing():
+            snapshot = self._take_snapshot()
+            if self._snapshot is not None:
+                for stat in snapshot.compare_to(self._snapshot, "lineno")[: self.top]:
+                    frame = stat.traceback[0]
+                    top_growth.append((f"{frame.filename}:{frame.lineno}", stat.size_diff, stat.count_diff))
+            self._snapshot = snapshot
+            traced, peak = tracemalloc.get_traced_memory()
+        sample = MemorySample(time.time(), rss_bytes(), traced, peak, counts, top_growth)
+        self.samples.append(sample)
+        if len(self.samples) > self.max_samples:
+            # Keep the first sample as the baseline for growth figures.
+            del self.samples[1]
+        return sample
+
+    def growth(self, per="sessions"):
+        """{metric: change per unit of the `per` count} between the first and latest sample."""
+        if len(self.samples) < 2:
+            return {}
+        first, last = self.samples[0], self.samples[-1]
+        units = last.counts.get(per, 0) - first.counts.get(per, 0)
+        if units <= 0:
+            return {}
+        growth = {"traced_bytes": (last.traced_bytes - first.traced_bytes) / units}
+        if first.rss_bytes is not None and last.rss_bytes is not None:
+            growth["rss_bytes"] = (last.rss_bytes - first.rss_bytes) / units
+        for name, value in last.counts.items():
+            if name != per and name in first.counts:
+                growth[name] = (value - first.counts[name]) / units
+        return growth
+
+    def report(self):
+        """JSON-ready dict of every sample and the growth per session."""
+        return {
+            "pid": os.getpid(),
+            "samples": [sample._asdict() for sample in self.samples],
+            "growth_per_session": self.growth(),
+        }
+
+    def dump(self, file_name=MEMORY_DUMP):
+        with open(file_name, "w", encoding="utf-8") as file:
+            json.dump(self.report(), file, indent=1)
+        return file_name
+
+
+def live_widgets(widget):
+    """Number of live Tk widgets under (and including) `widget`."""
+    return 1 + sum(live_widgets(child) for child in widget.winfo_children())
@@ -0,0 +1,100 @@
+"""Pareto-dominance filtering of options ahead of the weighted rational ranking.
+
+An option is dominated when another one scores at least as well on every criterion in
+OPTION_CRITERIA_KEYS and strictly better on at least one; no choice of weights can rank
+it first, so it is dropped before calculate_rational_quality ranks the rest. The skyline
+uses sort-filter: options are sorted by criterion sum (a dominating option always has
+the larger sum), then each one is checked against the front found so far only, which is
+O(n log n + n*h) for a front of h options. Batches of option sets are filtered with one
+broadcast comparison.
+"""
+
+from collections import namedtuple
+
+import numpy as np
+
+from biaslab_counterfactual import CRITERION_NAMES
+from biaslab_engine import OPTION_CRITERIA_KEYS, RATIONAL_WEIGHTS, calculate_rational_quality
+
+# ==========================================================
+# SECTION 1: SKYLINE OF ONE OPTION SET
+# ==========================================================
+
+# `dropped` is dominated by `by`, which is strictly better on the `better_on` criteria and level on the rest.
+Dominance = namedtuple("Dominance", ["dropped", "by", "better_on"])
+
+
+def _filled(scores):
+    filled = dict.fromkeys(OPTION_CRITERIA_KEYS, 0.5)
+    filled.update(scores)
+    return filled
+
+
+def _vector(scores, criteria):
+    return tuple(scores.get(key, 0.5) for key in criteria)
+
+
+def _dominates(left, right):
+    return all(a >= b for a, b in zip(left, right)) and left != right
+
+
+def pareto_front(option_scores, criteria=OPTION_CRITERIA_KEYS):
+    """(non-dominated labels in input order, [Dominance]) for {label: {criterion: score}}; missing scores count as 0.5."""
+    vectors = {label: _vector(scores, criteria) for label, scores in option_scores.items()}
+    ordered = sorted(vectors, key=lambda label: (sum(vectors[label]), vectors[label]), reverse=True)
+    front = []
+    dropped = []
+    for label in ordered:
+        dominator = next((kept for kept in front if _dominates(vectors[kept], vectors[label])), None)
+        if dominator is None:
+            front.append(label)
+        else:
+            better_on = [key for key, a, b in zip(criteria, vectors[dominator], vectors[label]) if a > b]
+            dropped.append(Dominance(label, dominator, better_on))
+    kept = set(front)
+    return [label for label in option_scores if label in kept], dropped
+
+
+def rank_options(option_scores, weights=RATIONAL_WEIGHTS):
+    """(label, rational quality) of the non-dominated options, best first, and the Dominance of each dropped one."""
+    front, dropped = pareto_front(option_scores)
+    ranked = sorted(((label, calculate_rational_quality(_filled(option_scores[label]), weights)) for label in front), key=lambda item: item[1], reverse=True)
+    return ranked, dropped
+
+
+def result_dominance(result):
+    """Dominance of the dropped option when one of a result's two options dominates the other, else None."""
+    _, dropped = pareto_front({"chosen": result.chosen_scores, "other": result.other_scores})
+    if not dropped:
+        return None
+    labels = {"chosen": result.chosen_label, "other": result.other_label}
+    return dropped[0]._replace(dropped=labels[dropped[0].dropped], by=labels[dropped[0].by])
+
+
+def describe_dominance(dominance):
+    """One plain-language line for a Dominance."""
+    better = ", ".join(CRITERION_NAMES.get(key, key) for key in dominance.better_on)
+    return f"{dominance.by} is at least as good as {dominance.dropped} on every criterion and better on {better}, so no weighting of the criteria favours {dominance.dropped}."
+
+
+# ==========================================================
+# SECTION 2: BATCHES
+# ==========================================================
+
+
+def dominated_mask(scores):
+    """(N, n) bool: which of n options in each of N option sets is dominated; `scores` is (N, n, criteria), NaN = 0.5.
+
+    One (N, n, n, criteria) comparison, so keep N * n * n * criteria within memory by chunking large batches.
+    """
+    scores = np.where(np.isnan(scores), 0.5, scores)
+    left = scores[:, :, None, :]
+    right = scores[:, None, :, :]
+    dominates = np.all(left >= right, axis=-1) & np.any(left > right, axis=-1)
+    return dominates.any(axis=1)
+
+
+def pair_dominance(chosen, other):
+    """(N,) int8 for two-option batches (N, criteria): 1 when the leaning option dominates, -1 when it is dominated, else 0."""
+    mask = dominated_mask(np.stack([chosen, other], axis=1))
+    return mask[:, 1].astype(np.int8) - mask[:, 0].astype(np.int8)
@@ -0,0 +1,100 @@
+"""Background analysis pipeline: analyze, narrate, solve counterfactuals and save off the UI thread.
+
+A job runs its stages in order on a worker thread and reports each one on a queue, which
+the UI drains from its own event loop (Tk's `after` polling), so no widget is touched off
+the main thread. Cancelling a job stops it at the next stage boundary; a stage that has
+already started (for example the session save) runs to completion.
+"""
+
+import queue
+import threading
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+
+from biaslab_counterfactual import verdict_counterfactuals
+from biaslab_engine import DEFAULT_ENGINE
+from biaslab_store import save_session
+
+STAGES = ("analyze", "narrate", "counterfactuals", "save")
+STAGE_LABELS = {
+    "analyze": "Scoring your answers",
+    "narrate": "Writing the report",
+    "counterfactuals": "Finding what would change the verdict",
+    "save": "Saving the session",
+}
+
+# `stage` is a STAGES entry while running, then "done" (value: {stage: output}),
+# "cancelled" or "error" (value: the exception).
+PipelineUpdate = namedtuple("PipelineUpdate", ["stage", "completed", "total", "value"])
+
+
+class AnalysisJob:
+    """Handle of one submitted session: cancel it, or poll its updates without blocking."""
+
+    def __init__(self):
+        self.updates = queue.Queue()
+        self.outputs = {}
+        self._cancelled = threading.Event()
+
+    def cancel(self):
+        self._cancelled.set()
+
+    @property
+    def cancelled(self):
+        return self._cancelled.is_set()
+
+    def poll(self):
+        """Every update posted since the last poll, oldest first."""
+        updates = []
+        while True:
+            try:
+                updates.append(self.updates.get_nowait())
+            except queue.Empty:
+                return updates
+
+
+class AnalysisPipeline:
+    """Runs finished sessions through the analysis stages on one background worker.
+
+    One worker keeps session saves in submission order; `save` replaces
+    biaslab_store.save_session (None skips saving) and `counterfactuals` replaces
+    verdict_counterfactuals (for example biaslab_cache's memoized one).
+    """
+
+    def __init__(self, engine=DEFAULT_ENGINE, save=save_session, counterfactuals=verdict_counterfactuals):
+        self.engine = engine
+        self.save = save
+        self.counterfactuals = counterfactuals
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="biaslab-analysis")
+
+    def _stages(self):
+        engine = self.engine
+        counterfactuals = self.counterfactuals
+        return [
+            ("analyze", lambda session, outputs: engine.analyze(session)),
+            ("narrate", lambda session, outputs: engine.narrate(outputs["analyze"])),
+            ("counterfactuals", lambda session, outputs: counterfactuals(outputs["analyze"], engine, session.option_scores)),
+            ("save", lambda session, outputs: self.save(outputs["analyze"]) if self.save else None),
+        ]
+
+    def submit(self, session):
+        job = AnalysisJob()
+        self._executor.submit(self._run, job, session)
+        return job
+
+    def _run(self, job, session):
+        stages = self._stages()
+        try:
+            for completed, (stage, step) in enumerate(stages):
+                if job.cancelled:
+                    job.updates.put(PipelineUpdate("cancelled", completed, len(stages), None))
+                    return
+                job.updates.put(PipelineUpdate(stage, completed, len(stages), None))
+                job.outputs[stage] = step(session, job.outputs)
+        except Exception as error:
+            job.updates.put(PipelineUpdate("error", completed, len(stages), error))
+            return
+        job.updates.put(PipelineUpdate("done", len(stages), len(stages), job.outputs))
+
+    def shutdown(self, wait=False):
+        self._executor.shutdown(wait=wait)
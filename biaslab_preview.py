@@ -0,0 +1,87 @@
+"""Live risk preview for the question screen, updated in O(1) per slider event.
+
+The preview keeps running totals in slider steps (unanswered sliders count as 5, like
+the engine's 0.5 default): the bias-pressure sum, the foresight-gap sum, the two
+fairness inputs and the weighted criterion totals of both options. Moving one slider
+adjusts one total by the step difference, and the risk is read off the totals with the
+engine's distortion formula, so dragging never triggers a full re-score.
+"""
+
+from biaslab_engine import BIAS_PRESSURE_KEYS, DEFAULT_ENGINE, OPTION_CRITERIA_KEYS, SCALE_ANSWER_KEYS, clamp01
+from biaslab_report import classify_risk
+
+DEFAULT_STEP = 5
+MAX_STEP = 10
+FORESIGHT_KEYS = ("failure_preview", "regret_preview", "alt_exploration")
+
+_UNANSWERED = 255
+_CRITERIA_COUNT = len(OPTION_CRITERIA_KEYS)
+
+
+def _step_or_default(step):
+    return DEFAULT_STEP if step == _UNANSWERED else step
+
+
+class LiveRiskPreview:
+    """Running distortion-risk estimate over a wizard's answers plus the slider being dragged."""
+
+    __slots__ = ("leaning", "distortion_weights", "rational_weights", "steps", "pressure_total", "foresight_total", "chosen_total", "other_total")
+
+    def __init__(self, wizard, engine=DEFAULT_ENGINE):
+        self.leaning = wizard.plan.leaning
+        self.distortion_weights = engine.distortion_weights
+        self.rational_weights = engine.rational_weights
+        self.steps = {key: _step_or_default(step) for key, step in zip(SCALE_ANSWER_KEYS, wizard.scale_steps)}
+        for offset, option_key in ((0, "A"), (_CRITERIA_COUNT, "B")):
+            for index, key in enumerate(OPTION_CRITERIA_KEYS):
+                self.steps[(option_key, key)] = _step_or_default(wizard.option_steps[offset + index])
+
+        self.pressure_total = sum(self.steps[key] for key in BIAS_PRESSURE_KEYS) + MAX_STEP - self.steps["counter_strength"]
+        self.foresight_total = sum(MAX_STEP - self.steps[key] for key in FORESIGHT_KEYS)
+        other_key = "B" if self.leaning == "A" else "A"
+        self.chosen_total = sum(self.steps[(self.leaning, key)] * weight for key, weight in self.rational_weights.items())
+        self.other_total = sum(self.steps[(other_key, key)] * weight for key, weight in self.rational_weights.items())
+
+    def set_answer(self, key, step):
+        """A single slider moved to `step` (0-10)."""
+        delta = int(step) - self.steps[key]
+        if not delta:
+            return
+        self.steps[key] += delta
+        if key in BIAS_PRESSURE_KEYS:
+            self.pressure_total += delta
+        elif key == "counter_strength":
+            self.pressure_total -= delta
+        elif key in FORESIGHT_KEYS:
+            self.foresight_total -= delta
+
+    def set_criterion(self, option_key, key, step):
+        """One side of an option-comparison slider moved to `step` (0-10)."""
+        delta = int(step) - self.steps[(option_key, key)]
+        if not delta:
+            return
+        self.steps[(option_key, key)] += delta
+        if option_key == self.leaning:
+            self.chosen_total += delta * self.rational_weights[key]
+        else:
+            self.other_total += delta * self.rational_weights[key]
+
+    @property
+    def risk(self):
+        weights = self.distortion_weights
+        bias_pressure = self.pressure_total / MAX_STEP / (len(BIAS_PRESSURE_KEYS) + 1)
+        foresight_gap = self.foresight_total / MAX_STEP / len(FORESIGHT_KEYS)
+        fairness_risk = clamp01((MAX_STEP - self.steps["fairness"]) / MAX_STEP * 0.60 + self.steps["harm_risk"] / MAX_STEP * 0.40)
+        chosen_rational = self.chosen_total / MAX_STEP
+        weak_choice_penalty = max(0.0, (self.other_total - self.chosen_total) / MAX_STEP)
+        return clamp01(
+            bias_pressure * weights["bias_pressure"]
+            + foresight_gap * weights["foresight_gap"]
+            + fairness_risk * weights["fairness_risk"]
+            + weak_choice_penalty * weights["weak_choice_penalty"]
+            + (1 - chosen_rational) * weights["low_evidence_penalty"]
+        )
+
+    @property
+    def label(self):
+        return classify_risk(self.risk)
@@ -0,0 +1,116 @@
+"""Expected follow-up counts per (context, scale), so the wizard can show a stable total.
+
+Follow-ups are triggered by slider answers crossing a threshold (followup_questions). For
+every (context, scale) and trigger slider, the expected number of follow-ups that slider
+adds to its plan is precomputed from the slider distributions of the synthetic workload
+generator (exactly, from its rounded normal answers), and replaced by rates measured in
+the session records wherever the history holds enough answers.
+
+The wizard starts from base questions + expected follow-ups and, when a trigger slider is
+answered or skipped, swaps its expected share for what actually happened: one O(1) update.
+"""
+
+import math
+from collections import namedtuple
+
+import numpy as np
+
+from biaslab_engine import SCALE_ANSWER_KEYS, planned_cognitive_questions
+from biaslab_records import CONTEXT_CODES, SCALE_CODES, open_records
+from biaslab_workload import DEFAULT_PROFILES, FOLLOWUP_STEPS, ContextProfile
+
+MIN_HISTORY_ANSWERS = 50
+# use_history runs at every app start, so it only reads this many of the newest records.
+MAX_HISTORY_RECORDS = 200_000
+
+# Follow-ups one trigger slider adds to its plan: on average, and at most.
+FollowupRate = namedtuple("FollowupRate", ["expected", "most"])
+NO_FOLLOWUPS = FollowupRate(0.0, 0)
+_HISTORY_CHUNK = 1 << 20
+_SCALE_INDEX = {key: index for index, key in enumerate(SCALE_ANSWER_KEYS)}
+
+_QUESTION_IDS = {}
+_NEW_FOLLOWUPS = {}
+_RATES = {}
+
+
+def plan_question_ids(context, scale):
+    """Shared frozenset of the cognitive question IDs every plan for (context, scale) starts with."""
+    key = (context, scale)
+    if key not in _QUESTION_IDS:
+        _QUESTION_IDS[key] = frozenset(question["id"] for question in planned_cognitive_questions(context, scale, "Option A", "Option B", "A"))
+    return _QUESTION_IDS[key]
+
+
+def new_followups(context, scale):
+    """{trigger key: int array over steps 0-10} of follow-ups each answer adds to this plan."""
+    key = (context, scale)
+    if key not in _NEW_FOLLOWUPS:
+        asked = plan_question_ids(context, scale)
+        table = {}
+        for trigger, followups in FOLLOWUP_STEPS.items():
+            if trigger in asked:
+                table[trigger] = sum((triggered.astype(int) for followup_id, triggered in followups.items() if followup_id not in asked), np.zeros(11, dtype=int))
+        _NEW_FOLLOWUPS[key] = table
+    return _NEW_FOLLOWUPS[key]
+
+
+def _step_probabilities(mean, spread):
+    """P(step) of np.clip(np.rint(normal(mean, spread)), 0, 10), as the generator draws answers."""
+    edges = [0.5 * (1 + math.erf((edge - mean) / (spread * math.sqrt(2)))) for edge in np.arange(0.5, 10, 1.0)]
+    return np.diff(np.concatenate([[0.0], edges, [1.0]]))
+
+
+def synthetic_followup_rates(profiles=None):
+    """{(context, scale): {trigger key: FollowupRate}} under the workload generator's profiles."""
+    profiles = profiles or DEFAULT_PROFILES
+    rates = {}
+    for context in CONTEXT_CODES:
+        profile = profiles.get(context, ContextProfile())
+        for scale in SCALE_CODES:
+            rates[(context, scale)] = {
+                trigger: FollowupRate(float(_step_probabilities(profile.key_means.get(trigger, profile.answer_mean), profile.answer_spread) @ counts), int(counts.max()))
+                for trigger, counts in new_followups(context, scale).items()
+            }
+    return rates
+
+
+def history_followup_rates(record_file, min_answers=MIN_HISTORY_ANSWERS, max_records=MAX_HISTORY_RECORDS):
+    """Rates measured from the newest `max_records` sessions of a record file (None = all), for triggers answered at least `min_answers` times."""
+    records = open_records(record_file)
+    first = 0 if max_records is None else max(0, len(records) - max_records)
+    histogram = np.zeros((len(CONTEXT_CODES), len(SCALE_CODES), len(SCALE_ANSWER_KEYS), 11), dtype=np.int64)
+    for start in range(first, len(records), _HISTORY_CHUNK):
+        block = records[start : start + _HISTORY_CHUNK]
+        answers = np.asarray(block["answers"])
+        rows, columns = np.nonzero(~np.isnan(answers))
+        steps = np.rint(answers[rows, columns] * 10).astype(np.int64)
+        np.add.at(histogram, (block["context"][rows], block["scale"][rows], columns, steps), 1)
+
+    rates = {}
+    for context_code, context in enumerate(CONTEXT_CODES):
+        for scale_code, scale in enumerate(SCALE_CODES):
+            cell = {}
+            for trigger, counts in new_followups(context, scale).items():
+                counted = histogram[context_code, scale_code, _SCALE_INDEX[trigger]]
+                if counted.sum() >= min_answers:
+                    cell[trigger] = FollowupRate(float(counted @ counts / counted.sum()), int(counts.max()))
+            if cell:
+                rates[(context, scale)] = cell
+    return rates
+
+
+def use_history(record_file, min_answers=MIN_HISTORY_ANSWERS, max_records=MAX_HISTORY_RECORDS):
+    """Prefer rates measured in the newest records of `record_file` over the synthetic ones for new wizards."""
+    rates = synthetic_followup_rates()
+    for cell, measured in history_followup_rates(record_file, min_answers, max_records).items():
+        rates[cell].update(measured)
+    _RATES.clear()
+    _RATES.update(rates)
+
+
+def followup_rates(context, scale):
+    """Shared {trigger key: FollowupRate} for one (context, scale)."""
+    if not _RATES:
+        _RATES.update(synthetic_followup_rates())
+    return _RATES[(context, scale)]
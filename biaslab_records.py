@@ -0,0 +1,215 @@
+"""Compact binary log of full sessions, memory-mappable for bulk re-scoring.
+
+Every session is one fixed-width record (RECORD_DTYPE): float32 slider answers in
+SCALE_ANSWER_KEYS order and option scores in OPTION_CRITERIA_KEYS order (NaN = not
+asked, for both), the signal map, the
+verdict, and the detected biases as a bitmask in BIAS_RULES order. Variable-length text
+(decision, option labels, notes) goes to a sidecar file as length-prefixed UTF-8, and the
+record keeps its offset. Both files are append-only; the record file maps straight into
+a numpy array, so historical sessions re-score at disk bandwidth with new weights.
+"""
+
+import datetime
+import os
+import struct
+
+import numpy as np
+
+from biaslab_engine import (
+    BIAS_RULES,
+    CONTEXT_KEYWORDS,
+    DEFAULT_ENGINE,
+    OPTION_CRITERIA_KEYS,
+    SCALE_ANSWER_KEYS,
+    TEXT_ANSWER_KEYS,
+)
+from biaslab_vector import score_batch
+
+RECORD_MAGIC = b"BLR1"
+HEADER = struct.Struct("<4sII")  # magic, format version, record size
+HEADER_SIZE = 16
+FORMAT_VERSION = 1
+
+CONTEXT_CODES = tuple(CONTEXT_KEYWORDS) + ("generic",)
+SCALE_CODES = ("small", "standard", "major")
+BIAS_NAMES = tuple(rule["name"] for rule in BIAS_RULES)
+SIGNAL_KEYS = ("Bias Pressure", "Foresight Gap", "Fairness Risk", "Weak Choice Penalty", "Low Evidence Penalty")
+# Sidecar text fields of one record, in order.
+TEXT_FIELDS = ("decision", "option_a", "option_b") + tuple(TEXT_ANSWER_KEYS)
+
+RECORD_DTYPE = np.dtype(
+    [
+        ("timestamp", "<f8"),
+        ("notes_offset", "<u8"),
+        ("notes_length", "<u4"),
+        ("biases", "<u2"),
+        ("context", "u1"),
+        ("scale", "u1"),
+        ("leaning", "u1"),
+        ("practical_preference", "u1"),
+        ("answers", "<f4", (len(SCALE_ANSWER_KEYS),)),
+        ("option_a", "<f4", (len(OPTION_CRITERIA_KEYS),)),
+        ("option_b", "<f4", (len(OPTION_CRITERIA_KEYS),)),
+        ("signals", "<f4", (len(SIGNAL_KEYS),)),
+        ("total_risk", "<f4"),
+    ]
+)
+
+_LENGTH = struct.Struct("<I")
+_MISSING = 0xFFFFFFFF
+_RESCORE_CHUNK = 1 << 20
+
+
+def records_file(log_file):
+    """Binary record file kept next to a session log."""
+    return os.path.splitext(log_file)[0] + ".bin"
+
+
+def notes_file(record_file):
+    return os.path.splitext(record_file)[0] + ".notes"
+
+
+# ==========================================================
+# SECTION 1: ENCODING AND APPENDING
+# ==========================================================
+
+
+def encode_notes(result):
+    """Length-prefixed UTF-8 blob of TEXT_FIELDS; absent notes are stored as 0xFFFFFFFF."""
+    values = {"decision": result.decision, "option_a": result.option_a, "option_b": result.option_b}
+    parts = []
+    for field in TEXT_FIELDS:
+        value = values.get(field, result.answers.get(field))
+        if value is None:
+            parts.append(_LENGTH.pack(_MISSING))
+        else:
+            data = str(value).encode("utf-8")
+            parts.append(_LENGTH.pack(len(data)) + data)
+    return b"".join(parts)
+
+
+def encode_record(result, timestamp, notes_offset, notes_length):
+    """One RECORD_DTYPE row for an AnalysisResult."""
+    record = np.zeros(1, dtype=RECORD_DTYPE)
+    row = record[0]
+    row["timestamp"] = timestamp
+    row["notes_offset"] = notes_offset
+    row["notes_length"] = notes_length
+    detected = {bias["name"] for bias in result.detected_biases}
+    row["biases"] = sum(1 << index for index, name in enumerate(BIAS_NAMES) if name in detected)
+    row["context"] = CONTEXT_CODES.index(result.context)
+    row["scale"] = SCALE_CODES.index(result.scale)
+    row["leaning"] = 0 if result.chosen_key == "A" else 1
+    row["practical_preference"] = result.practical_preference
+    row["answers"] = [result.answers.get(key, np.nan) for key in SCALE_ANSWER_KEYS]
+    scores_a = result.option_scores.get("A", {})
+    scores_b = result.option_scores.get("B", {})
+    row["option_a"] = [scores_a.get(key, np.nan) for key in OPTION_CRITERIA_KEYS]
+    row["option_b"] = [scores_b.get(key, np.nan) for key in OPTION_CRITERIA_KEYS]
+    row["signals"] = [result.signal_map[key] for key in SIGNAL_KEYS]
+    row["total_risk"] = result.total_risk
+    return record.tobytes()
+
+
+def append_record(result, record_file, timestamp=None):
+    """Append one session. Notes are written first, so a record never points past its sidecar; a torn trailing record is dropped first."""
+    if timestamp is None:
+        timestamp = datetime.datetime.now().timestamp()
+    elif isinstance(timestamp, str):
+        timestamp = datetime.datetime.fromisoformat(timestamp).timestamp()
+
+    notes = encode_notes(result)
+    with open(notes_file(record_file), "ab") as file:
+        offset = file.tell()
+        file.write(notes)
+
+    size = os.path.getsize(record_file) if os.path.exists(record_file) else 0
+    with open(record_file, "ab") as file:
+        if size < HEADER_SIZE:
+            file.truncate(0)
+            file.write(HEADER.pack(RECORD_MAGIC, FORMAT_VERSION, RECORD_DTYPE.itemsize).ljust(HEADER_SIZE, b"\0"))
+        elif (size - HEADER_SIZE) % RECORD_DTYPE.itemsize:
+            # Drop a torn tail (which open_records skips) so the new record stays aligned.
+            file.truncate(size - (size - HEADER_SIZE) % RECORD_DTYPE.itemsize)
+        file.write(encode_record(result, timestamp, offset, len(notes)))
+
+
+# ==========================================================
+# SECTION 2: MEMORY-MAPPED READING AND BULK RE-SCORING
+# ==========================================================
+
+
+def open_records(record_file):
+    """Read-only memmap of every complete record (a torn trailing record is ignored)."""
+    if not os.path.exists(record_file) or os.path.getsize(record_file) < HEADER_SIZE:
+        return np.zeros(0, dtype=RECORD_DTYPE)
+    with open(record_file, "rb") as file:
+        magic, version, record_size = HEADER.unpack(file.read(HEADER.size))
+    if magic != RECORD_MAGIC or record_size != RECORD_DTYPE.itemsize:
+        raise ValueError(f"{record_file} is not a version {FORMAT_VERSION} BiasLab record file.")
+    count = (os.path.getsize(record_file) - HEADER_SIZE) // RECORD_DTYPE.itemsize
+    if count == 0:
+        return np.zeros(0, dtype=RECORD_DTYPE)
+    return np.memmap(record_file, dtype=RECORD_DTYPE, mode="r", offset=HEADER_SIZE, shape=(count,))
+
+
+def read_notes(record_file, record):
+    """{text field: value} for one record; absent notes are left out."""
+    with open(notes_file(record_file), "rb") as file:
+        file.seek(int(record["notes_offset"]))
+        return _decode_notes(file.read(int(record["notes_length"])))
+
+
+def iter_notes(record_file):
+    """Yield read_notes() of every record in order, through one open file and one blob at a time."""
+    records = open_records(record_file)
+    if not len(records):
+        return
+    with open(notes_file(record_file), "rb") as file:
+        for start in range(0, len(records), _RESCORE_CHUNK):
+            block = records[start : start + _RESCORE_CHUNK]
+            for offset, length in zip(block["notes_offset"].tolist(), block["notes_length"].tolist()):
+                file.seek(offset)
+                yield _decode_notes(file.read(length))
+
+
+def _decode_notes(blob):
+    notes = {}
+    offset = 0
+    for field in TEXT_FIELDS:
+        (length,) = _LENGTH.unpack_from(blob, offset)
+        offset += _LENGTH.size
+        if length != _MISSING:
+            notes[field] = blob[offset : offset + length].decode("utf-8")
+            offset += length
+    return notes
+
+
+def bias_names(mask):
+    return [name for index, name in enumerate(BIAS_NAMES) if mask & (1 << index)]
+
+
+def _widen(values):
+    """float32 -> float64, snapping slider steps back to the exact doubles the engine used (0.7, not 0.69999999)."""
+    return np.round(values.astype(float), 6)
+
+
+def rescore(record_file, engine=DEFAULT_ENGINE):
+    """Re-score every stored session with an engine's weights, in memmap-sized chunks.
+
+    Returns score_batch arrays over all records. Bias rules are not re-run; the notes they
+    also read can be scored in bulk with biaslab_text.iter_record_signals.
+    """
+    records = open_records(record_file)
+    chunks = []
+    for start in range(0, len(records), _RESCORE_CHUNK):
+        block = records[start : start + _RESCORE_CHUNK]
+        lean_a = (block["leaning"] == 0)[:, None]
+        option_a = _widen(block["option_a"])
+        option_b = _widen(block["option_b"])
+        chosen = np.where(lean_a, option_a, option_b)
+        other = np.where(lean_a, option_b, option_a)
+        chunks.append(score_batch(_widen(block["answers"]), chosen, other, engine.rational_weights, engine.distortion_weights))
+    if not chunks:
+        return score_batch(np.zeros((0, len(SCALE_ANSWER_KEYS))), np.zeros((0, len(OPTION_CRITERIA_KEYS))), np.zeros((0, len(OPTION_CRITERIA_KEYS))))
+    return {key: np.concatenate([chunk[key] for chunk in chunks]) for key in chunks[0]}
@@ -0,0 +1,224 @@
+"""Persistent re-check reminders: a heap of due times backed by an append-only journal.
+
+The report tells users to wait 24 hours and answer again (when bias pressure is high) or
+to re-run BiasLab later; every completed session schedules that re-check here. Pending
+reminders live in a binary heap of (due, id) with their journal offsets, so scheduling,
+firing and cancelling are O(log n) and only the fired reminder's record is read back
+from disk. Cancelled and fired reminders are dropped from the heap lazily, and the
+journal is compacted once dead records outnumber live ones.
+"""
+
+import heapq
+import os
+import struct
+import threading
+import time
+from collections import namedtuple
+
+from biaslab_engine import Decision
+from biaslab_report import ACTION_LINES
+
+REMINDER_FILE = "biaslab_reminders.journal"
+REMINDER_MAGIC = b"BLQ1"
+
+# Every record is <kind:u8><payload length:u32> followed by the payload, as in biaslab_journal.
+RECORD_HEADER = struct.Struct("<BI")
+RECORD_ADD = 1
+RECORD_DONE = 2
+
+# Add payload starts with <reminder id:u64><due timestamp:f64><leaning:1 byte>, then the texts.
+ADD_HEADER = struct.Struct("<Qdc")
+DONE_PAYLOAD = struct.Struct("<Q")
+_LENGTH = struct.Struct("<I")
+
+COOLDOWN_S = 24 * 60 * 60
+RERUN_S = 3 * 24 * 60 * 60
+COMPACT_MIN_DEAD = 1024
+
+Reminder = namedtuple("Reminder", ["reminder_id", "due", "decision"])
+
+_PRESSURE_THRESHOLD = next(threshold for key, threshold, _ in ACTION_LINES if key == "Bias Pressure")
+
+
+def recheck_delay(result):
+    """Seconds until a result should be re-checked: 24 hours when the report advises a cool-down, else RERUN_S."""
+    return COOLDOWN_S if result.signal_map["Bias Pressure"] >= _PRESSURE_THRESHOLD else RERUN_S
+
+
+# ==========================================================
+# SECTION 1: RECORD ENCODING
+# ==========================================================
+
+
+def _pack_text(text):
+    data = text.encode("utf-8")
+    return _LENGTH.pack(len(data)) + data
+
+
+def _unpack_text(payload, offset):
+    (length,) = _LENGTH.unpack_from(payload, offset)
+    start = offset + _LENGTH.size
+    return payload[start : start + length].decode("utf-8"), start + length
+
+
+def encode_add(reminder_id, due, decision):
+    payload = ADD_HEADER.pack(reminder_id, due, decision.leaning.encode("ascii")[:1]) + _pack_text(decision.text) + _pack_text(decision.option_a) + _pack_text(decision.option_b)
+    return RECORD_HEADER.pack(RECORD_ADD, len(payload)) + payload
+
+
+def encode_done(reminder_id):
+    return RECORD_HEADER.pack(RECORD_DONE, DONE_PAYLOAD.size) + DONE_PAYLOAD.pack(reminder_id)
+
+
+def decode_add(payload):
+    reminder_id, due, leaning = ADD_HEADER.unpack_from(payload)
+    text, offset = _unpack_text(payload, ADD_HEADER.size)
+    option_a, offset = _unpack_text(payload, offset)
+    option_b, _ = _unpack_text(payload, offset)
+    return Reminder(reminder_id, due, Decision(text, option_a, option_b, leaning.decode("ascii")))
+
+
+def iter_records(file_name):
+    """Yield (kind, payload offset, payload) for every complete record; a torn tail ends the scan."""
+    with open(file_name, "rb") as file:
+        if file.read(len(REMINDER_MAGIC)) != REMINDER_MAGIC:
+            return
+        while True:
+            header = file.read(RECORD_HEADER.size)
+            if len(header) < RECORD_HEADER.size:
+                return
+            kind, length = RECORD_HEADER.unpack(header)
+            offset = file.tell()
+            payload = file.read(length)
+            if len(payload) < length:
+                return
+            yield kind, offset, payload
+
+
+# ==========================================================
+# SECTION 2: PERSISTENT PRIORITY QUEUE
+# ==========================================================
+
+
+class ReminderQueue:
+    """Thread-safe persistent min-heap of re-check reminders."""
+
+    def __init__(self, file_name=REMINDER_FILE, clock=time.time):
+        self.file_name = file_name
+        self.clock = clock
+        self._lock = threading.Lock()
+        self._heap = []
+        self._offsets = {}  # live reminder id -> payload offset of its add record
+        self._dead = 0
+        self._next_id = 1
+        self._load()
+
+    def __len__(self):
+        return len(self._offsets)
+
+    def _load(self):
+        if not os.path.exists(self.file_name) or os.path.getsize(self.file_name) < len(REMINDER_MAGIC):
+            with open(self.file_name, "wb") as file:
+                file.write(REMINDER_MAGIC)
+            return
+        end = len(REMINDER_MAGIC)
+        for kind, offset, payload in iter_records(self.file_name):
+            end = offset + len(payload)
+            if kind == RECORD_ADD:
+                reminder_id, due, _ = ADD_HEADER.unpack_from(payload)
+                self._offsets[reminder_id] = offset
+                self._heap.append((due, reminder_id))
+                self._next_id = max(self._next_id, reminder_id + 1)
+            elif kind == RECORD_DONE:
+                (reminder_id,) = DONE_PAYLOAD.unpack(payload)
+                if self._offsets.pop(reminder_id, None) is not None:
+                    self._dead += 2
+        if end < os.path.getsize(self.file_name):
+            # Drop a torn tail so new records do not land behind it.
+            with open(self.file_name, "r+b") as file:
+                file.truncate(end)
+        self._heap = [entry for entry in self._heap if entry[1] in self._offsets]
+        heapq.heapify(self._heap)
+        self._maybe_compact()
+
+    def _append(self, record):
+        with open(self.file_name, "ab") as file:
+            offset = file.tell() + RECORD_HEADER.size
+            file.write(record)
+        return offset
+
+    def schedule(self, decision, due):
+        """Persist a reminder to re-check `decision` at timestamp `due`; returns its ID."""
+        with self._lock:
+            reminder_id = self._next_id
+            self._next_id += 1
+            self._offsets[reminder_id] = self._append(encode_add(reminder_id, due, decision))
+            heapq.heappush(self._heap, (due, reminder_id))
+            return reminder_id
+
+    def schedule_recheck(self, result):
+        """Schedule the re-check a finished AnalysisResult's report asks for."""
+        decision = Decision(result.decision, result.option_a, result.option_b, result.chosen_key)
+        return self.schedule(decision, self.clock() + recheck_delay(result))
+
+    def cancel(self, reminder_id):
+        with self._lock:
+            self._retire(reminder_id)
+
+    def _retire(self, reminder_id):
+        if self._offsets.pop(reminder_id, None) is None:
+            return
+        self._append(encode_done(reminder_id))
+        self._dead += 2
+        self._maybe_compact()
+
+    def _prune(self):
+        """Drop heap entries of cancelled reminders from the top."""
+        while self._heap and self._heap[0][1] not in self._offsets:
+            heapq.heappop(self._heap)
+
+    def next_due(self):
+        """Due timestamp of the earliest pending reminder, or None."""
+        with self._lock:
+            self._prune()
+            return self._heap[0][0] if self._heap else None
+
+    def pop_due(self, now=None):
+        """Fire the earliest reminder due by `now` (default: the clock): retire it and return it, or None."""
+        now = self.clock() if now is None else now
+        with self._lock:
+            self._prune()
+            if not self._heap or self._heap[0][0] > now:
+                return None
+            _, reminder_id = heapq.heappop(self._heap)
+            reminder = self._read(self._offsets[reminder_id])
+            self._retire(reminder_id)
+            return reminder
+
+    def _read(self, offset):
+        with open(self.file_name, "rb") as file:
+            file.seek(offset - RECORD_HEADER.size)
+            _, length = RECORD_HEADER.unpack(file.read(RECORD_HEADER.size))
+            return decode_add(file.read(length))
+
+    def _maybe_compact(self):
+        if self._dead >= COMPACT_MIN_DEAD and self._dead > len(self._offsets):
+            self._compact()
+
+    def _compact(self):
+        """Rewrite the journal with only the pending reminders' add records."""
+        temporary = self.file_name + ".tmp"
+        offsets = {}
+        with open(self.file_name, "rb") as source, open(temporary, "wb") as target:
+            target.write(REMINDER_MAGIC)
+            for reminder_id, offset in sorted(self._offsets.items(), key=lambda item: item[1]):
+                source.seek(offset - RECORD_HEADER.size)
+                header = source.read(RECORD_HEADER.size)
+                _, length = RECORD_HEADER.unpack(header)
+                offsets[reminder_id] = target.tell() + RECORD_HEADER.size
+                target.write(header + source.read(length))
+        os.replace(temporary, self.file_name)
+        self._offsets = offsets
+        self._heap = [entry for entry in self._heap if entry[1] in offsets]
+        heapq.heapify(self._heap)
+        self._dead = 0
@@ -0,0 +1,329 @@
+import html
+import sys
+from functools import lru_cache
+from operator import itemgetter
+
+
+# ==========================================================
+# SECTION 1: INTERNED REPORT TEXT (HEADERS, BIAS GUIDANCE)
+# ==========================================================
+
+REPORT_TITLE = sys.intern("BiasLab Practical Decision Report")
+
+SECTION_HEADERS = {
+    name: sys.intern(text)
+    for name, text in {
+        "summary": "1) Quick Summary",
+        "reality": "2) Reality Check",
+        "drivers": "3) What is pushing your choice",
+        "biases": "4) Likely Biases",
+        "solutions": "5) What You Should Do Next",
+        "verdict": "6) Plain-English Verdict",
+        "actions": "7) Simple Next Steps",
+        "notes": "8) Your Notes",
+    }.items()
+}
+
+BIAS_GUIDANCE = {
+    name: (sys.intern(reality), sys.intern(action))
+    for name, reality, action in [
+        (
+            "Emotional Reasoning",
+            "Your feelings are so strong they may be driving the choice.",
+            "Wait for emotions to cool down, then re-answer the questions.",
+        ),
+        (
+            "Social Pressure Bias",
+            "Other people may be pushing your choice more than your own values.",
+            "Decide in private first, then compare with outside opinions.",
+        ),
+        (
+            "Sunk Cost Fallacy",
+            "Past time/money may be trapping you in this choice.",
+            "Ask: 'If I started today, would I still choose this?'",
+        ),
+        (
+            "Identity Attachment Bias",
+            "Your self-image may be tied to one option.",
+            "Imagine you are advising a close friend with the same facts.",
+        ),
+        (
+            "Loss Aversion Bias",
+            "Fear of loss may be louder than real upside/downside balance.",
+            "List likely losses and likely gains side by side.",
+        ),
+        (
+            "Novelty Attraction Bias",
+            "Newness/excitement may be making one option look better than it is.",
+            "Re-score options while ignoring excitement and focusing on outcomes.",
+        ),
+        (
+            "Confirmation / Tunnel Vision",
+            "You may be focusing too much on one side and not testing the other.",
+            "Write the strongest argument for the opposite option.",
+        ),
+        (
+            "Outcome Blindness (Optimism Bias)",
+            "You may be underthinking how this could go wrong.",
+            "Write a worst-case story and how you would handle it.",
+        ),
+        (
+            "Fairness Blind Spot",
+            "You may be underweighting how this affects other people.",
+            "List who is affected and how your choice changes their life.",
+        ),
+        (
+            "Weak-Evidence Decision Bias",
+            "Your choice may not be backed by enough real proof yet.",
+            "Collect 2-3 concrete facts before fully committing.",
+        ),
+    ]
+}
+
+REALITY_LINES = (
+    "- Reality: your current option is backed more by real reasons than by pressure.",
+    "- Reality: your current leaning looks more driven by pressure than by real reasons.",
+    "- Reality: the decision is mixed; some reasons are solid, some are shaky.",
+)
+
+VERDICT_LINES = (
+    (
+        "- Your choice of {chosen_label} looks reasonable, not just emotional.",
+        "- It matches your needs, evidence, and fit with your life.",
+    ),
+    ("- Your choice has some good reasons, but there is also strong pressure.",),
+    ("- The other option looks stronger on real reasons; this is a warning sign.",),
+)
+
+ACTION_LINES = (
+    ("Bias Pressure", 0.60, "- Wait 24 hours, then answer the same questions again with a calm mind."),
+    ("Foresight Gap", 0.50, "- Write a best-case and worst-case story for both options."),
+    ("Fairness Risk", 0.50, "- Check if your choice is respectful to everyone involved."),
+    ("Weak Choice Penalty", 0.40, "- Seriously test the other option before committing."),
+)
+
+REPORT_FORMATS = ("text", "markdown", "html")
+
+
+def classify_risk(risk_score):
+    if risk_score < 0.30:
+        return "High Decision Integrity"
+    if risk_score < 0.60:
+        return "Balanced but Needs Reflection"
+    return "Elevated Distortion Risk"
+
+
+# ==========================================================
+# SECTION 2: LINE BUILDERS (ONE PASS PER REPORT)
+# ==========================================================
+
+# Bias name, reality and action as they appear in each format.
+_GUIDANCE_TEXT = {
+    False: {name: (name, reality, action) for name, (reality, action) in BIAS_GUIDANCE.items()},
+    True: {name: (html.escape(name), html.escape(reality), html.escape(action)) for name, (reality, action) in BIAS_GUIDANCE.items()},
+}
+
+
+def _html_escape(text):
+    return html.escape(str(text))
+
+
+@lru_cache(maxsize=64)
+def _html_name(name):
+    """Escaped driver name; the signal names are a small fixed set."""
+    return html.escape(name)
+
+
+_driver_sort_key = itemgetter(1)
+
+
+def _report_sections(values, escape=False):
+    """Header lines and (heading, lines) sections of one report; free text is HTML-escaped when `escape`.
+
+    `values` holds decision, chosen_label, other_label, option_a, option_b, total_risk,
+    integrity, chosen_rational, other_rational, justification_gap, practical_preference,
+    signal_map, detected_biases and answers.
+    """
+    gap = values["justification_gap"]
+    risk = values["total_risk"]
+    signal_map = values["signal_map"]
+    answers = values["answers"]
+    decision, chosen, other = values["decision"], values["chosen_label"], values["other_label"]
+    if escape:
+        decision, chosen, other = _html_escape(decision), _html_escape(chosen), _html_escape(other)
+    guidance = _GUIDANCE_TEXT[escape]
+
+    if gap >= 0.10 and risk <= 0.45:
+        reality = REALITY_LINES[0]
+    elif gap < 0 and risk >= 0.50:
+        reality = REALITY_LINES[1]
+    else:
+        reality = REALITY_LINES[2]
+
+    drivers = []
+    for name, value in sorted(signal_map.items(), key=_driver_sort_key, reverse=True)[:4]:
+        level = "high" if value >= 0.70 else "moderate" if value >= 0.45 else "low"
+        drivers.append(f"- {_html_name(name) if escape else name}: {value:.2f} ({level} impact)")
+
+    biases = values["detected_biases"][:4]
+    if biases:
+        bias_lines = []
+        solution_lines = []
+        for bias in biases:
+            name, reality_text, action = guidance[bias["name"]]
+            bias_lines.append(f"- {name} ({bias['score']:.2f}): {reality_text}")
+            if len(solution_lines) < 3:
+                solution_lines.append(f"- For {name}: {action}")
+    else:
+        bias_lines = ["- No strong bias pattern detected. Still verify real evidence."]
+        solution_lines = ["- Keep your plan, but confirm at least one more real fact first."]
+    solution_lines.append("- Re-run BiasLab after applying the steps above and compare distortion risk change.")
+
+    if values["practical_preference"]:
+        verdict = [VERDICT_LINES[0][0].format(chosen_label=chosen), VERDICT_LINES[0][1]]
+    else:
+        verdict = list(VERDICT_LINES[1 if gap >= 0 else 2])
+
+    actions = [line for key, threshold, line in ACTION_LINES if signal_map[key] > threshold]
+    actions.append("- Re-run BiasLab after you learn 1-2 new facts.")
+
+    notes = []
+    counter_text, reason_a, reason_b = answers.get("counter_text"), answers.get("reason_a"), answers.get("reason_b")
+    if counter_text or reason_a or reason_b:
+        text = _html_escape if escape else str
+        if counter_text:
+            notes.append(f"- Strongest counter-argument captured: {text(counter_text)}")
+        if reason_a:
+            notes.append(f"- Practical reason for {text(values['option_a'])}: {text(reason_a)}")
+        if reason_b:
+            notes.append(f"- Practical reason for {text(values['option_b'])}: {text(reason_b)}")
+
+    header = (f"Decision: {decision}", f"Current leaning: {chosen}", f"Alternative: {other}")
+    sections = (
+        (
+            SECTION_HEADERS["summary"],
+            [
+                f"- Overall signal: {classify_risk(risk)}",
+                f"- Bias risk: {risk:.2f} | Clarity score: {values['integrity']:.2f}",
+                f"- Strength of {chosen}: {values['chosen_rational']:.2f}",
+                f"- Strength of {other}: {values['other_rational']:.2f}",
+                f"- Gap between options: {gap:.2f}",
+            ],
+        ),
+        (SECTION_HEADERS["reality"], [reality, f"- Snapshot: gap between options = {gap:.2f}, bias risk = {risk:.2f}."]),
+        (SECTION_HEADERS["drivers"], drivers),
+        (SECTION_HEADERS["biases"], bias_lines),
+        (SECTION_HEADERS["solutions"], solution_lines),
+        (SECTION_HEADERS["verdict"], verdict),
+        (SECTION_HEADERS["actions"], actions),
+        (SECTION_HEADERS["notes"], notes),
+    )
+    return header, sections
+
+
+# ==========================================================
+# SECTION 3: OUTPUT FORMATS
+# ==========================================================
+
+_TITLE_RULE = "=" * 40
+
+
+def _render_text(header, sections):
+    lines = [REPORT_TITLE, _TITLE_RULE, *header]
+    for heading, body in sections:
+        lines += ("", heading, *body)
+    return "\n".join(lines)
+
+
+def _render_markdown(header, sections):
+    lines = [f"# {REPORT_TITLE}", ""]
+    lines += [f"{line}  " for line in header]
+    lines.append("")
+    for heading, body in sections:
+        lines.append(f"## {heading}")
+        lines.append("")
+        lines += body
+        lines.append("")
+    return "\n".join(lines)
+
+
+_HTML_TITLE = f"<h1>{html.escape(REPORT_TITLE)}</h1>"
+_HTML_HEADINGS = {heading: f"<h2>{html.escape(heading)}</h2>" for heading in SECTION_HEADERS.values()}
+
+
+def _render_html(header, sections):
+    parts = ["<article class=\"biaslab-report\">", _HTML_TITLE]
+    parts += [f"<p>{line}</p>" for line in header]
+    for heading, body in sections:
+        parts.append("<section>")
+        parts.append(_HTML_HEADINGS[heading])
+        if body:
+            parts.append("<ul>")
+            parts += [f"<li>{line[2:]}</li>" for line in body]
+            parts.append("</ul>")
+        parts.append("</section>")
+    parts.append("</article>")
+    return "\n".join(parts)
+
+
+_RENDERERS = {
+    "text": _render_text,
+    "markdown": _render_markdown,
+    "html": _render_html,
+}
+
+
+def render_report(values, fmt="text"):
+    """Render one report from plain session values (see _report_sections) as text, Markdown or HTML."""
+    if fmt not in _RENDERERS:
+        raise ValueError(f"Unknown report format: {fmt}")
+    return _RENDERERS[fmt](*_report_sections(values, fmt == "html"))
+
+
+# ==========================================================
+# SECTION 4: STREAMING BATCH OUTPUT
+# ==========================================================
+
+_DOCUMENT_FRAMES = {
+    "text": ("", "\n\n" + "-" * 40 + "\n\n", "\n"),
+    "markdown": ("", "\n---\n\n", ""),
+    "html": (
+        "<!DOCTYPE html>\n<html>\n<head>\n<meta charset=\"utf-8\">\n<title>BiasLab Reports</title>\n</head>\n<body>\n",
+        "\n",
+        "\n</body>\n</html>\n",
+    ),
+}
+
+
+def iter_reports(values_iter, fmt="text"):
+    """Yield document chunks for many reports; holds one report in memory at a time."""
+    prefix, separator, suffix = _DOCUMENT_FRAMES[fmt]
+    if prefix:
+        yield prefix
+    first = True
+    for values in values_iter:
+        if not first:
+            yield separator
+        first = False
+        yield render_report(values, fmt)
+    yield suffix
+
+
+def export_reports(values_iter, file_name, fmt=None):
+    """Stream reports into a .txt, .md or .html file. Returns the number of reports written."""
+    if fmt is None:
+        lowered = file_name.lower()
+        fmt = "html" if lowered.endswith((".html", ".htm")) else "markdown" if lowered.endswith(".md") else "text"
+
+    count = 0
+
+    def counted():
+        nonlocal count
+        for values in values_iter:
+            count += 1
+            yield values
+
+    with open(file_name, "w", encoding="utf-8") as file:
+        for chunk in iter_reports(counted(), fmt):
+            file.write(chunk)
+    return count
@@ -0,0 +1,368 @@
+"""Session log persistence for BiasLab analysis results.
+
+The log is one active CSV plus rotated, compressed segments listed in a manifest with
+their time ranges. Readers go through read_sessions, which yields the segments and the
+active file as one logical log.
+"""
+
+import csv
+import datetime
+import gzip
+import io
+import json
+import os
+from collections import namedtuple
+
+from biaslab_records import append_record, records_file
+from biaslab_threads import DecisionThreads
+
+try:
+    import zstandard
+except ImportError:  # zstd segments are optional; gzip is always available.
+    zstandard = None
+
+SESSION_LOG = "biaslab_sessions.csv"
+
+SESSION_FIELDS = [
+    "timestamp",
+    "decision",
+    "chosen_option",
+    "other_option",
+    "distortion_risk",
+    "integrity_score",
+    "chosen_rational",
+    "other_rational",
+    "justification_gap",
+    "practical_preference",
+    "context",
+    "scale",
+    "detected_biases",
+]
+
+# Bias names in the detected_biases column are joined with this separator.
+BIAS_SEPARATOR = ";"
+
+# Rotate the active log once it passes `max_bytes`, or (with `daily`) when its first
+# session is from an earlier day. `codec` is "gzip" or "zstd".
+LogRotation = namedtuple("LogRotation", ["max_bytes", "daily", "codec"], defaults=(4 * 1024 * 1024, True, "gzip"))
+
+DEFAULT_ROTATION = LogRotation()
+MANIFEST_FILE = "manifest.json"
+COMPACT_TARGET_ROWS = 100_000
+
+_SEGMENT_SUFFIXES = {"gzip": ".csv.gz", "zstd": ".csv.zst"}
+
+
+# ==========================================================
+# SECTION 1: SESSION LOG WRITES
+# ==========================================================
+
+
+def session_row(result, timestamp):
+    """CSV row (in SESSION_FIELDS order) for one AnalysisResult."""
+    return [
+        timestamp,
+        result.decision,
+        result.chosen_label,
+        result.other_label,
+        round(result.total_risk, 4),
+        round(result.integrity, 4),
+        round(result.chosen_rational, 4),
+        round(result.other_rational, 4),
+        round(result.justification_gap, 4),
+        result.practical_preference,
+        result.context,
+        result.scale,
+        BIAS_SEPARATOR.join(bias["name"] for bias in result.detected_biases),
+    ]
+
+
+# Decision-thread indexes of logs that have been read, kept current by save_session.
+_THREAD_INDEXES = {}
+
+
+def save_session(result, file_name=SESSION_LOG, rotation=DEFAULT_ROTATION, full_record=True):
+    """Append one AnalysisResult to the session log, writing the header for a new file.
+
+    With `full_record`, the complete session (answers, option scores, signals, biases,
+    notes) is also appended to the binary record file next to the log (biaslab_records).
+    """
+    now = datetime.datetime.now().isoformat(timespec="seconds")
+    if _needs_rotation(file_name, now, rotation):
+        rotate_log(file_name, rotation.codec if rotation else "gzip")
+
+    needs_header = not os.path.exists(file_name)
+    with open(file_name, "a", newline="", encoding="utf-8") as file:
+        writer = csv.writer(file)
+        if needs_header:
+            writer.writerow(SESSION_FIELDS)
+        writer.writerow(session_row(result, now))
+    if full_record:
+        append_record(result, records_file(file_name), now)
+
+    threads = _THREAD_INDEXES.get(os.path.abspath(file_name))
+    if threads is not None:
+        threads.add(result.decision, result.chosen_label, result.other_label, now)
+
+
+# ==========================================================
+# SECTION 2: SEGMENTS, MANIFEST AND ROTATION
+# ==========================================================
+
+
+def segment_dir(file_name=SESSION_LOG):
+    """Directory holding the rotated segments and manifest of a session log."""
+    return os.path.splitext(file_name)[0] + ".segments"
+
+
+def read_manifest(file_name=SESSION_LOG):
+    path = os.path.join(segment_dir(file_name), MANIFEST_FILE)
+    if not os.path.exists(path):
+        return {"next_segment": 1, "segments": []}
+    with open(path, encoding="utf-8") as file:
+        return json.load(file)
+
+
+def _write_manifest(file_name, manifest):
+    path = os.path.join(segment_dir(file_name), MANIFEST_FILE)
+    with open(path + ".tmp", "w", encoding="utf-8") as file:
+        json.dump(manifest, file, indent=1)
+    os.replace(path + ".tmp", path)
+
+
+def _open_segment(path, codec, mode):
+    """Text stream over a compressed segment; mode is "r" or "w"."""
+    if codec == "csv":
+        return open(path, mode, newline="", encoding="utf-8")
+    if codec == "gzip":
+        return gzip.open(path, mode + "t", newline="", encoding="utf-8")
+    if codec == "zstd":
+        if zstandard is None:
+            raise ValueError("zstd segments need the 'zstandard' package (pip install zstandard).")
+        raw = open(path, mode + "b")
+        if mode == "r":
+            stream = zstandard.ZstdDecompressor().stream_reader(raw, closefd=True)
+        else:
+            stream = zstandard.ZstdCompressor().stream_writer(raw, closefd=True)
+        return io.TextIOWrapper(stream, newline="", encoding="utf-8")
+    raise ValueError(f"Unknown segment codec: {codec!r}")
+
+
+_ACTIVE_HEADS = {}
+
+
+def _active_head(file_name):
+    """(header columns, date of the first logged session or "") of the active file."""
+    key = os.path.abspath(file_name)
+    if key not in _ACTIVE_HEADS:
+        with open(file_name, newline="", encoding="utf-8") as file:
+            reader = csv.reader(file)
+            fields = next(reader, None) or []
+            row = next(reader, None)
+        _ACTIVE_HEADS[key] = (fields, row[0][:10] if row else "")
+    return _ACTIVE_HEADS[key]
+
+
+def _needs_rotation(file_name, now, rotation):
+    """Rotate on the policy's size or day limits, and always when the columns have changed."""
+    if not os.path.exists(file_name):
+        _ACTIVE_HEADS.pop(os.path.abspath(file_name), None)
+        return False
+    fields, first_day = _active_head(file_name)
+    if fields != SESSION_FIELDS:
+        return True
+    if rotation is None:
+        return False
+    if os.path.getsize(file_name) >= rotation.max_bytes:
+        return True
+    return bool(rotation.daily and first_day and first_day != now[:10])
+
+
+def _write_segment(file_name, manifest, rows_iter, fields, codec):
+    """Write rows to a new segment and return its manifest entry (manifest not saved yet)."""
+    name = f"{os.path.splitext(os.path.basename(file_name))[0]}-{manifest['next_segment']:06d}{_SEGMENT_SUFFIXES[codec]}"
+    manifest["next_segment"] += 1
+    path = os.path.join(segment_dir(file_name), name)
+    rows = 0
+    first = last = ""
+    with _open_segment(path, codec, "w") as file:
+        writer = csv.writer(file)
+        writer.writerow(fields)
+        for row in rows_iter:
+            writer.writerow(row)
+            first = first or row[0]
+            last = row[0]
+            rows += 1
+    return {"file": name, "codec": codec, "fields": list(fields), "rows": rows, "first": first, "last": last, "bytes": os.path.getsize(path)}
+
+
+def _pending_file(file_name):
+    return os.path.join(segment_dir(file_name), os.path.basename(file_name) + ".rotating")
+
+
+def rotate_log(file_name=SESSION_LOG, codec="gzip"):
+    """Move the active log into a compressed segment and record it in the manifest.
+
+    The active file is first renamed aside, so a crash mid-rotation leaves a ".rotating"
+    file that the next rotation finishes instead of losing or duplicating rows.
+    """
+    if codec not in _SEGMENT_SUFFIXES:
+        raise ValueError(f"Unknown segment codec: {codec!r}")
+    os.makedirs(segment_dir(file_name), exist_ok=True)
+    pending = _pending_file(file_name)
+    if not os.path.exists(pending):
+        if not os.path.exists(file_name):
+            return None
+        os.replace(file_name, pending)
+    _ACTIVE_HEADS.pop(os.path.abspath(file_name), None)
+
+    manifest = read_manifest(file_name)
+    source = os.stat(pending)
+    source_id = [source.st_size, source.st_mtime_ns]
+    if manifest["segments"] and manifest["segments"][-1].get("source") == source_id:
+        # Crashed after the manifest was written; the rows are already in a segment.
+        os.remove(pending)
+        return manifest["segments"][-1]
+
+    with open(pending, newline="", encoding="utf-8") as file:
+        reader = csv.reader(file)
+        fields = next(reader, None)
+        entry = _write_segment(file_name, manifest, reader, fields, codec) if fields else None
+    if entry is not None and entry["rows"]:
+        entry["source"] = source_id
+        manifest["segments"].append(entry)
+        _write_manifest(file_name, manifest)
+    elif entry is not None:
+        os.remove(os.path.join(segment_dir(file_name), entry["file"]))
+    os.remove(pending)
+    return entry
+
+
+def compact_log(file_name=SESSION_LOG, target_rows=COMPACT_TARGET_ROWS, codec="gzip"):
+    """Merge runs of consecutive small segments (same columns) into segments of up to `target_rows`.
+
+    Returns how many segments were merged away. Log order is preserved.
+    """
+    manifest = read_manifest(file_name)
+    groups = []
+    for entry in manifest["segments"]:
+        group = groups[-1] if groups else None
+        if group and group[0]["fields"] == entry["fields"] and sum(item["rows"] for item in group) + entry["rows"] <= target_rows:
+            group.append(entry)
+        else:
+            groups.append([entry])
+
+    merged_away = 0
+    segments = []
+    replaced = []
+    for group in groups:
+        if len(group) == 1:
+            segments.append(group[0])
+            continue
+
+        def group_rows(group=group):
+            for item in group:
+                with _open_segment(os.path.join(segment_dir(file_name), item["file"]), item["codec"], "r") as file:
+                    reader = csv.reader(file)
+                    next(reader, None)
+                    yield from reader
+
+        segments.append(_write_segment(file_name, manifest, group_rows(), group[0]["fields"], codec))
+        replaced.extend(group)
+        merged_away += len(group) - 1
+
+    if replaced:
+        manifest["segments"] = segments
+        _write_manifest(file_name, manifest)
+        for item in replaced:
+            os.remove(os.path.join(segment_dir(file_name), item["file"]))
+    return merged_away
+
+
+# ==========================================================
+# SECTION 3: LOGICAL LOG READERS
+# ==========================================================
+
+
+def log_sources(file_name=SESSION_LOG, start=None, end=None):
+    """(path, codec) of every part of the logical log, oldest first, skipping segments outside start/end."""
+    sources = []
+    for entry in read_manifest(file_name)["segments"]:
+        if (start and entry["last"] < start) or (end and entry["first"] > end):
+            continue
+        sources.append((os.path.join(segment_dir(file_name), entry["file"]), entry["codec"]))
+    # A rotation interrupted by a crash leaves rows in the pending file until the next one.
+    for path in (_pending_file(file_name), file_name):
+        if os.path.exists(path):
+            sources.append((path, "csv"))
+    return sources
+
+
+def read_source(source, start=None, end=None):
+    """Yield the sessions of one log part from log_sources as dicts keyed by its own header."""
+    path, codec = source
+    with _open_segment(path, codec, "r") as file:
+        yield from _rows_between(csv.DictReader(file), start, end)
+
+
+def read_sessions(file_name=SESSION_LOG, start=None, end=None):
+    """Yield every logged session, oldest first, as a dict keyed by its column names.
+
+    Rotated segments and the active file read as one log. `start` / `end` are ISO
+    timestamps (inclusive); segments whose time range falls outside are never opened.
+    Rows logged before a column was added simply lack that key.
+    """
+    for source in log_sources(file_name, start, end):
+        yield from read_source(source, start, end)
+
+
+def _rows_between(rows, start, end):
+    if start is None and end is None:
+        yield from rows
+        return
+    for row in rows:
+        if (start and row["timestamp"] < start) or (end and row["timestamp"] > end):
+            continue
+        yield row
+
+
+def thread_index(file_name=SESSION_LOG):
+    """DecisionThreads for a session log: built from the log once, then updated on every save."""
+    key = os.path.abspath(file_name)
+    threads = _THREAD_INDEXES.get(key)
+    if threads is None:
+        threads = DecisionThreads()
+        for row in read_sessions(file_name):
+            threads.add(row["decision"], row["chosen_option"], row["other_option"], row["timestamp"])
+        _THREAD_INDEXES[key] = threads
+    return threads
+
+
+def latest_sessions(file_name=SESSION_LOG):
+    """Yield only the most recent logged run of each decision thread, in log order."""
+    keep = set(thread_index(file_name).latest_rows())
+    for row_number, row in enumerate(read_sessions(file_name)):
+        if row_number in keep:
+            yield row
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Rotate or compact the BiasLab session log.")
+    parser.add_argument("action", choices=["rotate", "compact", "manifest"])
+    parser.add_argument("--log", default=SESSION_LOG)
+    parser.add_argument("--codec", choices=sorted(_SEGMENT_SUFFIXES), default="gzip")
+    parser.add_argument("--target-rows", type=int, default=COMPACT_TARGET_ROWS)
+    args = parser.parse_args()
+
+    if args.action == "rotate":
+        print(rotate_log(args.log, args.codec))
+    elif args.action == "compact":
+        print(f"Merged {compact_log(args.log, args.target_rows, args.codec)} segments.")
+    else:
+        print(json.dumps(read_manifest(args.log), indent=1))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,226 @@
+"""Text signals of free-text answers: concreteness, hedging and emotional language.
+
+Each note is scanned once by a single precompiled regex whose named groups are the
+lexicon categories (numbers with units, named things, hedge phrases, emotive words),
+so scoring is one pass with no per-word dictionary work. Signals are word-density
+scores in 0-1 and feed the text-aware bias rules in biaslab_engine. Scores are memoized
+per text, and the batch helpers hold one chunk of notes at a time.
+"""
+
+import re
+from collections import namedtuple
+from functools import lru_cache
+
+import numpy as np
+
+# ==========================================================
+# SECTION 1: LEXICON AND PER-NOTE SIGNALS
+# ==========================================================
+
+HEDGE_PHRASES = [
+    "maybe",
+    "might",
+    "perhaps",
+    "possibly",
+    "probably",
+    "i guess",
+    "i think",
+    "i feel like",
+    "not sure",
+    "unsure",
+    "kind of",
+    "sort of",
+    "somewhat",
+    "hopefully",
+    "seems",
+    "could be",
+]
+
+EMOTIVE_WORDS = [
+    "love",
+    "loved",
+    "hate",
+    "feel",
+    "feels",
+    "feeling",
+    "vibe",
+    "vibes",
+    "excited",
+    "exciting",
+    "scared",
+    "afraid",
+    "amazing",
+    "awesome",
+    "cool",
+    "gut",
+    "heart",
+    "happy",
+    "sad",
+    "angry",
+    "worried",
+    "anxious",
+    "obsessed",
+    "dream",
+    "perfect",
+    "fomo",
+    "literally",
+    "totally",
+]
+
+# Density (per word) at which a signal saturates at 1.0: one hit in three words.
+SATURATION = 1 / 3
+
+
+def _alternation(phrases):
+    """Prefix-factored regex alternation of `phrases` ("m(?:aybe|ight)"), so a miss fails on the first letters."""
+    tree = {}
+    for phrase in phrases:
+        node = tree
+        for char in phrase:
+            node = node.setdefault(char, {})
+        node[""] = {}
+
+    def build(node):
+        branches = [re.escape(char).replace(r"\ ", r"\s+") + build(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ""
+        if "" in node:
+            return "(?:" + "|".join(branches) + ")?"
+        return branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+
+    return build(tree)
+
+
+# Matches start at a word start (earlier tokens consume whole words), so only the end needs a boundary.
+_TEXT_PATTERN = re.compile(
+    r"(?P<number>[$€£₹]?\d+(?:[.,]\d+)*(?:%|[A-Za-z]+)?)"
+    r"|(?P<hedge>(?i:" + _alternation(HEDGE_PHRASES) + r")(?![A-Za-z']))"
+    r"|(?P<emotive>(?i:" + _alternation(EMOTIVE_WORDS) + r")(?![A-Za-z']))"
+    r"|(?P<name>[A-Z][a-zA-Z]+)"
+    r"|(?P<word>[A-Za-z']+)"
+    r"|(?P<stop>[.!?]+)"
+    r"|(?P<separator>\x00)"
+)
+_NUMBER, _HEDGE, _EMOTIVE, _NAME, _WORD, _STOP, _SEPARATOR = range(1, 8)
+
+TextSignals = namedtuple("TextSignals", ["concreteness", "hedging", "emotional", "words"])
+
+# Answer keys of the notes scored for the bias rules.
+NOTE_KEYS = ("reason_a", "reason_b", "counter_text", "emotion_source_note", "urgency_reason_note", "social_source_note")
+
+
+def _density(count, words):
+    return min(1.0, count / words / SATURATION)
+
+
+@lru_cache(maxsize=65_536)
+def score_text(text):
+    """TextSignals of one note, or None for an empty one.
+
+    Concreteness counts numbers (with units or currency) and capitalized names that do
+    not start a sentence; a hedge phrase counts as one word.
+    """
+    counts = {"number": 0, "hedge": 0, "emotive": 0, "name": 0}
+    words = 0
+    sentence_start = True
+    for match in _TEXT_PATTERN.finditer(text):
+        group = match.lastgroup
+        if group == "stop":
+            sentence_start = True
+            continue
+        words += 1
+        if group == "name" and sentence_start:
+            group = "word"
+        if group != "word":
+            counts[group] += 1
+        sentence_start = False
+    if not words:
+        return None
+    return TextSignals(
+        concreteness=_density(counts["number"] + counts["name"], words),
+        hedging=_density(counts["hedge"], words),
+        emotional=_density(counts["emotive"], words),
+        words=words,
+    )
+
+
+def vagueness(signals, emotional=True):
+    """0-1: non-concrete, and hedged (or emotive); None when there is no text."""
+    if signals is None:
+        return None
+    tone = max(signals.hedging, signals.emotional) if emotional else signals.hedging
+    return 0.5 * (1 - signals.concreteness) + 0.5 * tone
+
+
+def note_signals(answers, chosen_key="A"):
+    """{note role: TextSignals or None} for one session's notes; the chosen option's reason is "chosen_reason"."""
+    def signals(key):
+        value = answers.get(key)
+        return score_text(value) if isinstance(value, str) and value.strip() else None
+
+    other_key = "B" if chosen_key == "A" else "A"
+    return {
+        "chosen_reason": signals("reason_" + chosen_key.lower()),
+        "other_reason": signals("reason_" + other_key.lower()),
+        "counter": signals("counter_text"),
+        "emotion_source": signals("emotion_source_note"),
+        "urgency_reason": signals("urgency_reason_note"),
+        "social_source": signals("social_source_note"),
+    }
+
+
+# ==========================================================
+# SECTION 2: BATCH SCORING
+# ==========================================================
+
+
+def score_texts(texts):
+    """(N, 4) float array of concreteness, hedging, emotional and word count; NaN rows for empty notes.
+
+    The whole batch is one NUL-joined string scanned in one finditer pass; per-note counts
+    are then numpy bincounts over (note, group) pairs.
+    """
+    rows = np.full((len(texts), 4), np.nan)
+    if not len(texts):
+        return rows
+    joined = "\x00".join(text.replace("\x00", " ") if text else "" for text in texts)
+    groups = np.fromiter((match.lastindex for match in _TEXT_PATTERN.finditer(joined)), dtype=np.int64)
+    note = np.cumsum(groups == _SEPARATOR)
+    previous = np.concatenate([[_SEPARATOR], groups[:-1]])
+    groups[(groups == _NAME) & (previous >= _STOP)] = _WORD
+    tokens = groups < _STOP
+    counts = np.bincount(note[tokens] * _STOP + groups[tokens], minlength=len(texts) * _STOP).reshape(len(texts), _STOP)
+    words = counts[:, _NUMBER : _STOP].sum(axis=1)
+    present = words > 0
+    scale = 1 / (words[present] * SATURATION)
+    rows[present, 0] = np.minimum(1.0, (counts[present, _NUMBER] + counts[present, _NAME]) * scale)
+    rows[present, 1] = np.minimum(1.0, counts[present, _HEDGE] * scale)
+    rows[present, 2] = np.minimum(1.0, counts[present, _EMOTIVE] * scale)
+    rows[present, 3] = words[present]
+    return rows
+
+
+def iter_text_signals(texts, chunk_size=65_536):
+    """Yield score_texts arrays for any iterable of notes, `chunk_size` notes in memory at a time."""
+    chunk = []
+    for text in texts:
+        chunk.append(text)
+        if len(chunk) >= chunk_size:
+            yield score_texts(chunk)
+            chunk = []
+    if chunk:
+        yield score_texts(chunk)
+
+
+def iter_record_signals(record_file, keys=NOTE_KEYS, chunk_size=65_536):
+    """Yield {note key: (n, 4) array} per chunk of stored session records, in record order."""
+    from biaslab_records import iter_notes
+
+    chunk = []
+    for notes in iter_notes(record_file):
+        chunk.append(notes)
+        if len(chunk) >= chunk_size:
+            yield {key: score_texts([notes.get(key) for notes in chunk]) for key in keys}
+            chunk = []
+    if chunk:
+        yield {key: score_texts([notes.get(key) for notes in chunk]) for key in keys}
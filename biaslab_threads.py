@@ -0,0 +1,162 @@
+"""Decision threads: group re-runs of the same dilemma with MinHash signatures and LSH buckets.
+
+A run is shingled from its stemmed decision text plus both option labels (in either
+order), so "Should I buy the iPhone or a Pixel?" and "should i buy an iphone or pixel"
+land in the same thread. Each lookup probes BANDS hash buckets instead of scanning the
+history, and only thread variants that are not near-exact duplicates are added to the
+buckets, so memory grows with distinct phrasings rather than with rows.
+"""
+
+import zlib
+from array import array
+from collections import namedtuple
+
+import numpy as np
+
+from biaslab_keywords import stem, tokenize
+
+SIGNATURE_SIZE = 64
+BANDS = 16
+ROWS_PER_BAND = SIGNATURE_SIZE // BANDS
+SHINGLE_SIZE = 4
+DEFAULT_THRESHOLD = 0.5
+# A run this similar to its thread adds nothing new to the buckets.
+DUPLICATE_SIMILARITY = 0.9
+
+_PRIME = (1 << 31) - 1
+_COEFFICIENTS = np.random.default_rng(3401).integers(1, _PRIME, size=(2, SIGNATURE_SIZE), dtype=np.uint64)
+
+# Filler words that differ between re-runs of the same dilemma ("the iPhone" / "an iPhone").
+STOPWORDS = frozenset(["a", "an", "the", "i", "my", "to", "should", "do", "is", "it", "of", "for", "or", "and", "me", "this", "that"])
+
+DecisionThread = namedtuple("DecisionThread", ["thread_id", "decision", "options", "runs", "first_seen", "last_seen"])
+
+
+def _normalized(text):
+    return " ".join(stem(token) for token in tokenize(text) if token not in STOPWORDS)
+
+
+def run_key(decision, option_a="", option_b=""):
+    """Normalized text of a run: stemmed decision plus the sorted option labels, minus filler words."""
+    options = sorted(_normalized(label) for label in (option_a, option_b))
+    return _normalized(decision) + " | " + " | ".join(options)
+
+
+def shingles(decision, option_a="", option_b=""):
+    """Character 4-grams of a run's normalized text."""
+    return _key_shingles(run_key(decision, option_a, option_b))
+
+
+def _key_shingles(text):
+    if len(text) <= SHINGLE_SIZE:
+        return {text}
+    return {text[index : index + SHINGLE_SIZE] for index in range(len(text) - SHINGLE_SIZE + 1)}
+
+
+def signature(decision, option_a="", option_b=""):
+    """MinHash signature (SIGNATURE_SIZE uint64 values) of one run."""
+    return _key_signature(run_key(decision, option_a, option_b))
+
+
+def _key_signature(text):
+    hashes = np.fromiter((zlib.crc32(shingle.encode("utf-8")) % _PRIME for shingle in _key_shingles(text)), dtype=np.uint64)
+    multipliers, offsets = _COEFFICIENTS
+    return ((multipliers[:, None] * hashes[None, :] + offsets[:, None]) % _PRIME).min(axis=1)
+
+
+def similarity(first, second):
+    """Estimated Jaccard similarity of two signatures."""
+    return float(np.mean(first == second))
+
+
+class DecisionThreads:
+    """Incremental MinHash/LSH index assigning every logged run to a decision thread.
+
+    `add` is called once per saved session, in log order; `row_threads[i]` is the thread of
+    the i-th row added. Exact re-runs (same normalized text) skip MinHash entirely.
+    """
+
+    def __init__(self, threshold=DEFAULT_THRESHOLD):
+        self.threshold = threshold
+        self.row_threads = array("I")
+        self._buckets = {}
+        self._signatures = np.empty((0, SIGNATURE_SIZE), dtype=np.uint64)
+        self._threads = []
+        self._exact = {}
+
+    def __len__(self):
+        return len(self._threads)
+
+    def _band_keys(self, run_signature):
+        data = run_signature.tobytes()
+        width = ROWS_PER_BAND * run_signature.itemsize
+        return [(band, data[band * width : (band + 1) * width]) for band in range(BANDS)]
+
+    def _best_match(self, run_signature, band_keys):
+        candidates = set()
+        for key in band_keys:
+            candidates.update(self._buckets.get(key, ()))
+        if not candidates:
+            return None, 0.0
+        candidates = np.fromiter(candidates, dtype=np.int64, count=len(candidates))
+        scores = (self._signatures[candidates] == run_signature).mean(axis=1)
+        best = int(np.argmax(scores))
+        return int(candidates[best]), float(scores[best])
+
+    def lookup(self, decision, option_a="", option_b=""):
+        """Thread ID a run would join, or None for a new dilemma."""
+        key = run_key(decision, option_a, option_b)
+        if key in self._exact:
+            return self._exact[key]
+        run_signature = _key_signature(key)
+        thread_id, score = self._best_match(run_signature, self._band_keys(run_signature))
+        return thread_id if score >= self.threshold else None
+
+    def add(self, decision, option_a="", option_b="", timestamp=""):
+        """Assign one run to its thread (creating one if needed); returns the thread ID."""
+        key = run_key(decision, option_a, option_b)
+        thread_id = self._exact.get(key)
+        if thread_id is not None:
+            self._record_run(thread_id, timestamp)
+            return thread_id
+
+        run_signature = _key_signature(key)
+        band_keys = self._band_keys(run_signature)
+        thread_id, score = self._best_match(run_signature, band_keys)
+
+        if thread_id is None or score < self.threshold:
+            thread_id = len(self._threads)
+            if thread_id == len(self._signatures):
+                grown = np.empty((max(64, 2 * thread_id), SIGNATURE_SIZE), dtype=np.uint64)
+                grown[:thread_id] = self._signatures
+                self._signatures = grown
+            self._signatures[thread_id] = run_signature
+            self._threads.append(DecisionThread(thread_id, decision, tuple(sorted((option_a, option_b))), 1, timestamp, timestamp))
+            self.row_threads.append(thread_id)
+        else:
+            self._record_run(thread_id, timestamp)
+
+        if score < DUPLICATE_SIMILARITY:
+            for band_key in band_keys:
+                self._buckets.setdefault(band_key, set()).add(thread_id)
+        self._exact[key] = thread_id
+        return thread_id
+
+    def _record_run(self, thread_id, timestamp):
+        thread = self._threads[thread_id]
+        self._threads[thread_id] = thread._replace(runs=thread.runs + 1, last_seen=timestamp or thread.last_seen)
+        self.row_threads.append(thread_id)
+
+    def thread(self, thread_id):
+        return self._threads[thread_id]
+
+    def threads(self):
+        """All threads, most re-run first."""
+        return sorted(self._threads, key=lambda thread: (-thread.runs, thread.thread_id))
+
+    def latest_rows(self):
+        """Row index of the most recent run in every thread, in log order (a deduplicated export)."""
+        latest = {}
+        for row, thread_id in enumerate(self.row_threads):
+            latest[thread_id] = row
+        return sorted(latest.values())
@@ -0,0 +1,105 @@
+"""Vectorized BiasLab scoring: the engine's formulas applied to whole batches of answer rows."""
+
+import numpy as np
+
+from biaslab_engine import (
+    BIAS_PRESSURE_KEYS,
+    DISTORTION_WEIGHTS,
+    OPTION_CRITERIA_KEYS,
+    RATIONAL_WEIGHTS,
+    SCALE_ANSWER_KEYS,
+)
+
+# Column layout of batch arrays. Missing answers are NaN and score as 0.5, like the engine.
+SCALE_COLUMNS = {key: index for index, key in enumerate(SCALE_ANSWER_KEYS)}
+CRITERION_COLUMNS = {key: index for index, key in enumerate(OPTION_CRITERIA_KEYS)}
+
+RISK_LABELS = ("High Decision Integrity", "Balanced but Needs Reflection", "Elevated Distortion Risk")
+
+
+def answer_row(answers):
+    """One row of slider answers (canonical key order) from an engine answers dict."""
+    row = np.full(len(SCALE_ANSWER_KEYS), np.nan)
+    for key, index in SCALE_COLUMNS.items():
+        value = answers.get(key)
+        if isinstance(value, (int, float)):
+            row[index] = value
+    return row
+
+
+def option_rows(option_scores, chosen_key):
+    """(chosen, other) criterion rows from engine option scores and the leaning."""
+    other_key = "B" if chosen_key == "A" else "A"
+    rows = []
+    for key in (chosen_key, other_key):
+        scores = option_scores.get(key, {})
+        rows.append(np.array([scores.get(criterion, np.nan) for criterion in OPTION_CRITERIA_KEYS], dtype=float))
+    return rows[0], rows[1]
+
+
+def risk_class(distortion_risk):
+    """0, 1 or 2 for the three classify_risk labels."""
+    return (distortion_risk >= 0.30).astype(np.int8) + (distortion_risk >= 0.60).astype(np.int8)
+
+
+def score_batch(answers, chosen, other, rational_weights=RATIONAL_WEIGHTS, distortion_weights=DISTORTION_WEIGHTS):
+    """Score N sessions at once.
+
+    `answers` is (N, len(SCALE_ANSWER_KEYS)); `chosen` and `other` are (N, 5) criterion
+    scores of the leaning option and the alternative. Additions run in the same order as
+    the scalar engine, so results match it exactly.
+    """
+    answers = np.where(np.isnan(answers), 0.5, answers)
+    chosen = np.where(np.isnan(chosen), 0.5, chosen)
+    other = np.where(np.isnan(other), 0.5, other)
+
+    def column(key):
+        return answers[:, SCALE_COLUMNS[key]]
+
+    pressure_total = column(BIAS_PRESSURE_KEYS[0])
+    for key in BIAS_PRESSURE_KEYS[1:]:
+        pressure_total = pressure_total + column(key)
+    pressure_total = pressure_total + (1 - column("counter_strength"))
+    bias_pressure = pressure_total / (len(BIAS_PRESSURE_KEYS) + 1)
+
+    foresight_gap = ((1 - column("failure_preview")) + (1 - column("regret_preview")) + (1 - column("alt_exploration"))) / 3
+    fairness_risk = np.clip((1 - column("fairness")) * 0.60 + column("harm_risk") * 0.40, 0.0, 1.0)
+
+    chosen_rational = 0.0
+    other_rational = 0.0
+    for key, weight in rational_weights.items():
+        chosen_rational = chosen_rational + chosen[:, CRITERION_COLUMNS[key]] * weight
+        other_rational = other_rational + other[:, CRITERION_COLUMNS[key]] * weight
+
+    justification_gap = chosen_rational - other_rational
+    weak_choice_penalty = np.maximum(0.0, -justification_gap)
+    distortion_risk = np.clip(
+        bias_pressure * distortion_weights["bias_pressure"]
+        + foresight_gap * distortion_weights["foresight_gap"]
+        + fairness_risk * distortion_weights["fairness_risk"]
+        + weak_choice_penalty * distortion_weights["weak_choice_penalty"]
+        + (1 - chosen_rational) * distortion_weights["low_evidence_penalty"],
+        0.0,
+        1.0,
+    )
+
+    practical_preference = (
+        (chosen[:, CRITERION_COLUMNS["compatibility"]] >= 0.70)
+        & (chosen[:, CRITERION_COLUMNS["need_fit"]] >= 0.65)
+        & (chosen[:, CRITERION_COLUMNS["evidence"]] >= 0.55)
+        & (justification_gap >= 0.05)
+        & (column("counter_strength") >= 0.45)
+    )
+
+    return {
+        "bias_pressure": bias_pressure,
+        "foresight_gap": foresight_gap,
+        "fairness_risk": fairness_risk,
+        "weak_choice_penalty": weak_choice_penalty,
+        "chosen_rational": chosen_rational,
+        "other_rational": other_rational,
+        "justification_gap": justification_gap,
+        "distortion_risk": distortion_risk,
+        "risk_class": risk_class(distortion_risk),
+        "practical_preference": practical_preference,
+    }
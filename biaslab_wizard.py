@@ -0,0 +1,340 @@
+"""Wizard progression state and a thread-safe manager for many concurrent BiasLab sessions."""
+
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from contextlib import ExitStack
+
+from biaslab_adaptive import DEFAULT_MAX_FLIP_RATE, should_skip
+from biaslab_engine import (
+    DEFAULT_ENGINE,
+    OPTION_CRITERIA_KEYS,
+    SCALE_ANSWER_KEYS,
+    Session,
+    followup_questions,
+    normalize,
+)
+from biaslab_group import analyze_group
+from biaslab_progress import NO_FOLLOWUPS, followup_rates, plan_question_ids
+
+UNANSWERED = 255
+
+_SCALE_INDEX = {key: index for index, key in enumerate(SCALE_ANSWER_KEYS)}
+_CRITERION_INDEX = {key: index for index, key in enumerate(OPTION_CRITERIA_KEYS)}
+_CRITERIA_COUNT = len(OPTION_CRITERIA_KEYS)
+
+
+# ==========================================================
+# SECTION 1: COMPACT WIZARD STATE (ONE DECISION IN PROGRESS)
+# ==========================================================
+
+
+class WizardState:
+    """One decision in progress: question position, follow-ups and raw slider answers.
+
+    Slider answers are kept as raw 0-10 steps in bytearrays (255 = not answered) and
+    the plan's question tuple is shared until the first follow-up is appended, so an
+    idle session costs a few hundred bytes on top of its plan.
+
+    With `adaptive=True`, slider questions whose answer can no longer change the verdict
+    are skipped (see biaslab_adaptive) and score as 0.5.
+
+    `total_steps_estimate` starts at the expected question count: the plan's questions plus
+    the expected follow-ups of its trigger sliders (biaslab_progress). It then stays put
+    unless the questions known to come (`known_steps`) exceed it or the most that can
+    still come (`possible_steps`) falls below it, so the progress total rarely moves.
+    """
+
+    __slots__ = (
+        "plan",
+        "cognitive_questions",
+        "phase",
+        "index",
+        "scale_steps",
+        "option_steps",
+        "notes",
+        "completed_steps",
+        "total_steps_estimate",
+        "known_steps",
+        "possible_steps",
+        "question_ids",
+        "followup_rates",
+        "last_seen",
+        "lock",
+        "adaptive",
+        "max_flip_rate",
+        "skipped",
+    )
+
+    def __init__(self, plan, adaptive=False, max_flip_rate=DEFAULT_MAX_FLIP_RATE):
+        self.plan = plan
+        self.cognitive_questions = plan.cognitive_questions
+        self.phase = "cognitive"
+        self.index = 0
+        self.scale_steps = bytearray([UNANSWERED]) * len(SCALE_ANSWER_KEYS)
+        self.option_steps = bytearray([UNANSWERED]) * (2 * _CRITERIA_COUNT)
+        self.notes = {}
+        self.completed_steps = 0
+        # Shared per (context, scale) until the first follow-up is appended.
+        self.question_ids = plan_question_ids(plan.context, plan.scale)
+        self.followup_rates = followup_rates(plan.context, plan.scale)
+        self.known_steps = len(plan.cognitive_questions) + len(plan.option_questions)
+        self.possible_steps = self.known_steps + sum(rate.most for rate in self.followup_rates.values())
+        self.total_steps_estimate = round(self.known_steps + sum(rate.expected for rate in self.followup_rates.values()))
+        self.last_seen = 0.0
+        # Serializes callers sharing this wizard (SessionManager locks per session with it).
+        self.lock = threading.Lock()
+        self.adaptive = adaptive
+        self.max_flip_rate = max_flip_rate
+        self.skipped = 0
+
+    def active_questions(self):
+        return self.cognitive_questions if self.phase == "cognitive" else self.plan.option_questions
+
+    def current_question(self):
+        """Question to ask next, or None once every question has been answered."""
+        questions = self.active_questions()
+        if self.index >= len(questions):
+            if self.phase != "cognitive":
+                return None
+            self.phase = "options"
+            self.index = 0
+            questions = self.plan.option_questions
+            if not questions:
+                return None
+        return questions[self.index]
+
+    def is_last_question(self):
+        return self.phase != "cognitive" and self.index >= len(self.plan.option_questions) - 1
+
+    def _append_question_if_new(self, question):
+        """Append a follow-up unless already asked; returns 1 if it was appended, else 0."""
+        if question["id"] in self.question_ids:
+            return 0
+        if isinstance(self.cognitive_questions, tuple):
+            self.cognitive_questions = list(self.cognitive_questions)
+            self.question_ids = set(self.question_ids)
+        self.cognitive_questions.append(question)
+        self.question_ids.add(question["id"])
+        return 1
+
+    def submit(self, value):
+        """Record the answer to the current question and advance.
+
+        `value` is a 0-10 step for single sliders, an (A, B) pair of steps for option
+        comparisons, or a string for text questions. Raises ValueError when a required
+        text answer is empty.
+        """
+        q = self.current_question()
+        if q is None:
+            raise ValueError("All questions have already been answered.")
+
+        if q["type"] == "single_scale":
+            step = int(value)
+            self.scale_steps[_SCALE_INDEX[q["key"]]] = step
+            added = sum(self._append_question_if_new(followup) for followup in followup_questions(q, normalize(step)))
+            self._resolve_followups(q["key"], added)
+
+        elif q["type"] == "pair_scale":
+            step_a, step_b = value
+            criterion = _CRITERION_INDEX[q["key"]]
+            self.option_steps[criterion] = int(step_a)
+            self.option_steps[_CRITERIA_COUNT + criterion] = int(step_b)
+
+        elif q["type"] == "text":
+            text_value = value.strip()
+            if q.get("required") and not text_value:
+                raise ValueError("This answer is required to continue.")
+            self.notes[q["key"]] = text_value
+
+        self.completed_steps += 1
+        self.index += 1
+        if self.adaptive:
+            self._skip_settled_questions()
+        return self.current_question()
+
+    def _skip_settled_questions(self):
+        q = self.current_question()
+        while q is not None and should_skip(self, q, self.max_flip_rate):
+            self.index += 1
+            self.skipped += 1
+            self.known_steps -= 1
+            self.possible_steps -= 1
+            # A skipped trigger slider never adds its follow-ups.
+            self._resolve_followups(q["key"], 0)
+            q = self.current_question()
+
+    def _resolve_followups(self, key, added):
+        """A slider settled with `added` follow-ups; keep the shown total within what can still happen."""
+        rate = self.followup_rates.get(key, NO_FOLLOWUPS)
+        self.known_steps += added
+        self.possible_steps += added - rate.most
+        self.total_steps_estimate = min(max(self.total_steps_estimate, self.known_steps), self.possible_steps)
+
+    @property
+    def is_complete(self):
+        return self.current_question() is None
+
+    @property
+    def answers(self):
+        """Answers keyed like the engine expects: normalized sliders plus text notes."""
+        answers = {key: normalize(step) for key, step in zip(SCALE_ANSWER_KEYS, self.scale_steps) if step != UNANSWERED}
+        answers.update(self.notes)
+        return answers
+
+    @property
+    def option_scores(self):
+        scores = {"A": {}, "B": {}}
+        for offset, option_key in ((0, "A"), (_CRITERIA_COUNT, "B")):
+            for key, index in _CRITERION_INDEX.items():
+                step = self.option_steps[offset + index]
+                if step != UNANSWERED:
+                    scores[option_key][key] = normalize(step)
+        return scores
+
+    def to_session(self):
+        return Session(plan=self.plan, answers=self.answers, option_scores=self.option_scores)
+
+
+# ==========================================================
+# SECTION 2: MULTI-USER SESSION MANAGER (LRU + TTL)
+# ==========================================================
+
+
+class SessionManager:
+    """Thread-safe store of in-progress wizards keyed by session ID.
+
+    Entries are kept in least-recently-used order. A session is evicted when it has been
+    idle longer than `ttl_seconds`, or when `max_sessions` is exceeded (oldest first).
+    The manager's lock only guards that table; answering runs under the session's own
+    lock, so one user's adaptive pruning never holds up the others.
+    """
+
+    def __init__(self, engine=DEFAULT_ENGINE, max_sessions=10_000, ttl_seconds=30 * 60, clock=time.monotonic):
+        self.engine = engine
+        self.max_sessions = max_sessions
+        self.ttl_seconds = ttl_seconds
+        self.clock = clock
+        self._sessions = OrderedDict()
+        self._lock = threading.Lock()
+        self.evicted_idle = 0
+        self.evicted_capacity = 0
+
+    def __len__(self):
+        return len(self._sessions)
+
+    def __contains__(self, session_id):
+        with self._lock:
+            self._evict_expired(self.clock())
+            return session_id in self._sessions
+
+    def _evict_expired(self, now):
+        """Drop idle sessions from the LRU end; stops at the first fresh one."""
+        deadline = now - self.ttl_seconds
+        while self._sessions:
+            session_id, state = next(iter(self._sessions.items()))
+            if state.last_seen > deadline:
+                break
+            del self._sessions[session_id]
+            self.evicted_idle += 1
+
+    def _touch(self, session_id):
+        now = self.clock()
+        self._evict_expired(now)
+        state = self._sessions.get(session_id)
+        if state is None:
+            raise KeyError(f"Unknown or expired session: {session_id}")
+        state.last_seen = now
+        self._sessions.move_to_end(session_id)
+        return state
+
+    def start(self, decision, session_id=None, adaptive=False):
+        """Plan a Decision and open a new wizard for it. Returns the session ID."""
+        return self._open(self.engine.plan(decision), session_id, adaptive)
+
+    def start_group(self, decision, participants, adaptive=False):
+        """Open one wizard per participant on a single shared plan. Returns their session IDs."""
+        plan = self.engine.plan(decision)
+        return [self._open(plan, None, adaptive) for _ in range(participants)]
+
+    def _open(self, plan, session_id, adaptive):
+        state = WizardState(plan, adaptive=adaptive)
+        session_id = session_id or uuid.uuid4().hex
+        with self._lock:
+            now = self.clock()
+            self._evict_expired(now)
+            state.last_seen = now
+            self._sessions[session_id] = state
+            self._sessions.move_to_end(session_id)
+            while len(self._sessions) > self.max_sessions:
+                self._sessions.popitem(last=False)
+                self.evicted_capacity += 1
+        return session_id
+
+    def _state(self, session_id):
+        with self._lock:
+            return self._touch(session_id)
+
+    def current_question(self, session_id):
+        state = self._state(session_id)
+        with state.lock:
+            return state.current_question()
+
+    def submit(self, session_id, value):
+        """Answer the current question of one session; returns its next question or None."""
+        state = self._state(session_id)
+        with state.lock:
+            return state.submit(value)
+
+    def _close(self, session_ids, states):
+        """Remove completed sessions from the table; the caller holds their locks."""
+        incomplete = [session_id for session_id, state in zip(session_ids, states) if not state.is_complete]
+        if incomplete:
+            raise ValueError(f"Sessions {', '.join(incomplete)} still have unanswered questions.")
+        with self._lock:
+            for session_id, state in zip(session_ids, states):
+                if self._sessions.get(session_id) is not state:
+                    raise KeyError(f"Unknown or expired session: {session_id}")
+            for session_id in session_ids:
+                del self._sessions[session_id]
+
+    def finish(self, session_id):
+        """Close a completed session and return its AnalysisResult."""
+        state = self._state(session_id)
+        with state.lock:
+            self._close([session_id], [state])
+        return self.engine.analyze(state.to_session())
+
+    def finish_group(self, session_ids, names=None):
+        """Close the completed sessions of a group decision and return their GroupResult."""
+        if len(set(session_ids)) != len(session_ids):
+            raise ValueError("A group decision lists each session once.")
+        with self._lock:
+            states = [self._touch(session_id) for session_id in session_ids]
+        with ExitStack() as stack:
+            # A fixed lock order, so overlapping group finishes cannot deadlock.
+            for _, state in sorted(zip(session_ids, states), key=lambda item: item[0]):
+                stack.enter_context(state.lock)
+            self._close(session_ids, states)
+        return analyze_group([state.to_session() for state in states], names, self.engine)
+
+    def discard(self, session_id):
+        with self._lock:
+            self._sessions.pop(session_id, None)
+
+    def evict_expired(self):
+        """Run TTL eviction now; returns how many sessions are still active."""
+        with self._lock:
+            self._evict_expired(self.clock())
+            return len(self._sessions)
+
+    def stats(self):
+        with self._lock:
+            return {
+                "active": len(self._sessions),
+                "max_sessions": self.max_sessions,
+                "ttl_seconds": self.ttl_seconds,
+                "evicted_idle": self.evicted_idle,
+                "evicted_capacity": self.evicted_capacity,
+            }
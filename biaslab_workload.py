@@ -0,0 +1,326 @@
+"""Seeded synthetic BiasLab sessions for load and scale testing.
+
+Decision texts are built from CONTEXT_KEYWORDS and the decision-scale keyword lists and
+verified once against identify_dilemma_profile, so every generated text plans to the
+context and scale it was drawn for. Answers follow that plan: only questions the plan
+asks are answered, and follow-ups (the harm-risk slider, the text notes) appear exactly
+when the wizard would trigger them.
+
+Sessions are generated in vectorized batches and streamed to JSONL or to a directory of
+.npy files, so memory stays flat however many sessions are written.
+
+Run: python biaslab_workload.py --sessions 1000000 --out sessions.jsonl
+"""
+
+import argparse
+import json
+import os
+import random
+import time
+from collections import namedtuple
+
+import numpy as np
+
+from biaslab_engine import (
+    CONTEXT_KEYWORDS,
+    DEFAULT_ENGINE,
+    MAJOR_DECISION_KEYWORDS,
+    OPTION_CRITERIA_KEYS,
+    SCALE_ANSWER_KEYS,
+    SMALL_DECISION_KEYWORDS,
+    Decision,
+    Session,
+    build_option_questions,
+    followup_questions,
+    identify_dilemma_profile,
+    normalize,
+    planned_cognitive_questions,
+)
+
+CONTEXTS = tuple(CONTEXT_KEYWORDS) + ("generic",)
+SCALES = ("small", "standard", "major")
+UNANSWERED = 255
+
+# Everyday choices with no context keyword, for the "generic" context.
+GENERIC_CHOICES = ["learn guitar", "learn piano", "paint", "garden", "travel", "stay home", "cook", "read", "write", "volunteer"]
+
+NOTE_PHRASES = {
+    "emotion_source_note": ["Fear of missing out.", "Excitement about something new.", "Worry about letting people down."],
+    "social_source_note": ["My parents.", "My closest friend.", "People online."],
+    "urgency_reason_note": ["The offer ends this week.", "I am making it urgent myself.", "Someone else is waiting on me."],
+    "counter_text": ["It may cost more than I can afford.", "I have not compared it properly.", "It might not fit my routine."],
+}
+REASON_PHRASES = ["It fits what I actually need.", "It is cheaper over time.", "People I trust recommend it.", ""]
+
+# How one context's sessions are distributed. Means and spreads are in 0-10 slider steps;
+# `key_means` overrides the mean of individual slider keys; `leaning_bias` is how many
+# steps the leaning option is rated above the other one on average.
+ContextProfile = namedtuple(
+    "ContextProfile",
+    ["weight", "scale_weights", "answer_mean", "answer_spread", "key_means", "leaning_bias"],
+    defaults=(1.0, (1.0, 1.0, 1.0), 5.0, 2.5, {}, 1.0),
+)
+
+DEFAULT_PROFILES = {context: ContextProfile() for context in CONTEXTS}
+
+# One batch of sessions as parallel arrays. Slider and option steps use the WizardState
+# layout: SCALE_ANSWER_KEYS columns, option A criteria then option B criteria, 255 = not asked.
+WorkloadBatch = namedtuple("WorkloadBatch", ["context", "scale", "stem", "leaning", "scale_steps", "option_steps", "reason_choice"])
+
+_SCALE_INDEX = {key: index for index, key in enumerate(SCALE_ANSWER_KEYS)}
+_CRITERIA_COUNT = len(OPTION_CRITERIA_KEYS)
+
+
+# ==========================================================
+# SECTION 1: DECISION TEXTS AND QUESTION PLANS
+# ==========================================================
+
+
+def _choices(context):
+    return GENERIC_CHOICES if context == "generic" else CONTEXT_KEYWORDS[context]
+
+
+def _scale_words(scale):
+    if scale == "small":
+        return SMALL_DECISION_KEYWORDS
+    if scale == "major":
+        return MAJOR_DECISION_KEYWORDS
+    return [""]
+
+
+_STEMS = {}
+
+
+def decision_stems(context, scale, limit=256):
+    """Verified decision texts for one (context, scale); empty when the pair cannot occur."""
+    key = (context, scale)
+    if key not in _STEMS:
+        # A fixed seed keeps stem indexes stable, so a stem index in saved .npy output stays meaningful.
+        rng = random.Random(f"{context}/{scale}")
+        choices = sorted(set(_choices(context)))
+        candidates = [(first, second, word) for first in choices for second in choices if first != second for word in _scale_words(scale)]
+        rng.shuffle(candidates)
+        stems = []
+        for first, second, word in candidates:
+            text = f"Should I {first} {word} or {second}?".replace("  ", " ")
+            profile = identify_dilemma_profile(text)
+            if profile["domain"] == context and profile["scale"] == scale:
+                stems.append(text)
+                if len(stems) >= limit:
+                    break
+        _STEMS[key] = tuple(stems)
+    return _STEMS[key]
+
+
+_PLAN_MASKS = {}
+
+
+def plan_masks(context, scale):
+    """(slider mask, criterion mask) of what a plan for this context and scale asks up front."""
+    key = (context, scale)
+    if key not in _PLAN_MASKS:
+        scale_mask = np.zeros(len(SCALE_ANSWER_KEYS), dtype=bool)
+        for question in planned_cognitive_questions(context, scale, "Option A", "Option B", "A"):
+            if question["type"] == "single_scale":
+                scale_mask[_SCALE_INDEX[question["key"]]] = True
+        criterion_mask = np.zeros(_CRITERIA_COUNT, dtype=bool)
+        for question in build_option_questions(context, scale, "Option A", "Option B"):
+            if question["type"] == "pair_scale":
+                criterion_mask[OPTION_CRITERIA_KEYS.index(question["key"])] = True
+        _PLAN_MASKS[key] = scale_mask, criterion_mask
+    return _PLAN_MASKS[key]
+
+
+def _followup_steps():
+    """key -> {follow-up id: bool array over steps 0-10}, read from followup_questions itself."""
+    table = {}
+    for key in SCALE_ANSWER_KEYS:
+        for step in range(11):
+            for followup in followup_questions({"key": key}, normalize(step)):
+                table.setdefault(key, {}).setdefault(followup["id"], np.zeros(11, dtype=bool))[step] = True
+    return table
+
+
+FOLLOWUP_STEPS = _followup_steps()
+
+
+# ==========================================================
+# SECTION 2: VECTORIZED BATCH GENERATION
+# ==========================================================
+
+
+def _scale_probabilities(context, profile):
+    weights = np.array([weight if decision_stems(context, scale) else 0.0 for scale, weight in zip(SCALES, profile.scale_weights)])
+    if weights.sum() == 0:
+        raise ValueError(f"No decision scale can be generated for context {context!r}.")
+    return weights / weights.sum()
+
+
+def _steps(rng, mean, spread, size):
+    return np.clip(np.rint(rng.normal(mean, spread, size)), 0, 10).astype(np.uint8)
+
+
+def generate_batch(rng, size, profiles=None):
+    """One WorkloadBatch of `size` sessions drawn with a numpy Generator."""
+    profiles = profiles or DEFAULT_PROFILES
+    weights = np.array([profiles[context].weight if context in profiles else 0.0 for context in CONTEXTS])
+    context = rng.choice(len(CONTEXTS), size=size, p=weights / weights.sum()).astype(np.int8)
+    scale = np.zeros(size, dtype=np.int8)
+    stem = np.zeros(size, dtype=np.int32)
+    leaning = rng.integers(0, 2, size=size, dtype=np.uint8)
+    scale_steps = np.full((size, len(SCALE_ANSWER_KEYS)), UNANSWERED, dtype=np.uint8)
+    option_steps = np.full((size, 2 * _CRITERIA_COUNT), UNANSWERED, dtype=np.uint8)
+
+    for context_index, context_name in enumerate(CONTEXTS):
+        rows = np.flatnonzero(context == context_index)
+        if not len(rows):
+            continue
+        profile = profiles[context_name]
+        scale[rows] = rng.choice(len(SCALES), size=len(rows), p=_scale_probabilities(context_name, profile))
+
+        for scale_index, scale_name in enumerate(SCALES):
+            group = rows[scale[rows] == scale_index]
+            if not len(group):
+                continue
+            stem[group] = rng.integers(0, len(decision_stems(context_name, scale_name)), size=len(group))
+            scale_mask, criterion_mask = plan_masks(context_name, scale_name)
+
+            block = np.full((len(group), len(SCALE_ANSWER_KEYS)), UNANSWERED, dtype=np.uint8)
+            for key, column in _SCALE_INDEX.items():
+                block[:, column] = _steps(rng, profile.key_means.get(key, profile.answer_mean), profile.answer_spread, len(group))
+            asked = np.tile(scale_mask, (len(group), 1))
+            if not scale_mask[_SCALE_INDEX["harm_risk"]] and scale_mask[_SCALE_INDEX["fairness"]]:
+                asked[:, _SCALE_INDEX["harm_risk"]] = FOLLOWUP_STEPS["fairness"]["harm_risk"][block[:, _SCALE_INDEX["fairness"]]]
+            scale_steps[group] = np.where(asked, block, UNANSWERED)
+
+            # The leaning option's criteria get `leaning_bias` extra steps on average.
+            lean_a = leaning[group] == 0
+            for offset, favoured in ((0, lean_a), (_CRITERIA_COUNT, ~lean_a)):
+                for criterion in np.flatnonzero(criterion_mask):
+                    mean = profile.answer_mean + np.where(favoured, profile.leaning_bias, 0.0)
+                    option_steps[group, offset + criterion] = _steps(rng, mean, profile.answer_spread, len(group))
+
+    reason_choice = rng.integers(0, len(REASON_PHRASES), size=(size, 2), dtype=np.uint8)
+    return WorkloadBatch(context, scale, stem, leaning, scale_steps, option_steps, reason_choice)
+
+
+def iter_batches(count, seed=0, profiles=None, batch_size=65_536):
+    """Yield WorkloadBatches totalling `count` sessions; the same seed gives the same sessions."""
+    rng = np.random.default_rng(seed)
+    remaining = count
+    while remaining > 0:
+        size = min(batch_size, remaining)
+        yield generate_batch(rng, size, profiles)
+        remaining -= size
+
+
+# ==========================================================
+# SECTION 3: RECORDS, SESSIONS AND OUTPUT
+# ==========================================================
+
+
+def _note_table():
+    """(slider column, follow-up id, phrase or None per step 0-10) for every text follow-up."""
+    table = []
+    for key, followups in FOLLOWUP_STEPS.items():
+        for followup_id, triggered in followups.items():
+            if followup_id in NOTE_PHRASES:
+                phrases = NOTE_PHRASES[followup_id]
+                table.append((_SCALE_INDEX[key], followup_id, [phrases[step % len(phrases)] if triggered[step] else None for step in range(11)] + [None] * (UNANSWERED - 10)))
+    return table
+
+
+_NOTE_TABLE = _note_table()
+
+
+def _notes(scale_steps, reason_choice):
+    notes = {}
+    for column, followup_id, phrases in _NOTE_TABLE:
+        phrase = phrases[scale_steps[column]]
+        if phrase is not None:
+            notes[followup_id] = phrase
+    notes["reason_a"] = REASON_PHRASES[reason_choice[0]]
+    notes["reason_b"] = REASON_PHRASES[reason_choice[1]]
+    return notes
+
+
+def iter_records(batch):
+    """JSON-ready dicts for one batch: the Decision fields plus raw answer steps and notes."""
+    columns = zip(batch.context.tolist(), batch.scale.tolist(), batch.stem.tolist(), batch.leaning.tolist())
+    for (context, scale, stem, leaning), steps, options, reasons in zip(columns, batch.scale_steps.tolist(), batch.option_steps.tolist(), batch.reason_choice.tolist()):
+        context = CONTEXTS[context]
+        scale = SCALES[scale]
+        yield {
+            "decision": decision_stems(context, scale)[stem],
+            "leaning": "AB"[leaning],
+            "context": context,
+            "scale": scale,
+            "answers": {key: step for key, step in zip(SCALE_ANSWER_KEYS, steps) if step != UNANSWERED},
+            "option_steps": {
+                "A": {key: step for key, step in zip(OPTION_CRITERIA_KEYS, options[:_CRITERIA_COUNT]) if step != UNANSWERED},
+                "B": {key: step for key, step in zip(OPTION_CRITERIA_KEYS, options[_CRITERIA_COUNT:]) if step != UNANSWERED},
+            },
+            "notes": _notes(steps, reasons),
+        }
+
+
+def record_session(record, engine=DEFAULT_ENGINE):
+    """Plan a generated record with the engine and return the Session the wizard would produce."""
+    plan = engine.plan(Decision(record["decision"], leaning=record["leaning"]))
+    answers = {key: normalize(step) for key, step in record["answers"].items()}
+    answers.update(record["notes"])
+    option_scores = {option: {key: normalize(step) for key, step in steps.items()} for option, steps in record["option_steps"].items()}
+    return Session(plan=plan, answers=answers, option_scores=option_scores)
+
+
+def write_jsonl(file_name, count, seed=0, profiles=None, batch_size=65_536):
+    """Stream `count` sessions to a JSONL file, one record per line."""
+    with open(file_name, "w", encoding="utf-8") as file:
+        for batch in iter_batches(count, seed, profiles, batch_size):
+            file.write("".join(json.dumps(record, separators=(",", ":")) + "\n" for record in iter_records(batch)))
+
+
+def write_numpy(directory, count, seed=0, profiles=None, batch_size=65_536):
+    """Stream `count` sessions into one memory-mapped .npy file per WorkloadBatch field."""
+    os.makedirs(directory, exist_ok=True)
+    arrays = None
+    start = 0
+    for batch in iter_batches(count, seed, profiles, batch_size):
+        if arrays is None:
+            arrays = {
+                field: np.lib.format.open_memmap(os.path.join(directory, f"{field}.npy"), mode="w+", dtype=value.dtype, shape=(count,) + value.shape[1:])
+                for field, value in batch._asdict().items()
+            }
+        end = start + len(batch.context)
+        for field, value in batch._asdict().items():
+            arrays[field][start:end] = value
+        start = end
+    for array in (arrays or {}).values():
+        array.flush()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sessions", type=int, default=100_000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--out", required=True, help="a .jsonl file, or a directory for .npy output")
+    parser.add_argument("--profiles", help="JSON file of context -> ContextProfile fields, e.g. {\"career\": {\"weight\": 3}}")
+    args = parser.parse_args()
+
+    profiles = None
+    if args.profiles:
+        with open(args.profiles, encoding="utf-8") as file:
+            overrides = json.load(file)
+        profiles = {context: ContextProfile(**overrides.get(context, {})) for context in CONTEXTS}
+
+    start = time.perf_counter()
+    if args.out.endswith(".jsonl"):
+        write_jsonl(args.out, args.sessions, args.seed, profiles)
+    else:
+        write_numpy(args.out, args.sessions, args.seed, profiles)
+    elapsed = time.perf_counter() - start
+    print(f"{args.sessions:,} sessions -> {args.out} in {elapsed:.1f} s ({60 * args.sessions / elapsed:,.0f} sessions/min)")
+
+
+if __name__ == "__main__":
+    main()
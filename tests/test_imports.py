@@ -0,0 +1,21 @@
+"""Every biaslab_* module (and the GUI entry point) imports cleanly."""
+
+import glob
+import importlib
+import os
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+MODULES = sorted(os.path.splitext(os.path.basename(path))[0] for path in glob.glob(os.path.join(ROOT, "biaslab*.py")))
+
+
+@pytest.mark.parametrize("name", MODULES)
+def test_module_imports(name):
+    if name == "biaslab":
+        pytest.importorskip("tkinter")
+        pytest.importorskip("matplotlib")
+    importlib.import_module(name)